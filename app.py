@@ -2,54 +2,30 @@ import streamlit as st
 import pandas as pd
 from streamlit_folium import st_folium
 import folium
-from geopy.geocoders import Nominatim
-import html
-from io import BytesIO
 import json
+import time
+from io import BytesIO
 
-# --- IMPORTS PRÜFEN ---
-try:
-    from staticmap import StaticMap, CircleMarker as StaticCircleMarker
-    HAS_STATICMAP = True
-except ImportError:
-    HAS_STATICMAP = False
-
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm, mm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image as RLImage
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.graphics import renderPDF
-from reportlab.lib.utils import ImageReader
-from svglib.svglib import svg2rlg
+from bohrprotokoll.archive import bbox_around, get_archive
+from bohrprotokoll.artifacts import content_key, get_artifact_cache, get_file_artifact_cache
+from bohrprotokoll.coords import sync_coordinates
+from bohrprotokoll.geocoding import geocode
+from bohrprotokoll.jobs import CANCELLED, FAILED, QueueFull, get_job_queue, write_pdf_job
+from bohrprotokoll.layers import SOIL_TYPES, ProfileData
+from bohrprotokoll.maps import get_static_map_png
+from bohrprotokoll.preview import preview_svg
+from bohrprotokoll.project import DEFAULT_META, columnar_logo, columnar_to_dict, is_columnar, pdf_meta, save_project_columnar
+from bohrprotokoll.section import SCALE_Y as SECTION_SCALE_Y, parse_line, section_svg, wells_from_projects, write_section_pdf
+from bohrprotokoll.tiles import get_tile_cache, tile_url_template
+from bohrprotokoll.validation import FEHLER, has_errors, validate_project
+from bohrprotokoll.wellmap import well_clusters, well_layer
 
 # --- KONFIGURATION ---
 st.set_page_config(page_title="Profi Bohrprotokoll", layout="wide")
 
 # --- SESSION STATE INITIALISIERUNG ---
 # Standardwerte definieren
-defaults = {
-    "projekt": "Notwasserbrunnen ZE079-905",
-    "ort": "Wiesenschlag ggü 4, 14129 Berlin",
-    "kreis": "Berlin",
-    "zweck": "Notbrunnen",
-    "art_bohrung": "Grundwasser",
-    "auftraggeber": "Berliner Wasserbetriebe",
-    "objekt": "Notbrunnen",
-    "bohrfirma": "Ackermann KG",
-    "geraetefuehrer": "C. Kempcke",
-    "datum": "06.10.25 - 08.10.25",
-    "bohrdurchmesser": 330,
-    "bohrverfahren": "Spülbohren",
-    "ansatzpunkt": 0.0,
-    "endteufe": 45.0,
-    "rechtswert": "378879.57",
-    "hochwert": "5810039.19",
-    "aktenzeichen": "V26645",
-    "ws_ruhe": 14.70,
-    "lat": 52.42751,
-    "lon": 13.1905
-}
+defaults = DEFAULT_META
 
 for key, val in defaults.items():
     if key not in st.session_state:
@@ -87,11 +63,16 @@ with col_menu:
     with c_load:
         # Laden-Symbol als Expander (kompakt)
         with st.expander("📂", expanded=False):
-            uploaded_file = st.file_uploader("Laden", type=["json"], label_visibility="collapsed")
+            uploaded_file = st.file_uploader("Laden", type=["json", "bohrz"], label_visibility="collapsed")
             if uploaded_file is not None:
                 try:
-                    data = json.load(uploaded_file)
-                    for k, v in data.get("meta", {}).items():
+                    if is_columnar(uploaded_file.getvalue()):
+                        data = columnar_to_dict(uploaded_file)
+                        st.session_state.project_logo = columnar_logo(uploaded_file)
+                    else:
+                        # JSON ohne Logo: keins aus einer vorher geladenen .bohrz übernehmen
+                        data = json.load(uploaded_file); st.session_state.project_logo = None
+                    for k, v in sync_coordinates(data.get("meta", {})).items():
                         st.session_state[k] = v
                     st.session_state.geo_data = data.get("geo", [])
                     st.session_state.rohr_data = data.get("rohr", [])
@@ -118,326 +99,15 @@ with col_menu:
             mime="application/json",
             help="Projekt speichern"
         )
-
-# ==============================================================================
-# 1. HELPER: KARTE
-# ==============================================================================
-def get_static_map_image(lat, lon, zoom=15):
-    if not HAS_STATICMAP: return None
-    try:
-        m = StaticMap(width=1000, height=500, url_template='http://a.tile.openstreetmap.org/{z}/{x}/{y}.png')
-        marker = StaticCircleMarker((lon, lat), 'red', 18)
-        m.add_marker(marker)
-        image = m.render(zoom=zoom)
-        img_buffer = BytesIO()
-        image.save(img_buffer, format='PNG')
-        img_buffer.seek(0)
-        return img_buffer
-    except: return None
-
-# ==============================================================================
-# 2. HELPER: SVG GRAFIK
-# ==============================================================================
-def generate_svg_string(df_geo, df_rohr, df_ring, meta):
-    scale_y = 15
-    width = 700
-    max_depth = 48
-    if not df_geo.empty: max_depth = max(max_depth, df_geo['Bis_m'].max())
-    if not df_rohr.empty: max_depth = max(max_depth, df_rohr['Bis'].max())
-    
-    total_height = (max_depth * scale_y) + 80
-    svg = f'<svg width="{width}" height="{total_height}" xmlns="http://www.w3.org/2000/svg">'
-    
-    start_y = 40; scale_x = 40; col_geo_x = 100; col_geo_w = 100; col_tech_x = 350      
-    
-    # Maßstab
-    svg += f'<text x="{scale_x}" y="{start_y - 15}" text-anchor="middle" font-family="Arial" font-size="10" font-weight="bold">m u. GOK</text>'
-    svg += f'<line x1="{scale_x}" y1="{start_y}" x2="{scale_x}" y2="{start_y + max_depth*scale_y}" stroke="black" stroke-width="1"/>'
-    for i in range(int(max_depth) + 1):
-        y = start_y + i * scale_y
-        if i % 2 == 0:
-            svg += f'<line x1="{scale_x - 5}" y1="{y}" x2="{scale_x}" y2="{y}" stroke="black" stroke-width="1"/>'
-            svg += f'<text x="{scale_x - 8}" y="{y + 4}" text-anchor="end" font-family="Arial" font-size="10">{i}</text>'
-        else:
-            svg += f'<line x1="{scale_x - 3}" y1="{y}" x2="{scale_x}" y2="{y}" stroke="black" stroke-width="0.5"/>'
-
-    # Geologie
-    last_d = 0
-    for _, r in df_geo.iterrows():
-        h = (r['Bis_m'] - last_d) * scale_y
-        y_pos = start_y + last_d * scale_y
-        
-        boden_text = (str(r.get('f', '')) + " " + str(r.get('a', '')) + " " + str(r.get('g', ''))).lower()
-        fill_color, type_ = "#FFF59D", "sand"
-        
-        if "kies" in boden_text: fill_color, type_ = "#FFCC80", "kies"
-        elif "schluff" in boden_text: fill_color, type_ = "#E6EE9C", "schluff"
-        elif "ton" in boden_text: fill_color, type_ = "#BCAAA4", "ton"
-        elif "lehm" in boden_text: fill_color, type_ = "#FFE082", "lehm"
-        elif "mudde" in boden_text or "torf" in boden_text: fill_color, type_ = "#AED581", "mudde"
-        elif "mutterboden" in boden_text: fill_color, type_ = "#5D4037", "mutterboden"
-        elif "auffüllung" in boden_text: fill_color, type_ = "#EEEEEE", "auffuellung"
-        if "sand" in str(r.get('f', '')).lower(): fill_color, type_ = "#FFF59D", "sand"
-
-        # 1. Farbe
-        svg += f'<rect x="{col_geo_x}" y="{y_pos}" width="{col_geo_w}" height="{h}" fill="{fill_color}" stroke="black"/>'
-        
-        # 2. Muster
-        pattern_group = ""
-        if type_ == "sand":
-            step = 10
-            for py in range(int(y_pos), int(y_pos + h), step):
-                for px in range(int(col_geo_x), int(col_geo_x + col_geo_w), step):
-                    offset = 5 if (py // step) % 2 == 0 else 0
-                    if px + offset < col_geo_x + col_geo_w: pattern_group += f'<rect x="{px + offset}" y="{py}" width="1.5" height="1.5" fill="black"/>'
-        elif type_ == "mudde":
-            step = 12
-            for py in range(int(y_pos), int(y_pos + h), step):
-                for px in range(int(col_geo_x), int(col_geo_x + col_geo_w), step):
-                    offset = 6 if (py // step) % 2 == 0 else 0
-                    if px + offset < col_geo_x + col_geo_w: pattern_group += f'<rect x="{px + offset}" y="{py}" width="2.5" height="2.5" fill="#5D4037"/>'
-        elif type_ == "kies":
-            step = 12
-            for py in range(int(y_pos), int(y_pos + h), step):
-                for px in range(int(col_geo_x), int(col_geo_x + col_geo_w), step):
-                    if px + 6 < col_geo_x + col_geo_w and py + 6 < y_pos + h: pattern_group += f'<circle cx="{px+4}" cy="{py+4}" r="2.5" fill="none" stroke="black" stroke-width="1"/>'
-        elif type_ == "schluff":
-            step = 4
-            for px in range(int(col_geo_x), int(col_geo_x + col_geo_w), step): pattern_group += f'<line x1="{px}" y1="{y_pos}" x2="{px}" y2="{y_pos+h}" stroke="black" stroke-width="0.5"/>'
-        elif type_ == "ton":
-            step = 4
-            for py in range(int(y_pos), int(y_pos + h), step): pattern_group += f'<line x1="{col_geo_x}" y1="{py}" x2="{col_geo_x+col_geo_w}" y2="{py}" stroke="black" stroke-width="0.5"/>'
-        elif type_ == "lehm":
-            step = 6
-            for px in range(int(col_geo_x), int(col_geo_x + col_geo_w), step): pattern_group += f'<line x1="{px}" y1="{y_pos}" x2="{px}" y2="{y_pos+h}" stroke="black" stroke-width="0.5"/>'
-            for py in range(int(y_pos), int(y_pos + h), step): pattern_group += f'<line x1="{col_geo_x}" y1="{py}" x2="{col_geo_x+col_geo_w}" y2="{py}" stroke="black" stroke-width="0.5"/>'
-        elif type_ == "mutterboden":
-            step_x, step_y = 15, 10
-            for py in range(int(y_pos), int(y_pos + h), step_y):
-                for px in range(int(col_geo_x), int(col_geo_x + col_geo_w), step_x):
-                    if px + 6 < col_geo_x + col_geo_w: pattern_group += f'<path d="M{px},{py} L{px+3},{py+4} L{px+6},{py}" fill="none" stroke="white" stroke-width="1"/>'
-        elif type_ == "auffuellung":
-            step = 10
-            k_min = y_pos - (col_geo_x + col_geo_w)
-            k_max = (y_pos + h) - col_geo_x
-            for k in range(int(k_min), int(k_max), step):
-                points = []
-                y = col_geo_x + k
-                if y_pos <= y <= y_pos+h: points.append((col_geo_x, y))
-                y = (col_geo_x + col_geo_w) + k
-                if y_pos <= y <= y_pos+h: points.append((col_geo_x+col_geo_w, y))
-                x = y_pos - k
-                if col_geo_x <= x <= col_geo_x+col_geo_w: points.append((x, y_pos))
-                x = (y_pos + h) - k
-                if col_geo_x <= x <= col_geo_x+col_geo_w: points.append((x, y_pos+h))
-                unique = sorted(list(set(points)))
-                if len(unique) >= 2:
-                    pattern_group += f'<line x1="{unique[0][0]:.1f}" y1="{unique[0][1]:.1f}" x2="{unique[-1][0]:.1f}" y2="{unique[-1][1]:.1f}" stroke="black" stroke-width="1"/>'
-
-        svg += pattern_group
-        label = r.get('f', '')
-        text_col = "white" if fill_color == "#5D4037" else "black"
-        svg += f'<text x="{col_geo_x+col_geo_w+5}" y="{y_pos + h/2}" font-family="Arial" font-size="10" fill="{text_col}">{label}</text>'
-        last_d = r['Bis_m']
-        
-    # Technik
-    depth_markers = set()
-    for _, r in df_ring.iterrows():
-        y = start_y + r['Von']*scale_y
-        h = (r['Bis'] - r['Von']) * scale_y
-        fill = "#795548" if "Ton" in r['Mat'] else "white"
-        svg += f'<rect x="{col_tech_x-40}" y="{y}" width="80" height="{h}" fill="{fill}" stroke="none"/>'
-        if "Ton" not in r['Mat']:
-            step = 8
-            for py in range(int(y), int(y + h), step):
-                for px in range(int(col_tech_x-40), int(col_tech_x+40), step):
-                    if (px+py)%13 == 0: svg += f'<circle cx="{px}" cy="{py}" r="1" fill="orange"/>'
-        else:
-             svg += f'<path d="M{col_tech_x-40},{y+h} L{col_tech_x+40},{y}" stroke="white" stroke-width="1"/>'
-        depth_markers.add(r['Bis'])
-
-    for _, r in df_rohr.iterrows():
-        y = start_y + r['Von']*scale_y
-        h = (r['Bis'] - r['Von']) * scale_y
-        svg += f'<rect x="{col_tech_x-20}" y="{y}" width="40" height="{h}" fill="white" stroke="black" stroke-width="2"/>'
-        if "Filter" in r['Typ']:
-            for line_y in range(int(y)+2, int(y+h), 4): svg += f'<line x1="{col_tech_x-15}" y1="{line_y}" x2="{col_tech_x+15}" y2="{line_y}" stroke="black" stroke-width="1"/>'
-        if "Sumpf" in r['Typ']:
-            svg += f'<rect x="{col_tech_x-20}" y="{y}" width="40" height="{h}" fill="#CCC" stroke="black" stroke-width="2"/>'
-        depth_markers.add(r['Bis'])
-
-    label_line_x_start = col_tech_x + 40 
-    label_line_x_end = label_line_x_start + 20
-    for d in sorted([d for d in depth_markers if d > 0 and d <= max_depth]):
-        y = start_y + d * scale_y
-        svg += f'<line x1="{label_line_x_start}" y1="{y}" x2="{label_line_x_end}" y2="{y}" stroke="black" stroke-width="1"/>'
-        svg += f'<text x="{label_line_x_end + 3}" y="{y + 3}" font-family="Arial" font-size="10" fill="black">{d:.2f}m</text>'
-
-    svg += '</svg>'
-    return svg
-
-# ==============================================================================
-# 3. PDF BUILDER
-# ==============================================================================
-def draw_header_on_page(canvas, doc):
-    canvas.saveState()
-    meta = doc.meta_data 
-    page_width, page_height = A4
-    margin_left = 2*cm; margin_right = 2*cm
-    box_w_firma = 3.5 * cm; box_w_akten = 4.0 * cm      
-    header_top = page_height - 1*cm; header_bottom = page_height - 4.5*cm 
-    row_line_y = header_bottom + 1.2*cm
-    x_line_1 = margin_left + box_w_firma; x_line_2 = page_width - margin_right - box_w_akten
-    
-    canvas.setFillColor(colors.whitesmoke)
-    canvas.rect(margin_left, row_line_y, box_w_firma, header_top - row_line_y, fill=1, stroke=0)
-    canvas.setStrokeColor(colors.black); canvas.setLineWidth(1)
-    canvas.rect(margin_left, header_bottom, page_width - margin_left - margin_right, header_top - header_bottom, fill=0, stroke=1)
-    canvas.line(margin_left, row_line_y, page_width - margin_right, row_line_y) 
-    canvas.line(x_line_1, row_line_y, x_line_1, header_top) 
-    canvas.line(x_line_2, header_bottom, x_line_2, header_top) 
-    
-    if meta.get('logo_bytes'):
-        try:
-            logo_data = ImageReader(BytesIO(meta['logo_bytes']))
-            avail_w = box_w_firma - 0.4*cm; avail_h = (header_top - row_line_y) - 0.4*cm 
-            iw, ih = logo_data.getSize(); aspect = ih / float(iw)
-            if aspect > avail_h / avail_w: draw_h = avail_h; draw_w = draw_h / aspect
-            else: draw_w = avail_w; draw_h = draw_w * aspect
-            x_img = margin_left + 0.2*cm + (avail_w - draw_w)/2
-            y_img = row_line_y + 0.2*cm + (avail_h - draw_h)/2
-            canvas.drawImage(logo_data, x_img, y_img, width=draw_w, height=draw_h, mask='auto')
-        except: pass
-    else:
-        canvas.setFont("Helvetica-Bold", 14); canvas.setFillColor(colors.green)
-        canvas.drawString(margin_left + 0.2*cm, header_top - 0.6*cm, "Bohr2000")
-        canvas.setFont("Helvetica-Bold", 10); canvas.setFillColor(colors.black)
-        canvas.drawString(margin_left + 0.2*cm, header_top - 1.2*cm, meta['firma'])
-    
-    center_x = x_line_1 + (x_line_2 - x_line_1) / 2
-    canvas.setFillColor(colors.black)
-    canvas.setFont("Helvetica-Bold", 12)
-    canvas.drawCentredString(center_x, header_top - 0.6*cm, "Schichtenverzeichnis / Bohrprofil")
-    canvas.setFont("Helvetica", 9)
-    canvas.drawCentredString(center_x, header_top - 1.0*cm, "nach DIN 4022 / DIN 4023")
-    canvas.drawCentredString(center_x, header_top - 1.4*cm, "für Bohrungen ohne durchgehende Kerngewinnung")
-    
-    text_x_right = x_line_2 + 0.2*cm
-    canvas.setFont("Helvetica", 9)
-    canvas.drawString(text_x_right, header_top - 0.6*cm, "Aktenzeichen:")
-    canvas.setFont("Helvetica-Bold", 10)
-    canvas.drawString(text_x_right, header_top - 1.0*cm, meta['aktenzeichen'])
-    canvas.setFont("Helvetica", 9)
-    canvas.drawString(text_x_right, header_top - 1.5*cm, "Archiv-Nr:")
-    
-    text_y_row = row_line_y - 0.4*cm
-    canvas.setFont("Helvetica", 9)
-    canvas.drawString(margin_left + 0.2*cm, text_y_row, f"Ort: {meta['ort']}")
-    canvas.drawString(margin_left + 0.2*cm, text_y_row - 0.4*cm, f"Bohrung: {meta['projekt']}")
-    canvas.line(x_line_2, header_bottom, x_line_2, row_line_y) 
-    canvas.drawString(text_x_right, text_y_row, "Datum:")
-    canvas.drawString(text_x_right, text_y_row - 0.4*cm, meta['datum'])
-    page_num = doc.page
-    canvas.drawRightString(page_width - margin_right - 0.2*cm, text_y_row, f"Blatt {page_num}")
-    canvas.restoreState()
-
-def create_multipage_pdf_with_header(meta, df_geo, df_rohr, df_ring, svg_bytes, map_image_buffer):
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, topMargin=5*cm, bottomMargin=2*cm)
-    doc.meta_data = meta
-    
-    story = []
-    styles = getSampleStyleSheet()
-    style_tab_norm = ParagraphStyle('TabNorm', parent=styles['Normal'], fontSize=8, leading=10)
-    style_tab_bold = ParagraphStyle('TabBold', parent=styles['Normal'], fontName='Helvetica-Bold', fontSize=8, leading=10)
-    style_geo_norm = ParagraphStyle('GeoNorm', parent=styles['Normal'], fontSize=7, leading=8)
-    style_geo_header = ParagraphStyle('GeoHeader', parent=styles['Normal'], fontName='Helvetica-Bold', fontSize=7, leading=8, alignment=1)
-    style_geo_center = ParagraphStyle('GeoCenter', parent=styles['Normal'], fontName='Helvetica', fontSize=7, leading=8, alignment=1)
-    
-    page_width, _ = A4; available_width = page_width - 4*cm; col1_width = 5*cm; col2_width = available_width - col1_width
-    
-    # --- SEITE 1 ---
-    data_block1 = [
-        [Paragraph("Bohrung:", style_tab_bold), Paragraph(meta['projekt'], style_tab_norm)],
-        [Paragraph("Ort:", style_tab_bold), Paragraph(meta['ort'], style_tab_norm)],
-        [Paragraph("Kreis:", style_tab_bold), Paragraph(meta['kreis'], style_tab_norm)],
-        [Paragraph("Zweck der Bohrung:", style_tab_bold), Paragraph(meta['zweck'], style_tab_norm)],
-        [Paragraph("Art der Bohrung:", style_tab_bold), Paragraph(meta['art_bohrung'], style_tab_norm)],
-        [Paragraph("Höhe des Ansatzpunktes:", style_tab_bold), Paragraph(f"{meta['ansatz']} m u. GOK", style_tab_norm)]
-    ]
-    t1 = Table(data_block1, colWidths=[col1_width, col2_width])
-    t1.setStyle(TableStyle([('VALIGN', (0,0), (-1,-1), 'TOP'), ('GRID', (0,0), (-1,-1), 0.5, colors.grey), ('BACKGROUND', (0,0), (0,-1), colors.whitesmoke), ('LEFTPADDING', (0,0), (-1,-1), 5), ('BOTTOMPADDING', (0,0), (-1,-1), 3), ('TOPPADDING', (0,0), (-1,-1), 3)]))
-    story.append(t1); story.append(Spacer(1, 0.5*cm))
-    
-    data_block2 = [
-        [Paragraph("Auftraggeber:", style_tab_bold), Paragraph(meta['auftraggeber'], style_tab_norm)],
-        [Paragraph("Objekt:", style_tab_bold), Paragraph(meta['objekt'], style_tab_norm)],
-        [Paragraph("Bohrunternehmer:", style_tab_bold), Paragraph(meta['firma'], style_tab_norm)],
-        [Paragraph("Geräteführer:", style_tab_bold), Paragraph(meta['geraetefuehrer'], style_tab_norm)],
-        [Paragraph("Gebohrt:", style_tab_bold), Paragraph(meta['datum'], style_tab_norm)],
-        [Paragraph("Bohrlochdurchmesser:", style_tab_bold), Paragraph(f"bis {meta['teufe']}m: {meta['durchmesser']}mm", style_tab_norm)],
-        [Paragraph("Bohrverfahren:", style_tab_bold), Paragraph(f"bis {meta['teufe']}m: {meta['verfahren']}", style_tab_norm)],
-        [Paragraph("Gitterwerte:", style_tab_bold), Paragraph(f"Rechts: {meta['rechtswert']} | Hoch: {meta['hochwert']}", style_tab_norm)]
-    ]
-    t2 = Table(data_block2, colWidths=[col1_width, col2_width])
-    t2.setStyle(TableStyle([('VALIGN', (0,0), (-1,-1), 'TOP'), ('GRID', (0,0), (-1,-1), 0.5, colors.grey), ('BACKGROUND', (0,0), (0,-1), colors.whitesmoke), ('LEFTPADDING', (0,0), (-1,-1), 5), ('BOTTOMPADDING', (0,0), (-1,-1), 3), ('TOPPADDING', (0,0), (-1,-1), 3)]))
-    story.append(t2); story.append(Spacer(1, 0.5*cm))
-    
-    if map_image_buffer:
-        img = RLImage(map_image_buffer)
-        img_width = available_width
-        aspect = img.imageHeight / float(img.imageWidth)
-        img.drawWidth = img_width; img.drawHeight = img_width * aspect
-        t_map = Table([[img]], colWidths=[available_width])
-        t_map.setStyle(TableStyle([('GRID', (0,0), (-1,-1), 0.5, colors.black), ('VALIGN', (0,0), (-1,-1), 'MIDDLE'), ('ALIGN', (0,0), (-1,-1), 'CENTER'), ('LEFTPADDING', (0,0), (-1,-1), 0), ('RIGHTPADDING', (0,0), (-1,-1), 0), ('TOPPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 0)]))
-        story.append(t_map)
-    else:
-        story.append(Paragraph("(Keine Karte verfügbar)", style_tab_norm))
-    story.append(PageBreak())
-    
-    # --- SEITE 2 ---
-    w_inner = [2.5*cm, 2.5*cm, 2.5*cm, 1.5*cm] 
-    def create_nested_desc_table(a, b, c, d, e, f, g, h, i, is_header=False):
-        s = style_geo_header if is_header else style_geo_norm
-        data = [[Paragraph(f"{a}", s)], [Paragraph(f"{b}", s)], [Paragraph(f"{c}", s), Paragraph(f"{d}", s), Paragraph(f"{e}", s), ''], [Paragraph(f"{f}", s), Paragraph(f"{g}", s), Paragraph(f"{h}", s), Paragraph(f"{i}", s)]]
-        t = Table(data, colWidths=w_inner)
-        t.setStyle(TableStyle([('GRID', (0,0), (-1,-1), 0.5, colors.black), ('SPAN', (0,0), (-1,0)), ('SPAN', (0,1), (-1,1)), ('SPAN', (2,2), (3,2)), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('LEFTPADDING', (0,0), (-1,-1), 6), ('RIGHTPADDING', (0,0), (-1,-1), 2), ('TOPPADDING', (0,0), (-1,-1), 1), ('BOTTOMPADDING', (0,0), (-1,-1), 1)]))
-        return t
-
-    h_row1 = [Paragraph("1", style_geo_header), Paragraph("2", style_geo_header), Paragraph("3", style_geo_header), Paragraph("4", style_geo_header), Paragraph("5", style_geo_header), Paragraph("6", style_geo_header)]
-    nested_header = create_nested_desc_table("a) Benennung der Bodenart und Beimengungen", "b) Ergänzende Bemerkung", "c) Beschaffenheit<br/>nach Bohrgut", "d) Beschaffenheit<br/>nach Bohrvorgang", "e) Farbe", "f) Übliche<br/>Benennung", "g) Geologische<br/>Benennung", "h) Gruppe", "i) Kalk-<br/>gehalt", is_header=True)
-    h_row2 = [Paragraph("Bis<br/>... m<br/>unter<br/>Ansatz-<br/>punkt", style_geo_header), nested_header, Paragraph("Bemerkungen<br/>Sonderprobe<br/>Wasserführung<br/>Bohrwerkzeuge<br/>Kernverlust<br/>Sonstiges", style_geo_norm), Paragraph("Art", style_geo_norm), Paragraph("Nr", style_geo_norm), Paragraph("Tiefe<br/>in m<br/>(Unter-<br/>kante)", style_geo_norm)]
-    table_data = [h_row1, h_row2]
-    
-    for _, row in df_geo.iterrows():
-        nested_data = create_nested_desc_table(
-            f"a) {row['a']}" if row['a'] else "a)", f"b) {row['b']}" if row['b'] else "b)",
-            f"c) {row['c']}" if row['c'] else "c)", f"d) {row['d']}" if row['d'] else "d)",
-            f"e) {row['e']}" if row['e'] else "e)", f"f) {row['f']}" if row['f'] else "f)",
-            f"g) {row['g']}" if row['g'] else "g)", f"h) {row['h']}" if row['h'] else "h)",
-            f"i) {row['i']}" if row['i'] else "i)"
-        )
-        p_tiefe = f"{row['p_tiefe']:.2f}" if row['p_tiefe'] > 0 else ""
-        table_data.append([Paragraph(f"{row['Bis_m']:.2f}", style_geo_center), nested_data, Paragraph(str(row['Bemerkung']), style_geo_norm), Paragraph(str(row['p_art']), style_geo_norm), Paragraph(str(row['p_nr']), style_geo_norm), Paragraph(p_tiefe, style_geo_norm)])
-    
-    col_widths = [1.5*cm, sum(w_inner), 3.0*cm, 1.2*cm, 1.0*cm, 1.3*cm]
-    t_geo = Table(table_data, colWidths=col_widths, repeatRows=2)
-    t_geo.setStyle(TableStyle([('GRID', (0,0), (-1,-1), 0.5, colors.black), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('ALIGN', (0,0), (0,-1), 'CENTER'), ('LEFTPADDING', (0,0), (-1,-1), 0), ('RIGHTPADDING', (0,0), (-1,-1), 0), ('TOPPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 0), ('BACKGROUND', (0,1), (-1,1), colors.white)]))
-    story.append(t_geo)
-    story.append(PageBreak())
-    
-    if svg_bytes:
-        try:
-            drawing = svg2rlg(BytesIO(svg_bytes.encode('utf-8')))
-            avail_width = 460
-            factor = avail_width / drawing.width
-            drawing.width = drawing.width * factor; drawing.height = drawing.height * factor
-            drawing.scale(factor, factor)
-            story.append(drawing)
-        except: pass
-
-    doc.build(story, onFirstPage=draw_header_on_page, onLaterPages=draw_header_on_page)
-    return buffer.getvalue()
+        # Kompakt (spaltenweise, gezippt) inkl. Logo; gebaut erst beim Klick. Das läuft
+        # ohne Skript-Kontext, daher wird das Logo hier gelesen und mitgegeben.
+        logo = st.session_state.get("logo_file")
+        save_logo = logo.getvalue() if logo else st.session_state.get("project_logo")
+        def save_columnar():
+            buf = BytesIO()
+            save_project_columnar(save_data, buf, save_logo)
+            return buf.getvalue()
+        st.download_button(label="🗜️", data=save_columnar, file_name="bohrprojekt.bohrz", mime="application/zip", help="Projekt kompakt speichern (.bohrz)")
 
 # ==============================================================================
 # GUI
@@ -446,7 +116,7 @@ with st.expander("1. Kopfblatt & Standort", expanded=True):
     col_map, col_data = st.columns([1, 1])
     with col_data:
         st.subheader("Stammdaten")
-        logo_upload = st.file_uploader("Firmenlogo (für PDF Header)", type=["png", "jpg", "jpeg"])
+        logo_upload = st.file_uploader("Firmenlogo (für PDF Header)", type=["png", "jpg", "jpeg"], key="logo_file")
         projekt = st.text_input("Projekt / Bohrung", key="projekt")
         ort = st.text_input("Ort / Adresse", key="ort")
         kreis = st.text_input("Kreis", key="kreis")
@@ -454,10 +124,12 @@ with st.expander("1. Kopfblatt & Standort", expanded=True):
         zweck = c_zweck.text_input("Zweck der Bohrung", key="zweck")
         art_bohrung = c_art.text_input("Art der Bohrung", key="art_bohrung") 
         if st.button("📍 Adresse suchen"):
-            try:
-                loc = Nominatim(user_agent="app").geocode(ort)
-                if loc: st.session_state.lat, st.session_state.lon = loc.latitude, loc.longitude
-            except: pass
+            loc = geocode(ort)
+            if loc:
+                st.session_state.lat, st.session_state.lon = loc
+                synced = sync_coordinates({"lat": loc[0], "lon": loc[1]})
+                st.session_state.rechtswert, st.session_state.hochwert = synced["rechtswert"], synced["hochwert"]
+            else: st.warning("Adresse nicht gefunden oder Geocoder nicht erreichbar.")
         st.markdown("---")
         c1, c2 = st.columns(2)
         auftraggeber = c1.text_input("Auftraggeber", key="auftraggeber")
@@ -474,34 +146,203 @@ with st.expander("1. Kopfblatt & Standort", expanded=True):
         endteufe = c8.number_input("Endteufe (m)", key="endteufe")
         st.markdown("---")
         c_coord1, c_coord2 = st.columns(2)
-        rechtswert = c_coord1.text_input("Rechtswert (Gitter)", key="rechtswert")
-        hochwert = c_coord2.text_input("Hochwert (Gitter)", key="hochwert")
+        # Rechts-/Hochwert (UTM33, mit Zonennummer oder Gauss-Krüger) setzen den Kartenpunkt
+        def grid_changed():
+            synced = sync_coordinates({k: st.session_state[k] for k in ("lat", "lon", "rechtswert", "hochwert")}, prefer="grid")
+            st.session_state.lat, st.session_state.lon = synced["lat"], synced["lon"]
+        rechtswert = c_coord1.text_input("Rechtswert (Gitter)", key="rechtswert", on_change=grid_changed)
+        hochwert = c_coord2.text_input("Hochwert (Gitter)", key="hochwert", on_change=grid_changed)
         aktenzeichen = st.text_input("Aktenzeichen", key="aktenzeichen")
     with col_map:
+        # Die Grundkarte enthält nur den eigenen Standort und bleibt zwischen Läufen gleich;
+        # die Archiv-Ebene (bohrprotokoll.wellmap) wird für den sichtbaren Ausschnitt
+        # nachgereicht. Ohne Archiv-Ebene löst die Karte keine Neuläufe aus.
+        show_archive = st.toggle("Bohrungen aus dem Archiv anzeigen", key="map_archive")
         m = folium.Map([st.session_state.lat, st.session_state.lon], zoom_start=16)
         folium.CircleMarker([st.session_state.lat, st.session_state.lon], radius=8, color="red", fill=True, fill_color="red").add_to(m)
-        st_folium(m, height=350)
+        well_group = None
+        if show_archive:
+            view = st.session_state.get("map") or {}
+            sw, ne = (view.get("bounds") or {}).get("_southWest") or {}, (view.get("bounds") or {}).get("_northEast") or {}
+            bbox = (sw["lat"], sw["lng"], ne["lat"], ne["lng"]) if sw.get("lat") is not None and ne.get("lat") is not None else bbox_around(st.session_state.lat, st.session_state.lon, 1)
+            well_group = well_layer(well_clusters(get_archive(), bbox, view.get("zoom") or 16))
+        st_folium(m, key="map", height=350, feature_group_to_add=well_group, returned_objects=["bounds", "zoom"] if show_archive else [])
 
 with st.expander("2. Schichtenverzeichnis (DIN Eingabe)", expanded=False):
-    df_geo = st.data_editor(pd.DataFrame(st.session_state.geo_data), num_rows="dynamic", use_container_width=True, column_config={"Bis_m": st.column_config.NumberColumn("Bis (m)", format="%.2f"), "a": st.column_config.TextColumn("a) Benennung"), "b": st.column_config.TextColumn("b) Ergänzung"), "c": st.column_config.TextColumn("c) Beschaff. Bohrgut"), "d": st.column_config.TextColumn("d) Beschaff. Vorgang"), "e": st.column_config.TextColumn("e) Farbe"), "f": st.column_config.SelectboxColumn("f) Übl. Benennung", options=["Sand", "Kies", "Mudde", "Mergel", "Ton", "Schluff", "Mutterboden", "Lehm", "Auffüllung"]), "g": st.column_config.TextColumn("g) Geol. Benennung"), "h": st.column_config.TextColumn("h) Gruppe"), "i": st.column_config.SelectboxColumn("i) Kalk", options=["0", "+", "++", "+++"]), "Bemerkung": st.column_config.TextColumn("Bemerkungen"), "p_art": st.column_config.TextColumn("Probe Art"), "p_nr": st.column_config.TextColumn("Probe Nr"), "p_tiefe": st.column_config.NumberColumn("Probe Tiefe", format="%.2f")})
+    col_edit, col_preview = st.columns([4, 1])
+    # Platzhalter; die Vorschau wird erst gefüllt, wenn auch Ausbau/Ringraum gelesen sind
+    preview_slot = col_preview.empty()
+    with col_edit: df_geo = st.data_editor(pd.DataFrame(st.session_state.geo_data), num_rows="dynamic", use_container_width=True, column_config={"Bis_m": st.column_config.NumberColumn("Bis (m)", format="%.2f"), "a": st.column_config.TextColumn("a) Benennung"), "b": st.column_config.TextColumn("b) Ergänzung"), "c": st.column_config.TextColumn("c) Beschaff. Bohrgut"), "d": st.column_config.TextColumn("d) Beschaff. Vorgang"), "e": st.column_config.TextColumn("e) Farbe"), "f": st.column_config.SelectboxColumn("f) Übl. Benennung", options=["Sand", "Kies", "Mudde", "Mergel", "Ton", "Schluff", "Mutterboden", "Lehm", "Auffüllung"]), "g": st.column_config.TextColumn("g) Geol. Benennung"), "h": st.column_config.TextColumn("h) Gruppe"), "i": st.column_config.SelectboxColumn("i) Kalk", options=["0", "+", "++", "+++"]), "Bemerkung": st.column_config.TextColumn("Bemerkungen"), "p_art": st.column_config.TextColumn("Probe Art"), "p_nr": st.column_config.TextColumn("Probe Nr"), "p_tiefe": st.column_config.NumberColumn("Probe Tiefe", format="%.2f")})
     st.session_state.geo_data = df_geo.to_dict('records')
+    # Befunde der Prüfung; gefüllt, sobald auch Ausbau/Ringraum gelesen sind
+    issue_slots = {"geo": col_edit.empty()}
 
 with st.expander("3. Ausbau", expanded=False):
     c1, c2 = st.columns(2)
     with c1:
         df_rohr = st.data_editor(pd.DataFrame(st.session_state.rohr_data), num_rows="dynamic", key="editor_rohr")
         st.session_state.rohr_data = df_rohr.to_dict('records')
+        issue_slots["rohr"] = st.empty()
         ws_ruhe = st.number_input("Ruhewasser (m u. GOK)", key="ws_ruhe")
     with c2:
         df_ring = st.data_editor(pd.DataFrame(st.session_state.ring_data), num_rows="dynamic", key="editor_ring")
         st.session_state.ring_data = df_ring.to_dict('records')
+        issue_slots["ring"] = st.empty()
+
+# Tiefenangaben aller drei Tabellen in einem Durchgang prüfen (bohrprotokoll.validation);
+# die Befunde stehen unter dem jeweiligen Editor. Mit Fehlern wird nichts gerendert.
+issues = validate_project(df_geo, df_rohr, df_ring, st.session_state.endteufe)
+for table, slot in issue_slots.items():
+    found = issues[issues["tabelle"] == table]
+    if len(found):
+        with slot.container():
+            for r in found.itertuples():
+                (st.error if r.schwere == FEHLER else st.warning)(f"Zeile {r.zeile + 1} ({r.spalte}): {r.meldung}")
+invalid = has_errors(issues)
+
+with st.expander("4. Projektarchiv", expanded=False):
+    # Suche über die Indizes der Archivdatenbank (bohrprotokoll.archive); Massenimport
+    # vorhandener Dateien: python -m bohrprotokoll.archive ORDNER
+    archive = get_archive()
+
+    def apply_project(data):
+        # Als Callback vor dem nächsten Lauf, damit die Eingabefelder die Werte übernehmen
+        for k, v in sync_coordinates(data.get("meta", {})).items():
+            st.session_state[k] = v
+        st.session_state.geo_data = data.get("geo", [])
+        st.session_state.rohr_data = data.get("rohr", [])
+        st.session_state.ring_data = data.get("ring", [])
+        st.session_state.project_logo = None
+
+    s1, s2, s3, s4, s5, s6 = st.columns([2, 2, 1, 1, 2, 1])
+    q_az = s1.text_input("Aktenzeichen (Anfang)", key="q_aktenzeichen")
+    q_kreis = s2.text_input("Kreis", key="q_kreis")
+    q_depth = s3.number_input("Endteufe ab (m)", min_value=0.0, key="q_depth")
+    q_radius = s4.number_input("Umkreis (km)", min_value=0.0, key="q_radius", help="Um den aktuellen Standort; 0 = überall")
+    q_soil = s5.selectbox("Bodenart", [""] + SOIL_TYPES, key="q_soil")
+    q_ton = s6.checkbox("Tonsperre", key="q_ton")
+    results = archive.search(aktenzeichen=q_az.strip(), kreis=q_kreis.strip(), bbox=bbox_around(st.session_state.lat, st.session_state.lon, q_radius) if q_radius else None, min_depth=q_depth or None, soil=q_soil or None, tonsperre=q_ton, limit=200)
+    st.caption(f"{len(results)} Treffer ({archive.stats()['projects']} Projekte im Archiv)")
+    selection = st.dataframe(results.drop(columns=["id", "source"]), hide_index=True, on_select="rerun", selection_mode="multi-row", key="archive_results")
+    a1, a2 = st.columns(2)
+    rows = selection.selection.rows
+    if rows:
+        a1.button("📂 In Formular laden", on_click=lambda pid=int(results.iloc[rows[0]]["id"]): apply_project(archive.load(pid)))
+    a2.button("🗄️ Aktuelles Projekt archivieren", on_click=lambda data=save_data, source=f"app:{st.session_state.aktenzeichen or st.session_state.projekt}": archive.add(data, source), help="Gleiches Aktenzeichen ersetzt den archivierten Stand")
+
+    # Geologischer Schnitt durch die markierten Bohrungen (bohrprotokoll.section);
+    # ohne Linie entlang der Ausgleichsgeraden. Unter LOD_SCALE_Y nur Flächenfarben.
+    if len(rows) >= 2:
+        st.markdown("**Geologischer Schnitt**")
+        c_zoom, c_line = st.columns([1, 3])
+        section_scale = c_zoom.slider("Höhenmaßstab (Pixel je m)", 1, 20, SECTION_SCALE_Y, key="section_scale")
+        line_text = c_line.text_input("Schnittlinie (lat,lon; lat,lon; ...)", key="section_line", help="Leer = Ausgleichsgerade durch die Bohrungen")
+        projects = [archive.load(int(results.iloc[r]["id"])) for r in rows]
+        try:
+            line = parse_line(line_text) if line_text.strip() else None
+            wells = wells_from_projects(projects)
+            if len(wells) < len(projects): st.caption(f"{len(projects) - len(wells)} Bohrung(en) ohne Koordinaten ausgelassen")
+            section_key = content_key(projects, line, section_scale)
+            svg = get_artifact_cache().get_or_build("section", section_key, lambda: section_svg(wells, line, section_scale))
+            st.image(svg, width="stretch")
+            def section_pdf():
+                buf = BytesIO(); write_section_pdf(buf, wells, line, scale_y=section_scale); return buf.getvalue()
+            st.download_button("📥 Schnitt als PDF", section_pdf, "Schnitt.pdf", "application/pdf")
+        except ValueError as e:
+            st.error(f"Schnitt nicht möglich: {e}")
+
+# --- LIVE-VORSCHAU ---
+# Entprellt: liegt die letzte Vorschau weniger als PREVIEW_DEBOUNCE Sekunden zurück,
+# bleibt sie stehen und ein Fragment zeichnet nach, sobald die Eingaben ruhen. Danach
+# läuft die Seite einmal neu, damit das Fragment nicht weiter periodisch ausgeführt wird.
+# Gezeichnet wird über den Fragment-Cache, also nur geänderte Elemente neu.
+PREVIEW_DEBOUNCE = 0.8
+preview_key = content_key(df_geo, df_rohr, df_ring)
+
+def render_preview():
+    st.session_state.preview_svg = None if invalid else preview_svg(ProfileData(df_geo, df_rohr, df_ring))
+    st.session_state.preview_key = preview_key; st.session_state.preview_at = time.time()
+
+def preview_due():
+    # Fehlerhafte Eingaben sofort (es wird nichts gezeichnet)
+    return st.session_state.get("preview_key") != preview_key and (invalid or time.time() - st.session_state.get("preview_at", 0) >= PREVIEW_DEBOUNCE)
+
+if preview_due(): render_preview()
+
+@st.fragment(run_every=PREVIEW_DEBOUNCE if st.session_state.get("preview_key") != preview_key else None)
+def live_preview():
+    if preview_due():
+        render_preview(); st.rerun(scope="app")
+    if st.session_state.get("preview_svg"):
+        st.image(st.session_state.preview_svg, width="stretch")
+    elif "preview_svg" in st.session_state:
+        st.caption("Keine Vorschau: Tiefenangaben fehlerhaft")
+
+with preview_slot.container():
+    st.caption("Vorschau")
+    live_preview()
 
 st.divider()
-logo_bytes = logo_upload.getvalue() if logo_upload else None
-meta_data = {"projekt": projekt, "ort": ort, "firma": bohrfirma, "auftraggeber": auftraggeber, "datum": datum_str, "aktenzeichen": aktenzeichen, "verfahren": bohrverfahren, "durchmesser": bohrdurchmesser, "ansatz": ansatzpunkt, "teufe": endteufe, "ws_ruhe": ws_ruhe, "kreis": kreis, "zweck": zweck, "art_bohrung": art_bohrung, "objekt": objekt, "geraetefuehrer": geraetefuehrer, "rechtswert": rechtswert, "hochwert": hochwert, "logo_bytes": logo_bytes}
-
-if st.button("📄 PDF mit Logo erstellen"):
-    svg_str = generate_svg_string(df_geo, df_rohr, df_ring, meta_data)
-    map_buf = get_static_map_image(st.session_state.lat, st.session_state.lon)
-    pdf = create_multipage_pdf_with_header(meta_data, df_geo, df_rohr, df_ring, svg_str, map_buf)
-    st.download_button("📥 PDF Download", pdf, "Bohrprotokoll.pdf", "application/pdf")
+profil_modus = st.selectbox("Profildarstellung (PDF)", ["Eine Seite (verkleinert)", "1:100", "1:200"])
+profile_scale = {"1:100": 100, "1:200": 200}.get(profil_modus)
+logo_bytes = logo_upload.getvalue() if logo_upload else st.session_state.get("project_logo")
+meta_data = pdf_meta({k: st.session_state[k] for k in defaults}, logo_bytes)
+
+# Artefakte werden über den Inhalt verschlüsselt; unveränderte Projekte kommen
+# direkt aus dem Cache, bei Änderungen wird nur das betroffene Artefakt neu gebaut.
+# Das PDF wird direkt in eine temporäre Datei geschrieben und erst beim Klick
+# auf "Download" gelesen, statt pro Sitzung als Bytes im Speicher zu liegen.
+artifacts = get_artifact_cache()
+pdf_files = get_file_artifact_cache()
+lat, lon = st.session_state.lat, st.session_state.lon
+map_key = content_key(lat, lon, tile_url_template())
+pdf_key = content_key(meta_data, df_geo, df_rohr, df_ring, map_key, profile_scale)
+
+# Das PDF entsteht als Hintergrundauftrag (bohrprotokoll.jobs); das Skript zeigt
+# nur den Fortschritt an und bleibt bedienbar.
+jobs = get_job_queue()
+
+def run_pdf_job(job):
+    # Läuft im Hintergrund-Thread: keine Zugriffe auf st.* / session_state.
+    # Ohne Karte (Kacheln nicht erreichbar) liegt das PDF getrennt unter "pdf_ohne_karte":
+    # es ist herunterladbar, ein erneuter Klick versucht die Karte aber noch einmal.
+    get_map = lambda: artifacts.get_or_build("map", map_key, lambda: get_static_map_png(lat, lon))
+    path = pdf_files.get_or_write("pdf", pdf_key, lambda out: write_pdf_job(job, out, meta_data, df_geo, df_rohr, df_ring, profile_scale, get_map, jobs.io_pool), suffix=".pdf")
+    if job.map_missing: pdf_files.put("pdf_ohne_karte", pdf_key, pdf_files.pop("pdf", pdf_key))
+    return path
+
+pdf_path = pdf_files.get("pdf", pdf_key)
+if invalid and not pdf_path:
+    st.error("PDF nicht möglich: Tiefenangaben fehlerhaft (siehe Schichtenverzeichnis / Ausbau).")
+if st.button("📄 PDF mit Logo erstellen", disabled=invalid) and not pdf_path:
+    try: jobs.submit(pdf_key, run_pdf_job)
+    except QueueFull: st.warning("Server ausgelastet, bitte in Kürze erneut versuchen.")
+
+job = jobs.get(pdf_key)
+if job is not None and not job.done:
+    @st.fragment(run_every=0.5)
+    def pdf_progress():
+        # Nur dieser Abschnitt wird periodisch neu ausgeführt; fertig -> ganze Seite neu
+        if job.done: st.rerun()
+        st.progress(job.progress, text=job.message)
+        if st.button("Abbrechen"): job.cancel()
+    pdf_progress()
+elif job is not None and job.state == FAILED and not pdf_path:
+    st.error(f"PDF konnte nicht erstellt werden: {job.error}")
+elif job is not None and job.state == CANCELLED and not pdf_path:
+    st.info("PDF-Erstellung abgebrochen.")
+pdf_path = pdf_path or pdf_files.get("pdf", pdf_key)
+if not pdf_path and pdf_files.get("pdf_ohne_karte", pdf_key) and (job is None or job.done):
+    pdf_path = pdf_files.get("pdf_ohne_karte", pdf_key)
+    st.warning("PDF ohne Karte erstellt (Kartenkacheln nicht erreichbar). Erneut erstellen versucht die Karte noch einmal.")
+
+def read_pdf(path):
+    with open(path, "rb") as f: return f.read()
+
+if pdf_path:
+    st.download_button("📥 PDF Download", lambda: read_pdf(pdf_path), "Bohrprotokoll.pdf", "application/pdf")
+    tile_stats = get_tile_cache().stats()
+    st.caption(f"Kartenkacheln: {tile_stats['hits']} aus Cache, {tile_stats['misses']} geladen")
+    if job is not None and job.timings:
+        # Nur mit BOHR_TIMING (bohrprotokoll.timing)
+        st.caption("Stufenzeiten: " + ", ".join(f"{k} {v:.0f} ms" for k, v in job.timings["stufen_ms"].items()) + f" | PDF {job.timings['groessen'].get('pdf', 0) / 1024:.0f} KB")
@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.graphics.shapes import Group, Rect, Line, PolyLine, Path, String
+from svglib.svglib import svg2rlg
+
+from benchmarks.synthetic import synthetic_well
+from bohrprotokoll.profile import generate_svg_string, build_profile_drawing
+
+# ==============================================================================
+# SVG-BACKEND vs. NATIVES REPORTLAB-BACKEND
+# ==============================================================================
+# Aufruf: python benchmarks/bench_backends.py
+# Vergleicht den Umweg SVG -> svg2rlg mit dem direkten Drawing und prüft,
+# dass beide Backends dieselbe Geometrie liefern.
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+
+def _r(*vals):
+    return tuple(round(float(v), 3) for v in vals)
+
+
+def svg_geometry(svg):
+    geom = []
+    for el in ET.fromstring(svg):
+        tag = el.tag.replace(SVG_NS, "")
+        a = el.attrib
+        if tag == "rect":
+            kind = "hatch" if a.get("fill", "").startswith("url(") else "rect"
+            geom.append((kind,) + _r(a["x"], a["y"], a["width"], a["height"]))
+        elif tag == "line": geom.append(("line",) + _r(a["x1"], a["y1"], a["x2"], a["y2"]))
+        elif tag == "path" and "fill" in a:
+            pts = [c for seg in a["d"].lstrip("M").split(" L") for c in seg.split(",")]
+            geom.append(("line",) + _r(*pts))
+        elif tag == "text": geom.append(("text",) + _r(a["x"], a["y"]) + (el.text or "",))
+    return sorted(geom)
+
+
+def drawing_geometry(drawing):
+    geom = []
+    for node in drawing.contents[0].contents:
+        if isinstance(node, Rect): geom.append(("rect",) + _r(node.x, node.y, node.width, node.height))
+        elif isinstance(node, Line): geom.append(("line",) + _r(node.x1, node.y1, node.x2, node.y2))
+        elif isinstance(node, PolyLine): geom.append(("line",) + _r(*node.points))
+        elif isinstance(node, Group) and isinstance(node.contents[0], String):
+            geom.append(("text",) + _r(node.transform[4], node.transform[5]) + (node.contents[0].text,))
+        elif isinstance(node, Group) and isinstance(node.contents[0], Path):
+            x0, y0, x1, y1 = node.contents[0].getBounds()
+            geom.append(("hatch",) + _r(x0, y0, x1 - x0, y1 - y0))
+    return sorted(geom)
+
+
+def main():
+    print(f"{'Tiefe':>6} {'SVG+svg2rlg [ms]':>17} {'nativ [ms]':>11} {'Geometrie':>10}")
+    for depth, n_layers in [(45, 10), (100, 40), (300, 120)]:
+        meta, df_geo, df_rohr, df_ring = synthetic_well(depth, n_layers)
+        t0 = time.perf_counter()
+        svg = generate_svg_string(df_geo, df_rohr, df_ring, meta)
+        svg2rlg(BytesIO(svg.encode('utf-8')))
+        t_svg = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        drawing = build_profile_drawing(df_geo, df_rohr, df_ring, meta)
+        t_native = time.perf_counter() - t0
+        same = svg_geometry(svg) == drawing_geometry(drawing)
+        print(f"{depth:>6} {t_svg*1000:>17.1f} {t_native*1000:>11.1f} {'gleich' if same else 'ABWEICHUNG':>10}")
+        if not same: sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
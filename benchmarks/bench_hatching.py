@@ -0,0 +1,183 @@
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from svglib.svglib import svg2rlg
+
+from benchmarks.synthetic import synthetic_well
+from bohrprotokoll.profile import generate_svg_string, build_profile_drawing
+
+# ==============================================================================
+# REGRESSION: PATTERN-SCHRAFFUR vs. PUNKTWEISE AUSGABE
+# ==============================================================================
+# Aufruf: python benchmarks/bench_hatching.py
+# Die Referenz ist die bisherige Implementierung mit einem Element pro Punkt.
+
+def legacy_generate_svg_string(df_geo, df_rohr, df_ring, meta):
+    scale_y = 15
+    width = 700
+    max_depth = 48
+    if not df_geo.empty: max_depth = max(max_depth, df_geo['Bis_m'].max())
+    if not df_rohr.empty: max_depth = max(max_depth, df_rohr['Bis'].max())
+    
+    total_height = (max_depth * scale_y) + 80
+    svg = f'<svg width="{width}" height="{total_height}" xmlns="http://www.w3.org/2000/svg">'
+    
+    start_y = 40; scale_x = 40; col_geo_x = 100; col_geo_w = 100; col_tech_x = 350      
+    
+    # Maßstab
+    svg += f'<text x="{scale_x}" y="{start_y - 15}" text-anchor="middle" font-family="Arial" font-size="10" font-weight="bold">m u. GOK</text>'
+    svg += f'<line x1="{scale_x}" y1="{start_y}" x2="{scale_x}" y2="{start_y + max_depth*scale_y}" stroke="black" stroke-width="1"/>'
+    for i in range(int(max_depth) + 1):
+        y = start_y + i * scale_y
+        if i % 2 == 0:
+            svg += f'<line x1="{scale_x - 5}" y1="{y}" x2="{scale_x}" y2="{y}" stroke="black" stroke-width="1"/>'
+            svg += f'<text x="{scale_x - 8}" y="{y + 4}" text-anchor="end" font-family="Arial" font-size="10">{i}</text>'
+        else:
+            svg += f'<line x1="{scale_x - 3}" y1="{y}" x2="{scale_x}" y2="{y}" stroke="black" stroke-width="0.5"/>'
+
+    # Geologie
+    last_d = 0
+    for _, r in df_geo.iterrows():
+        h = (r['Bis_m'] - last_d) * scale_y
+        y_pos = start_y + last_d * scale_y
+        
+        boden_text = (str(r.get('f', '')) + " " + str(r.get('a', '')) + " " + str(r.get('g', ''))).lower()
+        fill_color, type_ = "#FFF59D", "sand"
+        
+        if "kies" in boden_text: fill_color, type_ = "#FFCC80", "kies"
+        elif "schluff" in boden_text: fill_color, type_ = "#E6EE9C", "schluff"
+        elif "ton" in boden_text: fill_color, type_ = "#BCAAA4", "ton"
+        elif "lehm" in boden_text: fill_color, type_ = "#FFE082", "lehm"
+        elif "mudde" in boden_text or "torf" in boden_text: fill_color, type_ = "#AED581", "mudde"
+        elif "mutterboden" in boden_text: fill_color, type_ = "#5D4037", "mutterboden"
+        elif "auffüllung" in boden_text: fill_color, type_ = "#EEEEEE", "auffuellung"
+        if "sand" in str(r.get('f', '')).lower(): fill_color, type_ = "#FFF59D", "sand"
+
+        # 1. Farbe
+        svg += f'<rect x="{col_geo_x}" y="{y_pos}" width="{col_geo_w}" height="{h}" fill="{fill_color}" stroke="black"/>'
+        
+        # 2. Muster
+        pattern_group = ""
+        if type_ == "sand":
+            step = 10
+            for py in range(int(y_pos), int(y_pos + h), step):
+                for px in range(int(col_geo_x), int(col_geo_x + col_geo_w), step):
+                    offset = 5 if (py // step) % 2 == 0 else 0
+                    if px + offset < col_geo_x + col_geo_w: pattern_group += f'<rect x="{px + offset}" y="{py}" width="1.5" height="1.5" fill="black"/>'
+        elif type_ == "mudde":
+            step = 12
+            for py in range(int(y_pos), int(y_pos + h), step):
+                for px in range(int(col_geo_x), int(col_geo_x + col_geo_w), step):
+                    offset = 6 if (py // step) % 2 == 0 else 0
+                    if px + offset < col_geo_x + col_geo_w: pattern_group += f'<rect x="{px + offset}" y="{py}" width="2.5" height="2.5" fill="#5D4037"/>'
+        elif type_ == "kies":
+            step = 12
+            for py in range(int(y_pos), int(y_pos + h), step):
+                for px in range(int(col_geo_x), int(col_geo_x + col_geo_w), step):
+                    if px + 6 < col_geo_x + col_geo_w and py + 6 < y_pos + h: pattern_group += f'<circle cx="{px+4}" cy="{py+4}" r="2.5" fill="none" stroke="black" stroke-width="1"/>'
+        elif type_ == "schluff":
+            step = 4
+            for px in range(int(col_geo_x), int(col_geo_x + col_geo_w), step): pattern_group += f'<line x1="{px}" y1="{y_pos}" x2="{px}" y2="{y_pos+h}" stroke="black" stroke-width="0.5"/>'
+        elif type_ == "ton":
+            step = 4
+            for py in range(int(y_pos), int(y_pos + h), step): pattern_group += f'<line x1="{col_geo_x}" y1="{py}" x2="{col_geo_x+col_geo_w}" y2="{py}" stroke="black" stroke-width="0.5"/>'
+        elif type_ == "lehm":
+            step = 6
+            for px in range(int(col_geo_x), int(col_geo_x + col_geo_w), step): pattern_group += f'<line x1="{px}" y1="{y_pos}" x2="{px}" y2="{y_pos+h}" stroke="black" stroke-width="0.5"/>'
+            for py in range(int(y_pos), int(y_pos + h), step): pattern_group += f'<line x1="{col_geo_x}" y1="{py}" x2="{col_geo_x+col_geo_w}" y2="{py}" stroke="black" stroke-width="0.5"/>'
+        elif type_ == "mutterboden":
+            step_x, step_y = 15, 10
+            for py in range(int(y_pos), int(y_pos + h), step_y):
+                for px in range(int(col_geo_x), int(col_geo_x + col_geo_w), step_x):
+                    if px + 6 < col_geo_x + col_geo_w: pattern_group += f'<path d="M{px},{py} L{px+3},{py+4} L{px+6},{py}" fill="none" stroke="white" stroke-width="1"/>'
+        elif type_ == "auffuellung":
+            step = 10
+            k_min = y_pos - (col_geo_x + col_geo_w)
+            k_max = (y_pos + h) - col_geo_x
+            for k in range(int(k_min), int(k_max), step):
+                points = []
+                y = col_geo_x + k
+                if y_pos <= y <= y_pos+h: points.append((col_geo_x, y))
+                y = (col_geo_x + col_geo_w) + k
+                if y_pos <= y <= y_pos+h: points.append((col_geo_x+col_geo_w, y))
+                x = y_pos - k
+                if col_geo_x <= x <= col_geo_x+col_geo_w: points.append((x, y_pos))
+                x = (y_pos + h) - k
+                if col_geo_x <= x <= col_geo_x+col_geo_w: points.append((x, y_pos+h))
+                unique = sorted(list(set(points)))
+                if len(unique) >= 2:
+                    pattern_group += f'<line x1="{unique[0][0]:.1f}" y1="{unique[0][1]:.1f}" x2="{unique[-1][0]:.1f}" y2="{unique[-1][1]:.1f}" stroke="black" stroke-width="1"/>'
+
+        svg += pattern_group
+        label = r.get('f', '')
+        text_col = "white" if fill_color == "#5D4037" else "black"
+        svg += f'<text x="{col_geo_x+col_geo_w+5}" y="{y_pos + h/2}" font-family="Arial" font-size="10" fill="{text_col}">{label}</text>'
+        last_d = r['Bis_m']
+        
+    # Technik
+    depth_markers = set()
+    for _, r in df_ring.iterrows():
+        y = start_y + r['Von']*scale_y
+        h = (r['Bis'] - r['Von']) * scale_y
+        fill = "#795548" if "Ton" in r['Mat'] else "white"
+        svg += f'<rect x="{col_tech_x-40}" y="{y}" width="80" height="{h}" fill="{fill}" stroke="none"/>'
+        if "Ton" not in r['Mat']:
+            step = 8
+            for py in range(int(y), int(y + h), step):
+                for px in range(int(col_tech_x-40), int(col_tech_x+40), step):
+                    if (px+py)%13 == 0: svg += f'<circle cx="{px}" cy="{py}" r="1" fill="orange"/>'
+        else:
+             svg += f'<path d="M{col_tech_x-40},{y+h} L{col_tech_x+40},{y}" stroke="white" stroke-width="1"/>'
+        depth_markers.add(r['Bis'])
+
+    for _, r in df_rohr.iterrows():
+        y = start_y + r['Von']*scale_y
+        h = (r['Bis'] - r['Von']) * scale_y
+        svg += f'<rect x="{col_tech_x-20}" y="{y}" width="40" height="{h}" fill="white" stroke="black" stroke-width="2"/>'
+        if "Filter" in r['Typ']:
+            for line_y in range(int(y)+2, int(y+h), 4): svg += f'<line x1="{col_tech_x-15}" y1="{line_y}" x2="{col_tech_x+15}" y2="{line_y}" stroke="black" stroke-width="1"/>'
+        if "Sumpf" in r['Typ']:
+            svg += f'<rect x="{col_tech_x-20}" y="{y}" width="40" height="{h}" fill="#CCC" stroke="black" stroke-width="2"/>'
+        depth_markers.add(r['Bis'])
+
+    label_line_x_start = col_tech_x + 40 
+    label_line_x_end = label_line_x_start + 20
+    for d in sorted([d for d in depth_markers if d > 0 and d <= max_depth]):
+        y = start_y + d * scale_y
+        svg += f'<line x1="{label_line_x_start}" y1="{y}" x2="{label_line_x_end}" y2="{y}" stroke="black" stroke-width="1"/>'
+        svg += f'<text x="{label_line_x_end + 3}" y="{y + 3}" font-family="Arial" font-size="10" fill="black">{d:.2f}m</text>'
+
+    svg += '</svg>'
+    return svg
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter(); res = fn(*args)
+    return res, time.perf_counter() - t0
+
+
+def _measure(gen, meta, df_geo, df_rohr, df_ring, native):
+    svg, t_svg = _timed(gen, df_geo, df_rohr, df_ring, meta)
+    elements = sum(1 for _ in ET.fromstring(svg).iter())
+    # PDF-Pfad: alt über svg2rlg, neu direkt als ReportLab-Drawing
+    if native: _, t_rlg = _timed(build_profile_drawing, df_geo, df_rohr, df_ring, meta)
+    else: _, t_rlg = _timed(svg2rlg, BytesIO(svg.encode('utf-8')))
+    return elements, len(svg.encode('utf-8')), t_svg, t_rlg
+
+
+def main():
+    print(f"{'Tiefe':>6} {'Variante':<8} {'Elemente':>9} {'Bytes':>10} {'SVG [ms]':>9} {'Drawing [ms]':>13}")
+    for depth, n_layers in [(45, 10), (100, 40), (300, 120)]:
+        meta, df_geo, df_rohr, df_ring = synthetic_well(depth, n_layers)
+        for name, gen, fills in [("alt", legacy_generate_svg_string, False), ("pattern", generate_svg_string, True)]:
+            elements, size, t_svg, t_rlg = _measure(gen, meta, df_geo, df_rohr, df_ring, fills)
+            print(f"{depth:>6} {name:<8} {elements:>9} {size:>10} {t_svg*1000:>9.1f} {t_rlg*1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
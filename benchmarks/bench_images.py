@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+
+from benchmarks.synthetic import noise_png, synthetic_well
+from bohrprotokoll.pdf import write_multipage_pdf
+from bohrprotokoll.profile import build_profile_drawing
+
+# ==============================================================================
+# LOGO UND KARTE: ORIGINAL vs. AUFBEREITET (images.py)
+# ==============================================================================
+# Aufruf: python benchmarks/bench_images.py
+# "original": Bilder unverändert, Logo wie bisher je Seite neu dekodiert (image_dpi=0)
+# "200 dpi" / "300 dpi": einmal verkleinert und neu komprimiert, ein ImageReader je PDF
+# Logo-Varianten: Grafik mit wenigen Farben und Rauschen (ungünstigster Fall).
+
+
+def graphic_png(width, height):
+    img = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(img)
+    draw.ellipse((width * 0.05, height * 0.1, width * 0.35, height * 0.9), fill="#2E7D32")
+    draw.rectangle((width * 0.4, height * 0.35, width * 0.95, height * 0.65), fill="#1565C0")
+    buf = BytesIO(); img.save(buf, format="PNG"); return buf.getvalue()
+
+
+def main():
+    map_png = noise_png(1000, 500)
+    logos = {"Grafik 3000x1500": graphic_png(3000, 1500), "Rauschen 2000x1000": noise_png(2000, 1000)}
+    print(f"{'Logo':<20} {'Schichten':>9} {'Variante':<9} {'1. PDF [ms]':>12} {'2. PDF [ms]':>12} {'PDF [KB]':>10} {'Ersparnis':>10}")
+    for logo_name, logo_png in logos.items():
+        for n_layers in [10, 200]:
+            meta, df_geo, df_rohr, df_ring = synthetic_well(n_layers * 0.5, n_layers)
+            meta["logo_bytes"] = logo_png
+            drawing = build_profile_drawing(df_geo, df_rohr, df_ring, meta)
+            base = None
+            for name, dpi in [("original", 0), ("200 dpi", 200), ("300 dpi", 300)]:
+                # 1. PDF: Bilder werden aufbereitet; 2. PDF: aus dem Bild-Cache
+                times = []
+                for _ in range(2):
+                    buf = BytesIO()
+                    t0 = time.perf_counter()
+                    write_multipage_pdf(buf, meta, df_geo, df_rohr, df_ring, drawing, BytesIO(map_png), image_dpi=dpi)
+                    times.append(time.perf_counter() - t0)
+                size = buf.tell(); base = base or size
+                print(f"{logo_name:<20} {n_layers:>9} {name:<9} {times[0]*1000:>12.1f} {times[1]*1000:>12.1f} {size/1024:>10.1f} {(1 - size / base) * 100:>9.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle
+
+from benchmarks.synthetic import synthetic_well
+from bohrprotokoll.layer_table import HEADER_BIS, HEADER_DESC, HEADER_TAIL, layer_table
+
+# ==============================================================================
+# SCHICHTENVERZEICHNIS: AUFBAU + doc.build JE 100 SCHICHTEN
+# ==============================================================================
+# Aufruf: python benchmarks/bench_layer_table.py
+# "bisher": pro Zeile 9 Paragraphs, neue Tabelle und neuer TableStyle (Altbestand)
+# "geteilt": gemeinsame Stile, Paragraphs nur für umbrechende Texte, verschachtelt
+# "flach": eine Tabelle mit SPAN-Befehlen
+
+
+def legacy_table(df_geo):
+    styles = getSampleStyleSheet()
+    style_geo_norm = ParagraphStyle('GeoNorm', parent=styles['Normal'], fontSize=7, leading=8)
+    style_geo_header = ParagraphStyle('GeoHeader', parent=styles['Normal'], fontName='Helvetica-Bold', fontSize=7, leading=8, alignment=1)
+    style_geo_center = ParagraphStyle('GeoCenter', parent=styles['Normal'], fontName='Helvetica', fontSize=7, leading=8, alignment=1)
+    w_inner = [2.5*cm, 2.5*cm, 2.5*cm, 1.5*cm]
+
+    def create_nested_desc_table(a, b, c, d, e, f, g, h, i, is_header=False):
+        s = style_geo_header if is_header else style_geo_norm
+        data = [[Paragraph(f"{a}", s)], [Paragraph(f"{b}", s)], [Paragraph(f"{c}", s), Paragraph(f"{d}", s), Paragraph(f"{e}", s), ''], [Paragraph(f"{f}", s), Paragraph(f"{g}", s), Paragraph(f"{h}", s), Paragraph(f"{i}", s)]]
+        t = Table(data, colWidths=w_inner)
+        t.setStyle(TableStyle([('GRID', (0,0), (-1,-1), 0.5, colors.black), ('SPAN', (0,0), (-1,0)), ('SPAN', (0,1), (-1,1)), ('SPAN', (2,2), (3,2)), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('LEFTPADDING', (0,0), (-1,-1), 6), ('RIGHTPADDING', (0,0), (-1,-1), 2), ('TOPPADDING', (0,0), (-1,-1), 1), ('BOTTOMPADDING', (0,0), (-1,-1), 1)]))
+        return t
+
+    nested_header = create_nested_desc_table(*HEADER_DESC, is_header=True)
+    table_data = [[Paragraph(str(n), style_geo_header) for n in range(1, 7)], [Paragraph(HEADER_BIS, style_geo_header), nested_header] + [Paragraph(t, style_geo_norm) for t in HEADER_TAIL]]
+    for _, row in df_geo.iterrows():
+        nested_data = create_nested_desc_table(*[f"{c}) {row[c]}" if row[c] else f"{c})" for c in "abcdefghi"])
+        p_tiefe = f"{row['p_tiefe']:.2f}" if row['p_tiefe'] > 0 else ""
+        table_data.append([Paragraph(f"{row['Bis_m']:.2f}", style_geo_center), nested_data, Paragraph(str(row['Bemerkung']), style_geo_norm), Paragraph(str(row['p_art']), style_geo_norm), Paragraph(str(row['p_nr']), style_geo_norm), Paragraph(p_tiefe, style_geo_norm)])
+    t = Table(table_data, colWidths=[1.5*cm, sum(w_inner), 3.0*cm, 1.2*cm, 1.0*cm, 1.3*cm], repeatRows=2)
+    t.setStyle(TableStyle([('GRID', (0,0), (-1,-1), 0.5, colors.black), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('ALIGN', (0,0), (0,-1), 'CENTER'), ('LEFTPADDING', (0,0), (-1,-1), 0), ('RIGHTPADDING', (0,0), (-1,-1), 0), ('TOPPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 0), ('BACKGROUND', (0,1), (-1,1), colors.white)]))
+    return t
+
+
+def build(make_table, df_geo):
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, topMargin=5*cm, bottomMargin=2*cm)
+    t0 = time.perf_counter()
+    table = make_table(df_geo)
+    t1 = time.perf_counter()
+    doc.build([table])
+    return t1 - t0, time.perf_counter() - t1, doc.page
+
+
+def main():
+    variants = [("bisher", legacy_table), ("geteilt", layer_table), ("flach", lambda df: layer_table(df, flat=True))]
+    print(f"{'Schichten':>9} {'Variante':<8} {'Seiten':>7} {'Aufbau [ms]':>12} {'build [ms]':>11} {'je 100 [ms]':>12}")
+    for n_layers in [100, 400, 1000]:
+        _, df_geo, _, _ = synthetic_well(n_layers * 0.5, n_layers)
+        for name, fn in variants:
+            t_make, t_build, pages = build(fn, df_geo)
+            per_100 = (t_make + t_build) * 1000 * 100 / n_layers
+            print(f"{n_layers:>9} {name:<8} {pages:>7} {t_make*1000:>12.1f} {t_build*1000:>11.1f} {per_100:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
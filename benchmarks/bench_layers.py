@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import synthetic_well
+from bohrprotokoll.hatching import classify_soil
+from bohrprotokoll.layers import ProfileData, window
+from bohrprotokoll.profile import SCALE_Y, START_Y, SvgRenderer, render_profile
+
+# ==============================================================================
+# VORVERARBEITUNG: iterrows() GEGEN SPALTENWEISE
+# ==============================================================================
+# Aufruf: python benchmarks/bench_layers.py
+# Misst Klassifikation + Geometrie + Tabellentexte für bis zu 10 000 Schichten,
+# einmal wie bisher zeilenweise, einmal über ProfileData.
+
+
+def legacy(df_geo, df_rohr, df_ring):
+    # Bisheriger Weg: Profil und PDF-Tabelle laufen je einmal über iterrows()
+    geo = []; last_d = 0
+    for _, r in df_geo.iterrows():
+        fill_color, type_ = classify_soil(r.get('f', ''), r.get('a', ''), r.get('g', ''))
+        top, bottom = last_d, r['Bis_m']; last_d = bottom
+        geo.append((fill_color, type_, START_Y + top * SCALE_Y, (bottom - top) * SCALE_Y))
+    tech = [(r['Von'], r['Bis'], "Ton" in r['Mat']) for _, r in df_ring.iterrows()]
+    tech += [(r['Von'], r['Bis'], "Filter" in r['Typ']) for _, r in df_rohr.iterrows()]
+    rows = []
+    for _, row in df_geo.iterrows():
+        rows.append([f"{c}) {row[c]}" if row[c] else f"{c})" for c in "abcdefghi"] + [f"{row['Bis_m']:.2f}", str(row['Bemerkung']), f"{row['p_tiefe']:.2f}" if row['p_tiefe'] > 0 else ""])
+    return geo, tech, rows
+
+
+def vectorized(df_geo, df_rohr, df_ring):
+    data = ProfileData(df_geo, df_rohr, df_ring)
+    return window(data.layers, 0, data.max_depth, SCALE_Y, START_Y), data
+
+
+def _time(fn, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(*args); t = time.perf_counter() - t0
+        best = t if best is None else min(best, t)
+    return best
+
+
+def main():
+    print(f"{'Schichten':>9} {'iterrows [ms]':>14} {'spaltenweise [ms]':>18} {'Faktor':>7} {'SVG gesamt [ms]':>16}")
+    for n_layers in [100, 1000, 10000]:
+        _, df_geo, df_rohr, df_ring = synthetic_well(n_layers * 0.5, n_layers)
+        t_old = _time(legacy, df_geo, df_rohr, df_ring)
+        t_new = _time(vectorized, df_geo, df_rohr, df_ring)
+        t_svg = _time(lambda: render_profile(SvgRenderer, ProfileData(df_geo, df_rohr, df_ring)), repeat=1)
+        print(f"{n_layers:>9} {t_old*1000:>14.1f} {t_new*1000:>18.1f} {t_old/t_new:>7.1f} {t_svg*1000:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate
+
+from benchmarks.synthetic import synthetic_well
+from bohrprotokoll.profile import build_profile_drawing, profile_pages
+
+# ==============================================================================
+# SEITENWEISES PROFIL: 500 m / 400 SCHICHTEN
+# ==============================================================================
+# Aufruf: python benchmarks/bench_pagination.py
+# Baut nur den Profilteil des PDFs, einmal als verkleinerte Einzelzeichnung und
+# einmal maßstäblich über mehrere Blätter.
+
+
+def _doc(buffer):
+    return SimpleDocTemplate(buffer, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, topMargin=5*cm, bottomMargin=2*cm)
+
+
+def single_drawing(meta, df_geo, df_rohr, df_ring):
+    buffer = BytesIO(); doc = _doc(buffer)
+    drawing = build_profile_drawing(df_geo, df_rohr, df_ring, meta)
+    factor = 460 / drawing.width
+    drawing.width = drawing.width * factor; drawing.height = drawing.height * factor
+    drawing.scale(factor, factor)
+    # Passt bei großer Tiefe nicht auf eine Seite -> wie im Altbestand nur bis zur Seitenhöhe
+    drawing.height = min(drawing.height, doc.height - 12)
+    doc.build([drawing])
+    return buffer, doc.page
+
+
+def paginated(massstab):
+    def build(meta, df_geo, df_rohr, df_ring):
+        buffer = BytesIO(); doc = _doc(buffer)
+        doc.build(profile_pages(df_geo, df_rohr, df_ring, massstab, 460, doc.height - 12))
+        return buffer, doc.page
+    return build
+
+
+def main():
+    print(f"{'Tiefe':>6} {'Variante':<10} {'Seiten':>7} {'Zeit [ms]':>10} {'Peak [MB]':>10} {'PDF [KB]':>9}")
+    for depth, n_layers in [(100, 80), (500, 400)]:
+        well = synthetic_well(depth, n_layers)
+        for name, fn in [("einseitig", single_drawing), ("1:200", paginated(200)), ("1:100", paginated(100))]:
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            buffer, pages = fn(*well)
+            elapsed = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{depth:>6} {name:<10} {pages:>7} {elapsed*1000:>10.1f} {peak/1e6:>10.1f} {len(buffer.getvalue())/1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import noise_png, synthetic_well
+from bohrprotokoll.pdf import create_multipage_pdf_with_header, write_multipage_pdf
+from bohrprotokoll.profile import build_profile_drawing
+
+# ==============================================================================
+# PDF-AUSGABE: BYTES IM SPEICHER vs. DIREKT IN DATEI
+# ==============================================================================
+# Aufruf: python benchmarks/bench_pdf_output.py (tracemalloc macht den Lauf langsam)
+# Karte und Logo sind Rauschbilder, damit sie sich kaum komprimieren lassen.
+
+
+def main():
+    map_png = noise_png(1000, 500)
+    logo_png = noise_png(400, 200)
+    print(f"{'Tiefe':>6} {'Variante':<10} {'Zeit [ms]':>10} {'Peak [MB]':>10} {'gehalten [MB]':>14} {'PDF [MB]':>9}")
+    for depth, n_layers in [(45, 10), (150, 100)]:
+        meta, df_geo, df_rohr, df_ring = synthetic_well(depth, n_layers)
+        meta["logo_bytes"] = logo_png
+        for name in ["bytes", "datei"]:
+            drawing = build_profile_drawing(df_geo, df_rohr, df_ring, meta)
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            if name == "bytes":
+                pdf = create_multipage_pdf_with_header(meta, df_geo, df_rohr, df_ring, drawing, BytesIO(map_png))
+                size = len(pdf)
+            else:
+                with tempfile.NamedTemporaryFile(suffix=".pdf") as f:
+                    write_multipage_pdf(f, meta, df_geo, df_rohr, df_ring, drawing, BytesIO(map_png))
+                    f.flush(); size = os.path.getsize(f.name)
+            elapsed = time.perf_counter() - t0
+            # "gehalten": was nach dem Erzeugen noch im Speicher liegt (das PDF selbst)
+            retained, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            pdf = None
+            print(f"{depth:>6} {name:<10} {elapsed*1000:>10.1f} {peak/1e6:>10.1f} {retained/1e6:>14.2f} {size/1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import json
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import synthetic_well
+from bohrprotokoll.project import columnar_to_dict, load_project_columnar, project_from_dict, save_project_columnar
+
+# ==============================================================================
+# PROJEKTFORMAT: bohrprojekt.json GEGEN .bohrz
+# ==============================================================================
+# Aufruf: python benchmarks/bench_project_format.py
+# Speichern (wie der 💾-Button, json.dumps mit indent=2), Laden bis zu den
+# DataFrames, Dateigröße. Zusätzlich Prüfung der verlustfreien Rückwandlung.
+
+
+def project(n_layers):
+    _, df_geo, df_rohr, df_ring = synthetic_well(n_layers * 0.5, n_layers)
+    return {"meta": {"projekt": "Benchmark", "endteufe": n_layers * 0.5, "lat": 52.4, "lon": 13.2},
+            "geo": df_geo.to_dict("records"), "rohr": df_rohr.to_dict("records"), "ring": df_ring.to_dict("records")}
+
+
+def _best(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter(); result = fn(); t = time.perf_counter() - t0
+        best = t if best is None else min(best, t)
+    return best, result
+
+
+def main():
+    print(f"{'Schichten':>9} {'Format':<6} {'Speichern [ms]':>15} {'Laden [ms]':>11} {'Größe [KB]':>11}")
+    for n_layers in [50, 1000, 20000]:
+        data = project(n_layers)
+
+        t_save, raw = _best(lambda: json.dumps(data, indent=2).encode("utf-8"))
+        t_load, _ = _best(lambda: project_from_dict(json.loads(raw)))
+        print(f"{n_layers:>9} {'json':<6} {t_save*1000:>15.2f} {t_load*1000:>11.2f} {len(raw)/1024:>11.1f}")
+
+        def save():
+            buf = BytesIO(); save_project_columnar(data, buf); return buf.getvalue()
+        t_save, packed = _best(save)
+        t_load, _ = _best(lambda: load_project_columnar(BytesIO(packed)))
+        print(f"{n_layers:>9} {'bohrz':<6} {t_save*1000:>15.2f} {t_load*1000:>11.2f} {len(packed)/1024:>11.1f}")
+
+        assert json.dumps(columnar_to_dict(BytesIO(packed)), sort_keys=True) == json.dumps(data, sort_keys=True), "Rückwandlung nicht verlustfrei"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import synthetic_section
+from bohrprotokoll.section import section_svg, wells_from_projects, write_section_pdf
+
+# ==============================================================================
+# GEOLOGISCHER SCHNITT: DETAILSTUFEN
+# ==============================================================================
+# Aufruf: python benchmarks/bench_section.py
+# Höhenmaßstab 2 px/m (nur Flächen) und 8 px/m (Schraffur, Schichtgrenzen, Legende);
+# SVG-Vorschau und PDF-Seite (A3 quer, Detailstufe nach dem Einpassen).
+
+
+def main():
+    print(f"{'Bohrungen':>9} {'px/m':>5} {'Aufbereitung [ms]':>18} {'SVG [ms]':>9} {'SVG [KB]':>9} {'PDF [ms]':>9} {'PDF [KB]':>9}")
+    for n_wells in [20, 100, 200]:
+        projects = synthetic_section(n_wells)
+        t0 = time.perf_counter(); wells = wells_from_projects(projects); t_prep = time.perf_counter() - t0
+        for scale_y in [2, 8]:
+            t0 = time.perf_counter(); svg = section_svg(wells, scale_y=scale_y); t_svg = time.perf_counter() - t0
+            buf = BytesIO()
+            t0 = time.perf_counter(); write_section_pdf(buf, wells, scale_y=scale_y); t_pdf = time.perf_counter() - t0
+            print(f"{n_wells:>9} {scale_y:>5} {t_prep*1000:>18.1f} {t_svg*1000:>9.1f} {len(svg)/1024:>9.1f} {t_pdf*1000:>9.1f} {len(buf.getvalue())/1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
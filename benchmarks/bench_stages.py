@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import sys
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import noise_png, synthetic_well
+from bohrprotokoll.pdf import write_multipage_pdf
+from bohrprotokoll.profile import build_profile_drawing, generate_svg_string
+from bohrprotokoll.timing import StageTimer
+
+try:
+    from svglib.svglib import svg2rlg
+except ImportError:
+    svg2rlg = None
+
+# ==============================================================================
+# STUFENZEITEN DES PDF-BUILDS (SYNTHETISCHE BOHRUNGEN)
+# ==============================================================================
+# Aufruf: python benchmarks/bench_stages.py [--repeat 3] [--json neu.json] [--compare alt.json]
+# Je Fall: generate_svg_string, svg2rlg (SVG-Umweg, zum Vergleich), natives Profil-
+# Drawing, Schichtenverzeichnis und doc.build getrennt, dazu die PDF-Größe. Gemessen
+# wird mit demselben StageTimer wie im Betrieb (BOHR_TIMING); je Stufe zählt der
+# beste von --repeat Läufen. --compare zeigt die Abweichung zu einem früheren Lauf.
+CASES = [("flach, wenige", 20, 5), ("flach, viele", 20, 200), ("tief, wenige", 300, 5), ("tief, viele", 300, 200), ("alle Bodenarten", 45, 9)]
+STAGES = ["svg", "svg2rlg", "profil", "schichtenverzeichnis", "doc.build"]
+
+
+def run_case(depth, n_layers, with_images, images):
+    meta, df_geo, df_rohr, df_ring = synthetic_well(depth, n_layers)
+    meta["logo_bytes"] = images["logo"] if with_images else None
+    timer = StageTimer()
+    with timer.stage("svg"): svg = generate_svg_string(df_geo, df_rohr, df_ring, meta)
+    timer.size("svg", len(svg))
+    if svg2rlg is not None:
+        with timer.stage("svg2rlg"): svg2rlg(BytesIO(svg.encode("utf-8")))
+    with timer.stage("profil"): drawing = build_profile_drawing(df_geo, df_rohr, df_ring, meta)
+    buf = BytesIO()
+    write_multipage_pdf(buf, meta, df_geo, df_rohr, df_ring, drawing, BytesIO(images["map"]) if with_images else None, timer=timer)
+    timer.size("pdf", buf.tell())
+    return timer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stufenzeiten des PDF-Builds")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--compare", help="Früheres JSON-Ergebnis zum Vergleich")
+    args = parser.parse_args(argv)
+
+    images = {"logo": noise_png(2000, 1000), "map": noise_png(1000, 500)}
+    previous = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f: previous = {r["fall"]: r for r in json.load(f)}
+
+    print(f"{'Fall':<30}" + "".join(f"{s + ' [ms]':>26}" if s == "schichtenverzeichnis" else f"{s + ' [ms]':>15}" for s in STAGES) + f"{'PDF [KB]':>10}")
+    results = []
+    for name, depth, n_layers in CASES:
+        for with_images in (False, True):
+            label = f"{name}{' + Logo/Karte' if with_images else ''}"
+            runs = [run_case(depth, n_layers, with_images, images) for _ in range(args.repeat)]
+            stages = {s: min(r.stages[s] for r in runs) * 1000 for s in runs[0].stages}
+            rec = {"fall": label, "tiefe": depth, "schichten": n_layers, "stufen_ms": stages, "groessen": runs[0].sizes}
+            results.append(rec)
+            cells = []
+            for s in STAGES:
+                width = 26 if s == "schichtenverzeichnis" else 15
+                if s not in stages: cells.append(f"{'-':>{width}}"); continue
+                text = f"{stages[s]:.1f}"
+                old = previous.get(label, {}).get("stufen_ms", {}).get(s)
+                if old: text += f" ({(stages[s] - old) / old * 100:+.0f}%)"
+                cells.append(f"{text:>{width}}")
+            print(f"{label:<30}" + "".join(cells) + f"{rec['groessen']['pdf'] / 1024:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f: json.dump(results, f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import synthetic_well
+from bohrprotokoll.validation import FEHLER, check_intervals, validate_project
+
+# ==============================================================================
+# PRÜFUNG DER TIEFENANGABEN: EIN DURCHGANG VS. JE PROJEKT
+# ==============================================================================
+# Aufruf: python benchmarks/bench_validation.py
+# Synthetische Archive mit je 30 Schichten, 3 Rohr- und 3 Ringraumzeilen; jedes
+# zehnte Projekt mit einer Überlappung im Ausbau. "ein Durchgang" prüft alle
+# Projekte mit einem check_intervals()-Aufruf (wie validate_archive), "je Projekt"
+# ruft validate_project() für jedes Projekt einzeln auf (wie vor jedem Rendern).
+
+
+def synthetic_archive(n_projects, n_layers=30):
+    meta, df_geo, df_rohr, df_ring = synthetic_well(45.0, n_layers)
+    rohr_bad = df_rohr.assign(Von=[0.0, 30.0, 44.0])
+    projects = [(df_geo, rohr_bad if i % 10 == 0 else df_rohr, df_ring, meta["teufe"]) for i in range(n_projects)]
+    # Spaltenweise für den Stapel (wie ProjectArchive.intervals())
+    frames = []
+    for pid, (geo, rohr, ring, endteufe) in enumerate(projects):
+        for table, df, top in ((0, geo, None), (1, rohr, "Von"), (2, ring, "Von")):
+            bottom = df["Bis_m" if table == 0 else "Bis"].to_numpy(float)
+            frames.append(pd.DataFrame({"project_id": pid, "tabelle": table, "pos": np.arange(len(df)), "von": df[top].to_numpy(float) if top else np.nan, "bis": bottom, "endteufe": endteufe}))
+    return projects, pd.concat(frames, ignore_index=True)
+
+
+def main():
+    print(f"{'Projekte':>9} {'Zeilen':>9} {'ein Durchgang [ms]':>19} {'je Projekt [ms]':>16} {'Fehler':>7}")
+    for n_projects in [100, 1000, 10000]:
+        projects, iv = synthetic_archive(n_projects)
+        t0 = time.perf_counter(); issues = check_intervals(iv["project_id"], iv["tabelle"], iv["pos"], iv["von"], iv["bis"], iv["endteufe"]); t_batch = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        n_single = sum((validate_project(*p)["schwere"] == FEHLER).sum() for p in projects)
+        t_single = time.perf_counter() - t0
+        n_batch = (issues["schwere"] == FEHLER).sum()
+        assert n_batch == n_single, (n_batch, n_single)
+        print(f"{n_projects:>9} {len(iv):>9} {t_batch*1000:>19.1f} {t_single*1000:>16.1f} {n_batch:>7}")
+
+
+if __name__ == "__main__":
+    main()
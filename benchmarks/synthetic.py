@@ -0,0 +1,52 @@
+import os
+import random
+from io import BytesIO
+
+import pandas as pd
+from PIL import Image
+
+# ==============================================================================
+# SYNTHETISCHE BOHRUNGEN FÜR BENCHMARKS
+# ==============================================================================
+SOIL_NAMES = ["Sand", "Kies", "Mudde", "Mergel", "Ton", "Schluff", "Mutterboden", "Lehm", "Auffüllung"]
+
+
+def synthetic_well(depth=100.0, n_layers=50, seed=0):
+    rnd = random.Random(seed)
+    step = depth / n_layers
+    geo = []
+    for i in range(n_layers):
+        geo.append({"Bis_m": round((i + 1) * step, 2), "a": rnd.choice(["mittelsandig", "feinsandig", "kiesig", ""]), "b": "", "c": "erdfeucht", "d": "mäßig schwer", "e": "braun", "f": SOIL_NAMES[i % len(SOIL_NAMES)], "g": "", "h": "SE", "i": "0", "Bemerkung": "", "p_art": "", "p_nr": "", "p_tiefe": 0.0})
+    filter_von = round(depth * 0.8, 2)
+    rohr = [{"Von": 0.0, "Bis": filter_von, "Typ": "Vollrohr", "DN": 150},
+            {"Von": filter_von, "Bis": round(depth - 1, 2), "Typ": "Filterrohr", "DN": 150},
+            {"Von": round(depth - 1, 2), "Bis": depth, "Typ": "Sumpfrohr", "DN": 150}]
+    ring = [{"Von": 0.0, "Bis": round(depth * 0.3, 2), "Mat": "Filterkies"},
+            {"Von": round(depth * 0.3, 2), "Bis": round(depth * 0.7, 2), "Mat": "Tonsperre"},
+            {"Von": round(depth * 0.7, 2), "Bis": depth, "Mat": "Filterkies"}]
+    meta = {"projekt": f"Synthetisch {depth:.0f} m", "ort": "Teststraße 1, 14129 Berlin", "firma": "Bohr GmbH", "auftraggeber": "Test", "datum": "01.01.25", "aktenzeichen": "B0001", "verfahren": "Spülbohren", "durchmesser": 330, "ansatz": 0.0, "teufe": depth, "ws_ruhe": 10.0, "kreis": "Berlin", "zweck": "Benchmark", "art_bohrung": "Grundwasser", "objekt": "Test", "geraetefuehrer": "T. Test", "rechtswert": "378879.57", "hochwert": "5810039.19", "logo_bytes": None}
+    return meta, pd.DataFrame(geo), pd.DataFrame(rohr), pd.DataFrame(ring)
+
+
+def synthetic_section(n_wells=50, length_m=5000.0, seed=0):
+    # Bohrungen entlang einer West-Ost-Linie mit gemeinsamer Schichtfolge, wechselnden
+    # Mächtigkeiten, fehlenden Schichten und streuender Ansatzhöhe (Inhalt wie bohrprojekt.json)
+    rnd = random.Random(seed)
+    sequence = ["Mutterboden", "Sand", "Schluff", "Sand", "Ton", "Kies", "Sand", "Mergel", "Sand"]
+    projects = []
+    for k in range(n_wells):
+        d, geo = 0.0, []
+        for soil in sequence:
+            if soil != "Sand" and rnd.random() < 0.15: continue
+            d = round(d + rnd.uniform(0.5, 8.0), 2)
+            geo.append({"Bis_m": d, "a": "", "b": "", "c": "", "d": "", "e": "", "f": soil, "g": "", "h": "", "i": "", "Bemerkung": "", "p_art": "", "p_nr": "", "p_tiefe": 0.0})
+        meta = {"aktenzeichen": f"S{k:04d}", "lat": 52.42 + rnd.uniform(-0.002, 0.002), "lon": 13.15 + (length_m * k / max(n_wells - 1, 1)) / 67800, "ansatzpunkt": round(35 + rnd.uniform(-3, 3), 2), "endteufe": d}
+        projects.append({"meta": meta, "geo": geo, "rohr": [], "ring": []})
+    return projects
+
+
+def noise_png(width, height):
+    # Rauschbild: lässt sich kaum komprimieren (ungünstigster Fall für Logo/Karte)
+    buf = BytesIO()
+    Image.frombytes("RGB", (width, height), os.urandom(width * height * 3)).save(buf, format="PNG")
+    return buf.getvalue()
@@ -0,0 +1 @@
+# Rendering- und Datenlogik des Bohrprotokolls (ohne Streamlit)
@@ -0,0 +1,246 @@
+import argparse
+import json
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .coords import grid_to_latlon, sync_coordinates
+from .layers import classify_layers
+from .project import is_columnar, columnar_to_dict
+
+# ==============================================================================
+# PROJEKTARCHIV (SQLite)
+# ==============================================================================
+# Alle Projekte in einer Datenbank; gesucht wird über Indizes statt über Dateien.
+# projects: eine Zeile je Projekt (Stammdaten als JSON + indizierte Suchspalten)
+# geo/rohr/ring: eine Zeile je Datensatz (Original als JSON + Suchspalten)
+# Ort überschreibbar über BOHR_ARCHIVE. Import per Kommandozeile:
+#   python -m bohrprotokoll.archive ORDNER [--db archiv.sqlite]
+DEFAULT_ARCHIVE_PATH = os.path.join(os.path.expanduser("~"), ".local", "share", "bohrprotokoll", "archiv.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    source TEXT UNIQUE NOT NULL,
+    aktenzeichen TEXT COLLATE NOCASE,
+    projekt TEXT, ort TEXT,
+    kreis TEXT COLLATE NOCASE,
+    lat REAL, lon REAL,
+    endteufe REAL,
+    meta TEXT NOT NULL,
+    imported REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_projects_aktenzeichen ON projects (aktenzeichen);
+CREATE INDEX IF NOT EXISTS idx_projects_kreis ON projects (kreis);
+CREATE INDEX IF NOT EXISTS idx_projects_latlon ON projects (lat, lon);
+CREATE INDEX IF NOT EXISTS idx_projects_endteufe ON projects (endteufe);
+CREATE TABLE IF NOT EXISTS geo (project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE, pos INTEGER NOT NULL, bis REAL, soil TEXT, data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_geo_project ON geo (project_id, pos);
+CREATE INDEX IF NOT EXISTS idx_geo_soil ON geo (soil, project_id);
+CREATE TABLE IF NOT EXISTS rohr (project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE, pos INTEGER NOT NULL, von REAL, bis REAL, typ TEXT, data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_rohr_project ON rohr (project_id, pos);
+CREATE TABLE IF NOT EXISTS ring (project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE, pos INTEGER NOT NULL, von REAL, bis REAL, mat TEXT, ton INTEGER, data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_ring_project ON ring (project_id, pos);
+CREATE INDEX IF NOT EXISTS idx_ring_ton ON ring (ton, project_id);
+"""
+
+RESULT_COLUMNS = ["id", "aktenzeichen", "projekt", "ort", "kreis", "lat", "lon", "endteufe", "source"]
+
+
+def _float(v):
+    try:
+        v = float(v)
+        return None if math.isnan(v) else v
+    except (TypeError, ValueError):
+        return None
+
+
+def _json(obj):
+    return json.dumps(obj, ensure_ascii=False, default=str)
+
+
+def read_project_file(path):
+    # bohrprojekt.json oder .bohrz -> Inhalt wie bohrprojekt.json
+    with open(path, "rb") as f: head = f.read(4)
+    if is_columnar(head): return columnar_to_dict(path)
+    with open(path, encoding="utf-8") as f: return json.load(f)
+
+
+class ProjectArchive:
+    def __init__(self, path=DEFAULT_ARCHIVE_PATH):
+        self.path = path
+        if path != ":memory:": os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._con = sqlite3.connect(path, check_same_thread=False)
+        self._con.execute("PRAGMA foreign_keys = ON")
+        self._con.execute("PRAGMA journal_mode = WAL") if path != ":memory:" else None
+        self._con.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self._con.close()
+
+    def _insert(self, data, source):
+        if not isinstance(data, dict): raise ValueError("Keine Projektdatei (JSON-Objekt erwartet)")
+        # Suchspalten nur aus der Datei selbst (ohne Standardwerte), Koordinaten ergänzt
+        meta = sync_coordinates(data.get("meta", {}))
+        geo = data.get("geo", []); rohr = data.get("rohr", []); ring = data.get("ring", [])
+        depths = [_float(r.get("Bis_m")) for r in geo] + [_float(r.get("Bis")) for r in rohr]
+        endteufe = _float(meta.get("endteufe")) or max((d for d in depths if d is not None), default=None)
+        con = self._con
+        con.execute("DELETE FROM projects WHERE source = ?", (source,))
+        cur = con.execute("INSERT INTO projects (source, aktenzeichen, projekt, ort, kreis, lat, lon, endteufe, meta, imported) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                          (source, str(meta.get("aktenzeichen") or ""), meta.get("projekt"), meta.get("ort"), str(meta.get("kreis") or ""), _float(meta.get("lat")), _float(meta.get("lon")), endteufe, _json(meta), time.time()))
+        pid = cur.lastrowid
+        soils = classify_layers(pd.DataFrame(geo)) if geo else []
+        con.executemany("INSERT INTO geo (project_id, pos, bis, soil, data) VALUES (?, ?, ?, ?, ?)",
+                        [(pid, i, _float(r.get("Bis_m")), soil, _json(r)) for i, (r, soil) in enumerate(zip(geo, soils))])
+        con.executemany("INSERT INTO rohr (project_id, pos, von, bis, typ, data) VALUES (?, ?, ?, ?, ?, ?)",
+                        [(pid, i, _float(r.get("Von")), _float(r.get("Bis")), str(r.get("Typ") or ""), _json(r)) for i, r in enumerate(rohr)])
+        con.executemany("INSERT INTO ring (project_id, pos, von, bis, mat, ton, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [(pid, i, _float(r.get("Von")), _float(r.get("Bis")), str(r.get("Mat") or ""), int("Ton" in str(r.get("Mat") or "")), _json(r)) for i, r in enumerate(ring)])
+        return pid
+
+    def add(self, data, source):
+        # Ein Projekt (Inhalt wie bohrprojekt.json); gleiche Quelle ersetzt den alten Stand
+        with self._lock, self._con:
+            return self._insert(data, source)
+
+    def import_files(self, paths, progress=None):
+        # Massenimport in einer Transaktion; fehlerhafte Dateien werden übersprungen
+        # (Savepoint je Datei: ein Fehler nimmt nur deren halb geschriebene Zeilen zurück)
+        imported, failures = 0, []
+        with self._lock, self._con:
+            for i, path in enumerate(paths):
+                self._con.execute("SAVEPOINT datei")
+                try:
+                    self._insert(read_project_file(path), os.path.abspath(path))
+                    imported += 1
+                except Exception as e:
+                    self._con.execute("ROLLBACK TO datei")
+                    failures.append((path, f"{type(e).__name__}: {e}"))
+                self._con.execute("RELEASE datei")
+                if progress: progress(i + 1)
+        return imported, failures
+
+    def fill_coordinates(self):
+        # Fehlende lat/lon aus Rechts-/Hochwert der Stammdaten, alle Projekte in einem Durchgang
+        with self._lock, self._con:
+            rows = self._con.execute("SELECT id, meta FROM projects WHERE lat IS NULL OR lon IS NULL").fetchall()
+            metas = [json.loads(m) for _, m in rows]
+            lat, lon = grid_to_latlon([m.get("rechtswert", "") for m in metas], [m.get("hochwert", "") for m in metas])
+            ok = ~np.isnan(lat)
+            self._con.executemany("UPDATE projects SET lat = ?, lon = ? WHERE id = ?", [(float(a), float(o), r[0]) for a, o, r, k in zip(lat, lon, rows, ok) if k])
+        return int(ok.sum())
+
+    def search(self, aktenzeichen=None, kreis=None, bbox=None, min_depth=None, max_depth=None, soil=None, tonsperre=False, limit=500):
+        # bbox = (lat_min, lon_min, lat_max, lon_max); aktenzeichen als Präfix
+        where, args = [], []
+        if aktenzeichen:
+            where.append("p.aktenzeichen >= ? AND p.aktenzeichen < ?"); args += [aktenzeichen, aktenzeichen + "￿"]
+        if kreis:
+            where.append("p.kreis = ?"); args.append(kreis)
+        if bbox:
+            where.append("p.lat BETWEEN ? AND ? AND p.lon BETWEEN ? AND ?"); args += [bbox[0], bbox[2], bbox[1], bbox[3]]
+        if min_depth is not None:
+            where.append("p.endteufe >= ?"); args.append(min_depth)
+        if max_depth is not None:
+            where.append("p.endteufe <= ?"); args.append(max_depth)
+        if soil:
+            where.append("EXISTS (SELECT 1 FROM geo g WHERE g.soil = ? AND g.project_id = p.id)"); args.append(soil)
+        if tonsperre:
+            where.append("EXISTS (SELECT 1 FROM ring r WHERE r.ton = 1 AND r.project_id = p.id)")
+        sql = f"SELECT {', '.join('p.' + c for c in RESULT_COLUMNS)} FROM projects p"
+        if where: sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY p.aktenzeichen LIMIT ?"; args.append(limit)
+        with self._lock:
+            rows = self._con.execute(sql, args).fetchall()
+        return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+    def points(self, bbox=None):
+        # Standorte für die Kartenansicht; bbox wie bei search()
+        sql = "SELECT id, aktenzeichen, lat, lon, endteufe FROM projects WHERE lat IS NOT NULL AND lon IS NOT NULL"
+        args = []
+        if bbox:
+            sql += " AND lat BETWEEN ? AND ? AND lon BETWEEN ? AND ?"; args = [bbox[0], bbox[2], bbox[1], bbox[3]]
+        with self._lock:
+            rows = self._con.execute(sql, args).fetchall()
+        return pd.DataFrame(rows, columns=["id", "aktenzeichen", "lat", "lon", "endteufe"])
+
+    def version(self):
+        # Ändert sich bei jedem Import (für Cache-Schlüssel)
+        with self._lock:
+            return tuple(self._con.execute("SELECT COUNT(*), MAX(imported) FROM projects").fetchone())
+
+    def load(self, project_id):
+        # -> Inhalt wie bohrprojekt.json
+        with self._lock:
+            row = self._con.execute("SELECT meta FROM projects WHERE id = ?", (project_id,)).fetchone()
+            if row is None: raise KeyError(project_id)
+            data = {"meta": json.loads(row[0])}
+            for table in ("geo", "rohr", "ring"):
+                data[table] = [json.loads(r[0]) for r in self._con.execute(f"SELECT data FROM {table} WHERE project_id = ? ORDER BY pos", (project_id,))]
+        return data
+
+    def intervals(self):
+        # Tiefenangaben aller Projekte in einer Abfrage (für bohrprotokoll.validation)
+        sql = """SELECT g.project_id, 'geo', g.pos, NULL, g.bis, p.endteufe FROM geo g JOIN projects p ON p.id = g.project_id
+                 UNION ALL SELECT r.project_id, 'rohr', r.pos, r.von, r.bis, p.endteufe FROM rohr r JOIN projects p ON p.id = r.project_id
+                 UNION ALL SELECT r.project_id, 'ring', r.pos, r.von, r.bis, p.endteufe FROM ring r JOIN projects p ON p.id = r.project_id"""
+        with self._lock:
+            rows = self._con.execute(sql).fetchall()
+        return pd.DataFrame(rows, columns=["project_id", "tabelle", "pos", "von", "bis", "endteufe"]).astype({"von": float, "bis": float, "endteufe": float})
+
+    def sources(self, project_ids):
+        # -> {id: Quelle (Dateipfad)}
+        with self._lock:
+            return {pid: src for pid, src in self._con.execute(f"SELECT id, source FROM projects WHERE id IN ({', '.join('?' * len(project_ids))})", project_ids)}
+
+    def stats(self):
+        with self._lock:
+            return {"projects": self._con.execute("SELECT COUNT(*) FROM projects").fetchone()[0], "layers": self._con.execute("SELECT COUNT(*) FROM geo").fetchone()[0]}
+
+
+_default_archive = None
+
+
+def get_archive():
+    global _default_archive
+    if _default_archive is None:
+        _default_archive = ProjectArchive(os.environ.get("BOHR_ARCHIVE", DEFAULT_ARCHIVE_PATH))
+    return _default_archive
+
+
+def bbox_around(lat, lon, radius_km):
+    dlat = radius_km / 111.32
+    dlon = radius_km / (111.32 * max(math.cos(math.radians(lat)), 1e-6))
+    return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+# ==============================================================================
+# MASSENIMPORT (Kommandozeile)
+# ==============================================================================
+def main(argv=None):
+    from .batch import find_projects
+    parser = argparse.ArgumentParser(description="bohrprojekt.json-/.bohrz-Dateien in das Projektarchiv übernehmen")
+    parser.add_argument("input", help="Ordner mit Projektdateien (rekursiv)")
+    parser.add_argument("--db", default=os.environ.get("BOHR_ARCHIVE", DEFAULT_ARCHIVE_PATH), help="Archivdatei (SQLite)")
+    args = parser.parse_args(argv)
+
+    paths = list(find_projects(args.input))
+    t0 = time.perf_counter()
+    archive = ProjectArchive(args.db)
+    imported, failures = archive.import_files(paths)
+    filled = archive.fill_coordinates()
+    if filled: print(f"{filled} Standorte aus Rechts-/Hochwert ergänzt")
+    for path, error in failures: print(f"FEHLER  {path}: {error}")
+    print(f"{imported} von {len(paths)} Projekten importiert in {time.perf_counter() - t0:.1f}s ({archive.stats()['projects']} im Archiv)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# ==============================================================================
+# INHALTS-SCHLÜSSEL
+# ==============================================================================
+def _feed(h, obj):
+    if isinstance(obj, pd.DataFrame):
+        h.update(b"D"); _feed(h, [str(c) for c in obj.columns])
+        h.update(pd.util.hash_pandas_object(obj, index=False).values.tobytes())
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for k in sorted(obj, key=str): _feed(h, k); _feed(h, obj[k])
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[")
+        for v in obj: _feed(h, v)
+        h.update(b"]")
+    elif isinstance(obj, (bytes, bytearray)):
+        h.update(b"B%d:" % len(obj)); h.update(obj)
+    else:
+        s = repr(obj).encode("utf-8")
+        h.update(b"S%d:" % len(s)); h.update(s)
+
+
+def content_key(*parts):
+    h = hashlib.sha256()
+    for p in parts: _feed(h, p)
+    return h.hexdigest()
+
+# ==============================================================================
+# ARTEFAKT-CACHE (SVG, KARTE, PDF)
+# ==============================================================================
+# LRU im Speicher, begrenzt über die Summe der Artefaktgrößen. Werte sind bytes
+# oder str; None (z. B. fehlgeschlagene Karte) wird nicht gespeichert. Die Größe
+# wird beim Speichern festgehalten und beim Entfernen wieder abgezogen.
+DEFAULT_ARTIFACT_BYTES = 128 * 1024 * 1024
+
+
+class ArtifactCache:
+    def __init__(self, max_bytes=DEFAULT_ARTIFACT_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self.hits = 0; self.misses = 0; self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, kind, key):
+        with self._lock:
+            entry = self._items.get((kind, key))
+            if entry is None: return None
+            self._items.move_to_end((kind, key))
+            return entry[0]
+
+    def _sizeof(self, value):
+        return len(value)
+
+    def _discard(self, value):
+        pass
+
+    def put(self, kind, key, value):
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            self._discard(value)
+            return
+        with self._lock:
+            old = self._items.pop((kind, key), None)
+            if old is not None:
+                self._size -= old[1]; self._discard(old[0])
+            self._items[(kind, key)] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (evicted, evicted_size) = self._items.popitem(last=False)
+                self._size -= evicted_size; self._discard(evicted); self.evictions += 1
+
+    def pop(self, kind, key):
+        # Eintrag herausnehmen, ohne ihn zu verwerfen -> Wert oder None
+        with self._lock:
+            entry = self._items.pop((kind, key), None)
+            if entry is None: return None
+            self._size -= entry[1]
+            return entry[0]
+
+    def get_or_build(self, kind, key, build):
+        value = self.get(kind, key)
+        if value is not None:
+            with self._lock: self.hits += 1
+            return value
+        with self._lock: self.misses += 1
+        value = build()
+        if value is not None: self.put(kind, key, value)
+        return value
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "bytes": self._size, "entries": len(self._items)}
+
+
+class FileArtifactCache(ArtifactCache):
+    # Wie ArtifactCache, die Artefakte liegen aber als Dateien auf der Platte;
+    # gespeichert wird nur der Pfad. Verdrängte Einträge werden gelöscht.
+    def __init__(self, directory=None, max_bytes=DEFAULT_ARTIFACT_BYTES * 4):
+        ArtifactCache.__init__(self, max_bytes)
+        self.directory = directory or tempfile.mkdtemp(prefix="bohrprotokoll-")
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _sizeof(self, path):
+        return os.path.getsize(path)
+
+    def _discard(self, path):
+        try: os.remove(path)
+        except OSError: pass
+
+    def get(self, kind, key):
+        path = ArtifactCache.get(self, kind, key)
+        return path if path and os.path.exists(path) else None
+
+    def get_or_write(self, kind, key, write, suffix=""):
+        # write(stream) schreibt das Artefakt direkt in die Datei
+        def build():
+            fd, path = tempfile.mkstemp(suffix=suffix, dir=self.directory)
+            try:
+                with os.fdopen(fd, "wb") as f: write(f)
+            except Exception:
+                self._discard(path)
+                raise
+            return path
+        return self.get_or_build(kind, key, build)
+
+
+_default_cache = None
+_default_file_cache = None
+
+
+def get_file_artifact_cache():
+    global _default_file_cache
+    if _default_file_cache is None:
+        _default_file_cache = FileArtifactCache()
+    return _default_file_cache
+
+
+def get_artifact_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ArtifactCache()
+    return _default_cache
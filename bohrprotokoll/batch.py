@@ -0,0 +1,88 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .maps import get_static_map_image
+from .pdf import write_multipage_pdf
+from .profile import build_profile_drawing
+from .project import load_project, pdf_meta
+from .timing import new_timer, output_size, report
+from .validation import require_valid
+
+# ==============================================================================
+# STAPELVERARBEITUNG: bohrprojekt.json / .bohrz -> PDF (ohne Streamlit)
+# ==============================================================================
+# Aufruf: python -m bohrprotokoll.batch EINGABE_ORDNER -o AUSGABE_ORDNER [-j 4]
+
+
+def find_projects(root):
+    for dirpath, _, filenames in os.walk(root):
+        for name in sorted(filenames):
+            if name.lower().endswith((".json", ".bohrz")): yield os.path.join(dirpath, name)
+
+
+def render_file(path, out_path, profile_scale=None, with_map=True, logo_bytes=None):
+    t0 = time.perf_counter()
+    meta, df_geo, df_rohr, df_ring = load_project(path)
+    meta_data = pdf_meta(meta, logo_bytes)
+    timer = new_timer()
+    # Ungültige Tiefenangaben scheitern hier, vor Profil, Karte und PDF
+    with timer.stage("pruefung"): require_valid(df_geo, df_rohr, df_ring, meta.get("endteufe"))
+    with timer.stage("profil"): profile_drawing = None if profile_scale else build_profile_drawing(df_geo, df_rohr, df_ring, meta_data)
+    with timer.stage("karte"): map_buf = get_static_map_image(meta["lat"], meta["lon"]) if with_map else None
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    write_multipage_pdf(out_path, meta_data, df_geo, df_rohr, df_ring, profile_drawing, map_buf, profile_scale, timer=timer)
+    timer.size("pdf", output_size(out_path))
+    report(timer, datei=path, aktenzeichen=meta.get("aktenzeichen"), schichten=len(df_geo), massstab=profile_scale)
+    return time.perf_counter() - t0
+
+
+def _job(path, out_path, profile_scale, with_map, logo_bytes):
+    try:
+        return path, render_file(path, out_path, profile_scale, with_map, logo_bytes), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bohrprotokolle (bohrprojekt.json) stapelweise als PDF erzeugen")
+    parser.add_argument("input", help="Ordner mit bohrprojekt.json- bzw. .bohrz-Dateien (rekursiv)")
+    parser.add_argument("-o", "--output", default="pdf", help="Ausgabeordner (Standard: ./pdf)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="Anzahl paralleler Prozesse")
+    parser.add_argument("--scale", type=int, choices=[100, 200], help="Profil maßstäblich über mehrere Blätter (1:100 / 1:200)")
+    parser.add_argument("--no-map", action="store_true", help="Keine Karte einbetten")
+    parser.add_argument("--logo", help="Firmenlogo (PNG/JPG) für den Kopf")
+    args = parser.parse_args(argv)
+
+    logo_bytes = None
+    if args.logo:
+        with open(args.logo, "rb") as f: logo_bytes = f.read()
+
+    jobs = []
+    for path in find_projects(args.input):
+        rel = os.path.relpath(path, args.input)
+        jobs.append((path, os.path.join(args.output, os.path.splitext(rel)[0] + ".pdf")))
+    if not jobs:
+        print(f"Keine Projektdateien in {args.input} gefunden.")
+        return 1
+
+    t0 = time.perf_counter()
+    failures = []
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(_job, path, out, args.scale, not args.no_map, logo_bytes) for path, out in jobs]
+        for future in as_completed(futures):
+            path, seconds, error = future.result()
+            if error:
+                failures.append((path, error))
+                print(f"FEHLER  {path}: {error}")
+            else:
+                print(f"{seconds:7.2f}s {path}")
+
+    print(f"{len(jobs) - len(failures)} von {len(jobs)} PDFs erzeugt in {time.perf_counter() - t0:.1f}s, {len(failures)} Fehler")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
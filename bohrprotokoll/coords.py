@@ -0,0 +1,158 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# KOORDINATEN: ETRS89/UTM, GAUSS-KRÜGER (DHDN) <-> WGS84 (OFFLINE)
+# ==============================================================================
+# Transversale Mercator-Projektion nach Krüger (Reihen bis n³, Fehler < 1 mm im
+# Streifen), vollständig mit numpy-Arrays: ganze Spalten werden in einem Aufruf
+# umgerechnet. ETRS89 wird für Karte und Geocoder mit WGS84 gleichgesetzt (< 1 m).
+# Rechtswerte werden am Zahlenbereich erkannt:
+#   378879.57   -> UTM, Zone DEFAULT_ZONE (bzw. Parameter zone)
+#   33378879.57 -> UTM mit vorangestellter Zonennummer
+#   4591234.56  -> Gauss-Krüger, Kennziffer = Streifen (Mittelmeridian 3° x Kennziffer)
+# Gauss-Krüger liegt auf dem Bessel-Ellipsoid (DHDN); der Übergang nach ETRS89 erfolgt
+# mit dem bundeseinheitlichen 7-Parameter-Satz (Genauigkeit wenige Meter).
+GRS80 = (6378137.0, 1 / 298.257222101)
+BESSEL = (6377397.155, 1 / 299.1528128)
+UTM_K0 = 0.9996; GK_K0 = 1.0
+UTM_FALSE_EASTING = 500000.0
+DEFAULT_ZONE = 33
+# DHDN -> ETRS89: tx, ty, tz [m], rx, ry, rz [Bogensekunden], Maßstab [ppm] (Position Vector)
+DHDN_TO_ETRS89 = (598.1, 73.7, 418.2, 0.202, 0.045, -2.455, 6.7)
+
+
+class TransverseMercator:
+    def __init__(self, ellipsoid, k0):
+        a, f = ellipsoid
+        n = f / (2 - f)
+        self.e = math.sqrt(f * (2 - f))
+        self.kA = k0 * a / (1 + n) * (1 + n**2 / 4 + n**4 / 64)
+        self.alpha = np.array([n/2 - 2*n**2/3 + 5*n**3/16, 13*n**2/48 - 3*n**3/5, 61*n**3/240])
+        self.beta = np.array([n/2 - 2*n**2/3 + 37*n**3/96, n**2/48 + n**3/15, 17*n**3/480])
+        self.delta = np.array([2*n - 2*n**2/3 - 2*n**3, 7*n**2/3 - 8*n**3/5, 56*n**3/15])
+        self._j2 = 2 * np.arange(1, 4)
+
+    def forward(self, lat, lon, lon0):
+        # Grad -> (x, y) in Metern ab Mittelmeridian/Äquator
+        phi = np.radians(lat)[..., None]; dl = np.radians(np.asarray(lon) - lon0)[..., None]
+        s = np.sin(phi)
+        t = np.sinh(np.arctanh(s) - self.e * np.arctanh(self.e * s))
+        xi = np.arctan2(t, np.cos(dl)); eta = np.arctanh(np.sin(dl) / np.sqrt(1 + t * t))
+        j2 = self._j2
+        x = eta[..., 0] + (self.alpha * np.cos(j2 * xi) * np.sinh(j2 * eta)).sum(axis=-1)
+        y = xi[..., 0] + (self.alpha * np.sin(j2 * xi) * np.cosh(j2 * eta)).sum(axis=-1)
+        return self.kA * x, self.kA * y
+
+    def inverse(self, x, y, lon0):
+        # (x, y) in Metern -> Grad
+        xi = (np.asarray(y, float) / self.kA)[..., None]; eta = (np.asarray(x, float) / self.kA)[..., None]
+        j2 = self._j2
+        xi_ = xi[..., 0] - (self.beta * np.sin(j2 * xi) * np.cosh(j2 * eta)).sum(axis=-1)
+        eta_ = eta[..., 0] - (self.beta * np.cos(j2 * xi) * np.sinh(j2 * eta)).sum(axis=-1)
+        chi = np.arcsin(np.sin(xi_) / np.cosh(eta_))[..., None]
+        phi = chi[..., 0] + (self.delta * np.sin(j2 * chi)).sum(axis=-1)
+        return np.degrees(phi), lon0 + np.degrees(np.arctan2(np.sinh(eta_), np.cos(xi_)))
+
+
+_UTM = TransverseMercator(GRS80, UTM_K0)
+_GK = TransverseMercator(BESSEL, GK_K0)
+
+
+def utm_central_meridian(zone):
+    return 6.0 * np.asarray(zone) - 183.0
+
+
+def latlon_to_utm(lat, lon, zone=DEFAULT_ZONE):
+    x, y = _UTM.forward(np.asarray(lat, float), np.asarray(lon, float), utm_central_meridian(zone))
+    return UTM_FALSE_EASTING + x, y
+
+
+def utm_to_latlon(easting, northing, zone=DEFAULT_ZONE):
+    return _UTM.inverse(np.asarray(easting, float) - UTM_FALSE_EASTING, northing, utm_central_meridian(zone))
+
+# ==============================================================================
+# GAUSS-KRÜGER (DHDN, BESSEL)
+# ==============================================================================
+def _geodetic_to_ecef(lat, lon, ellipsoid):
+    a, f = ellipsoid; e2 = f * (2 - f)
+    phi = np.radians(lat); lam = np.radians(lon)
+    N = a / np.sqrt(1 - e2 * np.sin(phi) ** 2)
+    return N * np.cos(phi) * np.cos(lam), N * np.cos(phi) * np.sin(lam), N * (1 - e2) * np.sin(phi)
+
+
+def _ecef_to_geodetic(X, Y, Z, ellipsoid):
+    a, f = ellipsoid; e2 = f * (2 - f)
+    p = np.hypot(X, Y)
+    phi = np.arctan2(Z, p * (1 - e2))
+    for _ in range(4):
+        N = a / np.sqrt(1 - e2 * np.sin(phi) ** 2)
+        phi = np.arctan2(Z + e2 * N * np.sin(phi), p)
+    return np.degrees(phi), np.degrees(np.arctan2(Y, X))
+
+
+def _helmert(X, Y, Z, params):
+    tx, ty, tz, rx, ry, rz, s = params
+    rx, ry, rz = (math.radians(r / 3600) for r in (rx, ry, rz)); m = 1 + s * 1e-6
+    return (tx + m * (X - rz * Y + ry * Z), ty + m * (rz * X + Y - rx * Z), tz + m * (-ry * X + rx * Y + Z))
+
+
+def gk_to_latlon(rechtswert, hochwert):
+    # Rechtswert mit Kennziffer (z. B. 4591234.56) -> ETRS89/WGS84 in Grad
+    r = np.asarray(rechtswert, float)
+    zone = np.floor(r / 1e6)
+    lat_b, lon_b = _GK.inverse(r - zone * 1e6 - UTM_FALSE_EASTING, hochwert, 3.0 * zone)
+    return _ecef_to_geodetic(*_helmert(*_geodetic_to_ecef(lat_b, lon_b, BESSEL), DHDN_TO_ETRS89), GRS80)
+
+# ==============================================================================
+# GITTERWERTE (RECHTSWERT/HOCHWERT) <-> LAT/LON
+# ==============================================================================
+def parse_grid(values):
+    # Texte wie "378 879,57" oder "378879.57" -> float-Array (NaN wenn ungültig)
+    s = pd.Series(values, dtype=object).astype(str).str.replace(" ", "", regex=False).str.replace(",", ".", regex=False)
+    return pd.to_numeric(s, errors="coerce").to_numpy(float)
+
+
+def grid_to_latlon(rechtswert, hochwert, zone=DEFAULT_ZONE):
+    # Spaltenweise; UTM/UTM mit Zone/Gauss-Krüger je Zeile am Zahlenbereich erkannt
+    r = parse_grid(rechtswert); h = parse_grid(hochwert)
+    lat = np.full(r.shape, np.nan); lon = np.full(r.shape, np.nan)
+    valid = (r > 0) & (h > 0)
+    utm = valid & (r < 1e6)
+    utm_zoned = valid & (r >= 1e7) & (r < 1e8)
+    gk = valid & (r >= 1e6) & (r < 1e7)
+    if utm.any(): lat[utm], lon[utm] = utm_to_latlon(r[utm], h[utm], zone)
+    if utm_zoned.any():
+        z = np.floor(r[utm_zoned] / 1e6)
+        lat[utm_zoned], lon[utm_zoned] = utm_to_latlon(r[utm_zoned] - z * 1e6, h[utm_zoned], z)
+    if gk.any(): lat[gk], lon[gk] = gk_to_latlon(r[gk], h[gk])
+    return lat, lon
+
+
+def latlon_to_grid(lat, lon, zone=DEFAULT_ZONE):
+    # -> Texte mit zwei Nachkommastellen wie im Kopfblatt (UTM, ohne Zonennummer)
+    e, n = latlon_to_utm(lat, lon, zone)
+    return np.char.mod("%.2f", e), np.char.mod("%.2f", n)
+
+
+def valid_latlon(lat, lon):
+    try: lat, lon = float(lat), float(lon)
+    except (TypeError, ValueError): return None
+    return (lat, lon) if -90 <= lat <= 90 and -180 <= lon <= 180 and not (lat == 0 and lon == 0) else None
+
+
+def sync_coordinates(meta, prefer=None):
+    # Ergänzt fehlende lat/lon aus Rechts-/Hochwert und umgekehrt (neues dict).
+    # Sind beide vorhanden, gewinnt prefer ("latlon" oder "grid"); None = unverändert.
+    meta = dict(meta)
+    latlon = valid_latlon(meta.get("lat"), meta.get("lon"))
+    lat, lon = grid_to_latlon([meta.get("rechtswert", "")], [meta.get("hochwert", "")])
+    grid = (float(lat[0]), float(lon[0])) if not np.isnan(lat[0]) else None
+    if grid and (latlon is None or prefer == "grid"):
+        meta["lat"], meta["lon"] = grid
+    elif latlon and (grid is None or prefer == "latlon"):
+        e, n = latlon_to_grid([latlon[0]], [latlon[1]])
+        meta["rechtswert"], meta["hochwert"] = str(e[0]), str(n[0])
+    return meta
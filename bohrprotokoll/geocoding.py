@@ -0,0 +1,165 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# ==============================================================================
+# GEOCODER: BACKENDS
+# ==============================================================================
+# Auswahl über die Umgebungsvariable BOHR_GEOCODER:
+#   nominatim                     (Standard, online, max. 1 Anfrage/s)
+#   file:///pfad/zu/orte.csv      (lokale Tabelle mit Spalten adresse, lat, lon)
+# Ein Backend ist jedes Objekt mit lookup(adresse) -> (lat, lon) oder None.
+DEFAULT_GEOCODER = "nominatim"
+DEFAULT_USER_AGENT = "bohrprotokoll"
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "bohrprotokoll", "geocode.sqlite")
+DEFAULT_CACHE_TTL = 90 * 24 * 3600
+NEGATIVE_CACHE_TTL = 24 * 3600
+
+
+def normalize_address(address):
+    # Schlüssel für Cache und lokale Tabelle: Unicode-NFC, Kleinschreibung,
+    # Kommas und Mehrfach-Leerzeichen vereinheitlicht
+    s = unicodedata.normalize("NFC", str(address or "")).lower().replace(",", " ")
+    return " ".join(s.split())
+
+
+class RateLimiter:
+    # Mindestabstand zwischen zwei Aufrufen, threadsicher (Nominatim: 1 s)
+    def __init__(self, min_interval=1.0):
+        self.min_interval = min_interval
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            delay = self._last + self.min_interval - time.monotonic()
+            if delay > 0: time.sleep(delay)
+            self._last = time.monotonic()
+
+
+class NominatimGeocoder:
+    def __init__(self, user_agent=DEFAULT_USER_AGENT, min_interval=1.0, timeout=10):
+        from geopy.geocoders import Nominatim
+        self.client = Nominatim(user_agent=user_agent, timeout=timeout)
+        self.limiter = RateLimiter(min_interval)
+
+    def lookup(self, address):
+        self.limiter.wait()
+        loc = self.client.geocode(address)
+        return (loc.latitude, loc.longitude) if loc else None
+
+
+class LocalGeocoder:
+    def __init__(self, path):
+        df = pd.read_csv(path, dtype={"adresse": str})
+        self.table = {normalize_address(a): (float(lat), float(lon)) for a, lat, lon in zip(df["adresse"], df["lat"], df["lon"])}
+
+    def lookup(self, address):
+        return self.table.get(normalize_address(address))
+
+
+def make_geocoder(source=None):
+    source = source or os.environ.get("BOHR_GEOCODER") or DEFAULT_GEOCODER
+    if source == "nominatim": return NominatimGeocoder(os.environ.get("BOHR_GEOCODER_AGENT", DEFAULT_USER_AGENT))
+    if source.startswith("file://"): return LocalGeocoder(url2pathname(urlparse(source).path))
+    raise ValueError(f"Unbekannter Geocoder: {source}")
+
+# ==============================================================================
+# GEOCODER: CACHE
+# ==============================================================================
+# SQLite-Tabelle normalisierte Adresse -> lat/lon. Nicht gefundene Adressen werden
+# ebenfalls gemerkt (lat/lon NULL), aber nur für NEGATIVE_CACHE_TTL.
+class GeocodeCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_CACHE_TTL, negative_ttl=NEGATIVE_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl; self.negative_ttl = negative_ttl
+        self.hits = 0; self.misses = 0
+        self._lock = threading.Lock()
+        if path != ":memory:": os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._con = sqlite3.connect(path, check_same_thread=False)
+        self._con.execute("CREATE TABLE IF NOT EXISTS geocode (key TEXT PRIMARY KEY, lat REAL, lon REAL, created REAL NOT NULL)")
+        self._con.commit()
+
+    def get(self, key):
+        # (True, ergebnis) bei gültigem Eintrag, sonst (False, None)
+        with self._lock:
+            row = self._con.execute("SELECT lat, lon, created FROM geocode WHERE key=?", (key,)).fetchone()
+            result = (row[0], row[1]) if row and row[0] is not None else None
+            ttl = self.ttl if result else self.negative_ttl
+            if row is None or (ttl is not None and time.time() - row[2] > ttl):
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            return True, result
+
+    def get_stale(self, key):
+        with self._lock:
+            row = self._con.execute("SELECT lat, lon FROM geocode WHERE key=? AND lat IS NOT NULL", (key,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, key, result):
+        lat, lon = result if result else (None, None)
+        with self._lock:
+            self._con.execute("INSERT OR REPLACE INTO geocode (key, lat, lon, created) VALUES (?, ?, ?, ?)", (key, lat, lon, time.time()))
+            self._con.commit()
+
+    def stats(self):
+        with self._lock:
+            entries = self._con.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+_default_cache = None
+_default_geocoder = None
+
+
+def get_geocode_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = GeocodeCache(os.environ.get("BOHR_GEOCODE_CACHE", DEFAULT_CACHE_PATH))
+    return _default_cache
+
+
+def get_geocoder():
+    global _default_geocoder
+    if _default_geocoder is None:
+        _default_geocoder = make_geocoder()
+    return _default_geocoder
+
+# ==============================================================================
+# GEOCODING
+# ==============================================================================
+def geocode(address, cache=None, geocoder=None):
+    # -> (lat, lon) oder None. Fehler des Backends werden geloggt und nicht gecacht;
+    # dann dient ein abgelaufener Eintrag als Notlösung.
+    key = normalize_address(address)
+    if not key: return None
+    cache = cache or get_geocode_cache()
+    found, result = cache.get(key)
+    if found: return result
+    try:
+        result = (geocoder or get_geocoder()).lookup(address)
+    except Exception as e:
+        logger.warning("Geocoding für '%s' fehlgeschlagen: %s", address, e)
+        return cache.get_stale(key)
+    cache.put(key, result)
+    return result
+
+
+def geocode_many(addresses, cache=None, geocoder=None):
+    # Stapelbetrieb: jede Adresse nur einmal nachschlagen; das Backend hält das
+    # Ratenlimit selbst ein, Cache-Treffer kosten keine Wartezeit.
+    results = {}
+    for address in addresses:
+        key = normalize_address(address)
+        if key not in results: results[key] = geocode(address, cache, geocoder)
+    return [results[normalize_address(a)] for a in addresses]
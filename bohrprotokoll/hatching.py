@@ -0,0 +1,144 @@
+from reportlab.graphics.shapes import Group, Path, FILL_NON_ZERO
+from reportlab.lib import colors
+
+# ==============================================================================
+# BODENARTEN
+# ==============================================================================
+# Regeln in Prüfreihenfolge: (Typ, Farbe, Stichworte). Der erste Treffer in
+# f + a + g gewinnt; "sand" in f hat immer Vorrang, sonst ist Sand der Standard.
+SOIL_RULES = [
+    ("kies", "#FFCC80", ("kies",)),
+    ("schluff", "#E6EE9C", ("schluff",)),
+    ("ton", "#BCAAA4", ("ton",)),
+    ("lehm", "#FFE082", ("lehm",)),
+    ("mudde", "#AED581", ("mudde", "torf")),
+    ("mutterboden", "#5D4037", ("mutterboden",)),
+    ("auffuellung", "#EEEEEE", ("auffüllung",)),
+]
+SOIL_COLORS = {"sand": "#FFF59D", **{t: c for t, c, _ in SOIL_RULES}}
+
+
+def classify_soil(f, a="", g=""):
+    boden_text = (str(f) + " " + str(a) + " " + str(g)).lower()
+    type_ = next((t for t, _, words in SOIL_RULES if any(w in boden_text for w in words)), "sand")
+    if "sand" in str(f).lower(): type_ = "sand"
+    return SOIL_COLORS[type_], type_
+
+# ==============================================================================
+# SCHRAFFUREN
+# ==============================================================================
+# Jede Schraffur wird einmal als Kachel definiert (Koordinaten relativ zur Kachel)
+# und daraus sowohl das SVG-<pattern> als auch die ReportLab-Füllung erzeugt.
+# Die Kacheln sind am Ursprung ausgerichtet (patternUnits="userSpaceOnUse").
+# Formen: ("rect", x, y, w, h), ("circle", cx, cy, r), ("line", [(x, y), ...])
+_KAPPA = 0.5522847498
+
+
+class Hatch:
+    def __init__(self, name, width, height, shapes, fill=None, stroke=None, stroke_width=1):
+        self.name = name
+        self.width = width; self.height = height
+        self.shapes = shapes
+        self.fill = fill; self.stroke = stroke; self.stroke_width = stroke_width
+
+    @property
+    def pattern_id(self):
+        return f"hatch-{self.name}"
+
+    @property
+    def url(self):
+        return f"url(#{self.pattern_id})"
+
+    def svg_pattern(self):
+        style = f'fill="{self.fill or "none"}" stroke="{self.stroke or "none"}"'
+        if self.stroke: style += f' stroke-width="{self.stroke_width}"'
+        parts = [f'<pattern id="{self.pattern_id}" patternUnits="userSpaceOnUse" width="{self.width}" height="{self.height}"><g {style}>']
+        for s in self.shapes:
+            if s[0] == "rect": parts.append(f'<rect x="{s[1]}" y="{s[2]}" width="{s[3]}" height="{s[4]}"/>')
+            elif s[0] == "circle": parts.append(f'<circle cx="{s[1]}" cy="{s[2]}" r="{s[3]}"/>')
+            elif s[0] == "line": parts.append('<path d="M' + " L".join(f"{x},{y}" for x, y in s[1]) + '"/>')
+        parts.append('</g></pattern>')
+        return "".join(parts)
+
+    def _add_to_path(self, p, shapes, dx, dy):
+        for s in shapes:
+            if s[0] == "rect":
+                _rect_path(p, s[1] + dx, s[2] + dy, s[3], s[4])
+            elif s[0] == "circle":
+                cx, cy, r = s[1] + dx, s[2] + dy, s[3]; k = r * _KAPPA
+                p.moveTo(cx + r, cy)
+                p.curveTo(cx + r, cy + k, cx + k, cy + r, cx, cy + r)
+                p.curveTo(cx - k, cy + r, cx - r, cy + k, cx - r, cy)
+                p.curveTo(cx - r, cy - k, cx - k, cy - r, cx, cy - r)
+                p.curveTo(cx + k, cy - r, cx + r, cy - k, cx + r, cy)
+                p.closePath()
+            elif s[0] == "line":
+                pts = s[1]
+                p.moveTo(pts[0][0] + dx, pts[0][1] + dy)
+                for x, y in pts[1:]: p.lineTo(x + dx, y + dy)
+
+    def rl_fill(self, x, y, w, h):
+        # Eine Gruppe aus Clip-Rechteck und einem einzigen Pfad für alle Kacheln
+        # (statt einer ReportLab-Form pro Punkt). Koordinaten wie im SVG (y nach unten).
+        clip = Path(isClipPath=1, fillColor=None, strokeColor=None)
+        _rect_path(clip, x, y, w, h)
+        p = Path(fillMode=FILL_NON_ZERO,
+                 fillColor=colors.toColor(self.fill) if self.fill else None,
+                 strokeColor=colors.toColor(self.stroke) if self.stroke else None,
+                 strokeWidth=self.stroke_width)
+        tx0 = int(x // self.width) * self.width; ty0 = int(y // self.height) * self.height
+        rows = range(int((y + h - ty0) // self.height) + 1)
+        cols = range(int((x + w - tx0) // self.width) + 1)
+        # Linien über die volle Kachelbreite/-höhe werden über alle Kacheln hinweg
+        # zu einem Rechteck zusammengefasst (Schluff, Ton, Lehm, Filterrohr).
+        tile = []
+        for s in self.shapes:
+            if s[0] == "rect" and s[3] == self.width:
+                for j in rows: _rect_path(p, tx0, ty0 + j*self.height + s[2], len(cols) * self.width, s[4])
+            elif s[0] == "rect" and s[4] == self.height:
+                for i in cols: _rect_path(p, tx0 + i*self.width + s[1], ty0, s[3], len(rows) * self.height)
+            else:
+                tile.append(s)
+        if tile:
+            # Formen, die nach links/oben über die Kachel hinausragen (Auffüllung), liegen
+            # am Rand des Rechtecks teils in der Kachel davor; die wird mitgezeichnet
+            lead = -1 if any(_reaches_back(s) for s in tile) else 0
+            for j in range(lead, len(rows)):
+                for i in range(lead, len(cols)): self._add_to_path(p, tile, tx0 + i*self.width, ty0 + j*self.height)
+        return Group(clip, p)
+
+
+def _reaches_back(s):
+    if s[0] == "rect": return s[1] < 0 or s[2] < 0
+    if s[0] == "circle": return s[1] < s[3] or s[2] < s[3]
+    return any(x < 0 or y < 0 for x, y in s[1])
+
+
+def _rect_path(p, x, y, w, h):
+    p.moveTo(x, y); p.lineTo(x + w, y); p.lineTo(x + w, y + h); p.lineTo(x, y + h); p.closePath()
+
+
+def _filterkies_dots():
+    # Entspricht dem bisherigen Raster (8er-Schritt, Punkt wenn (px+py) % 13 == 0), Periode 104;
+    # um 2 verschoben, damit kein Punkt am Kachelrand abgeschnitten wird
+    return [("circle", 8*i + 2, 8*j + 2, 1) for i in range(13) for j in range(13) if (8*i + 8*j) % 13 == 0]
+
+
+HATCHES = {
+    "sand": Hatch("sand", 10, 20, [("rect", 5, 0, 1.5, 1.5), ("rect", 0, 10, 1.5, 1.5)], fill="black"),
+    "mudde": Hatch("mudde", 12, 24, [("rect", 6, 0, 2.5, 2.5), ("rect", 0, 12, 2.5, 2.5)], fill="#5D4037"),
+    "kies": Hatch("kies", 12, 12, [("circle", 4, 4, 2.5)], stroke="black", stroke_width=1),
+    "schluff": Hatch("schluff", 4, 4, [("rect", 0, 0, 0.5, 4)], fill="black"),
+    "ton": Hatch("ton", 4, 4, [("rect", 0, 0, 4, 0.5)], fill="black"),
+    "lehm": Hatch("lehm", 6, 6, [("rect", 0, 0, 0.5, 6), ("rect", 0, 0, 6, 0.5)], fill="black"),
+    "mutterboden": Hatch("mutterboden", 15, 10, [("line", [(0, 1), (3, 5), (6, 1)])], stroke="white", stroke_width=1),
+    "auffuellung": Hatch("auffuellung", 10, 10, [("line", [(0, 0), (10, 10)]), ("line", [(-1, 9), (1, 11)]), ("line", [(9, -1), (11, 1)])], stroke="black", stroke_width=1),
+    "filterkies": Hatch("filterkies", 104, 104, _filterkies_dots(), fill="orange"),
+    "filterrohr": Hatch("filterrohr", 4, 4, [("rect", 0, 1.5, 4, 1)], fill="black"),
+}
+
+
+def svg_defs(types):
+    used = [HATCHES[t].svg_pattern() for t in sorted(set(types)) if t in HATCHES]
+    if not used: return ""
+    return "<defs>" + "".join(used) + "</defs>"
@@ -0,0 +1,87 @@
+import logging
+import os
+from io import BytesIO
+
+from PIL import Image
+from reportlab.lib.utils import ImageReader
+
+from .artifacts import ArtifactCache, content_key
+
+logger = logging.getLogger(__name__)
+
+# ==============================================================================
+# BILDER FÜR DAS PDF (LOGO, KARTE)
+# ==============================================================================
+# Einmal je Inhalt + Zielgröße: dekodieren, auf die Zielauflösung (BOHR_IMAGE_DPI,
+# Standard 200 dpi) der Druckgröße verkleinern (nie vergrößern) und neu komprimieren.
+# Ohne Transparenz wird JPEG gewählt, wenn es kleiner ist als PNG (ReportLab bettet
+# JPEG unverändert ein, PNG als unkomprimierte Pixel + Flate); sonst PNG.
+# Die Ergebnisse liegen im Bild-Cache (Bytes); je Dokument wird daraus genau ein
+# ImageReader erzeugt und auf allen Seiten verwendet.
+DEFAULT_DPI = 200
+JPEG_QUALITY = 85
+IMAGE_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class PreparedImage:
+    def __init__(self, data, width, height, original_size):
+        self.data = data; self.width = width; self.height = height
+        self.original_size = original_size
+
+    def reader(self):
+        return ImageReader(BytesIO(self.data))
+
+
+def image_dpi():
+    return int(os.environ.get("BOHR_IMAGE_DPI", DEFAULT_DPI))
+
+
+def _encode(img):
+    # Kleinere der Kodierungen; JPEG nur ohne Alphakanal
+    candidates = []
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+    else:
+        rgb = img.convert("RGB")
+        buf = BytesIO(); rgb.save(buf, format="JPEG", quality=JPEG_QUALITY, optimize=True); candidates.append(buf.getvalue())
+    buf = BytesIO(); img.save(buf, format="PNG", optimize=True); candidates.append(buf.getvalue())
+    return min(candidates, key=len)
+
+
+def _prepare(data, box_w, box_h, dpi):
+    img = Image.open(BytesIO(data)); img.load()
+    # Zielpixel = Druckgröße (pt) / 72 * dpi; Seitenverhältnis bleibt erhalten
+    scale = min(box_w / 72 * dpi / img.width, box_h / 72 * dpi / img.height, 1.0)
+    if scale < 1.0:
+        img = img.resize((max(1, round(img.width * scale)), max(1, round(img.height * scale))), Image.LANCZOS)
+    return _encode(img)
+
+
+def prepare_image(data, box_w, box_h, dpi=None, cache=None):
+    # data: Bilddatei (bytes); box_w/box_h: maximale Druckgröße in pt
+    dpi = dpi or image_dpi()
+    cache = cache or get_image_cache()
+    prepared = cache.get_or_build("image", content_key(data, round(box_w, 2), round(box_h, 2), dpi), lambda: _prepare(data, box_w, box_h, dpi))
+    # Bildgröße aus dem Kopf lesen (ohne Dekodieren der Pixel)
+    with Image.open(BytesIO(prepared)) as img: width, height = img.size
+    return PreparedImage(prepared, width, height, len(data))
+
+
+def prepared_or_none(data, box_w, box_h, dpi=None):
+    # Wie prepare_image(), aber ungültige Bilder werden protokolliert statt zu scheitern
+    if not data: return None
+    try:
+        return prepare_image(data, box_w, box_h, dpi)
+    except Exception as e:
+        logger.warning("Bild konnte nicht aufbereitet werden: %s", e)
+        return None
+
+
+_default_image_cache = None
+
+
+def get_image_cache():
+    global _default_image_cache
+    if _default_image_cache is None:
+        _default_image_cache = ArtifactCache(IMAGE_CACHE_BYTES)
+    return _default_image_cache
@@ -0,0 +1,170 @@
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from io import BytesIO
+
+from .pdf import write_multipage_pdf
+from .profile import build_profile_drawing
+from .timing import new_timer, output_size, report
+from .validation import require_valid
+
+logger = logging.getLogger(__name__)
+
+# ==============================================================================
+# PDF-AUFTRÄGE IM HINTERGRUND
+# ==============================================================================
+# Ein Auftrag pro Inhalts-Schlüssel (gleiche Eingaben = gleicher Auftrag, auch über
+# Sitzungen hinweg). Die Anzahl gleichzeitiger Builds ist pro Server begrenzt
+# (BOHR_PDF_JOBS), weitere Aufträge warten; ist auch die Warteschlange voll, wird
+# abgelehnt. Threads statt Prozesse: Kachel- und Artefakt-Cache werden geteilt und
+# der Fortschritt ist ohne IPC sichtbar; das Skript der Sitzung blockiert nicht.
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 20
+MAX_FINISHED = 50
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "wartend", "läuft", "fertig", "fehler", "abgebrochen"
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, key):
+        self.key = key
+        self.state = QUEUED
+        self.progress = 0.0; self.message = "In Warteschlange"
+        self.result = None; self.error = None
+        self.timings = None
+        self.map_missing = False
+        self.created = time.time(); self.finished = None
+        self.future = None
+        self._cancel = threading.Event()
+
+    @property
+    def done(self):
+        return self.state in (DONE, FAILED, CANCELLED)
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def update(self, progress, message=None):
+        # Wird aus dem Build aufgerufen; bricht bei Abbruchwunsch mit JobCancelled ab
+        if self._cancel.is_set(): raise JobCancelled()
+        self.progress = max(self.progress, min(progress, 1.0))
+        if message: self.message = message
+
+    def cancel(self):
+        self._cancel.set()
+        if self.future is not None and self.future.cancel():
+            self.state = CANCELLED; self.message = "Abgebrochen"; self.finished = time.time()
+
+
+class JobQueue:
+    def __init__(self, max_workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING, io_workers=4):
+        self.max_workers = max_workers; self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="pdf-job")
+        # Netzwerk (Kartenkacheln) getrennt, damit es parallel zum Build läuft
+        self.io_pool = ThreadPoolExecutor(io_workers, thread_name_prefix="pdf-io")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock: return self._jobs.get(key)
+
+    def submit(self, key, fn):
+        # fn(job) -> Ergebnis; wartet oder läuft ein Auftrag mit gleichem Schlüssel, wird er zurückgegeben
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not job.done: return job
+            if sum(not j.done for j in self._jobs.values()) >= self.max_workers + self.max_pending:
+                raise QueueFull(key)
+            job = Job(key)
+            self._jobs[key] = job
+            self._prune()
+        job.future = self._pool.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job, fn):
+        if job.cancelled:
+            job.state = CANCELLED; job.message = "Abgebrochen"; job.finished = time.time()
+            return
+        job.state = RUNNING; job.message = "Wird erstellt"
+        try:
+            job.result = fn(job)
+            job.state = DONE; job.progress = 1.0; job.message = "Fertig"
+        except JobCancelled:
+            job.state = CANCELLED; job.message = "Abgebrochen"
+        except Exception as e:
+            logger.exception("PDF-Auftrag fehlgeschlagen")
+            job.state = FAILED; job.error = f"{type(e).__name__}: {e}"; job.message = "Fehler"
+        job.finished = time.time()
+
+    def _prune(self):
+        finished = sorted((j for j in self._jobs.values() if j.done), key=lambda j: j.finished or 0)
+        for j in finished[:max(0, len(finished) - MAX_FINISHED)]: del self._jobs[j.key]
+
+    def stats(self):
+        with self._lock: jobs = list(self._jobs.values())
+        return {"running": sum(j.state == RUNNING for j in jobs), "queued": sum(j.state == QUEUED for j in jobs), "max_workers": self.max_workers}
+
+
+_default_queue = None
+
+
+def get_job_queue():
+    global _default_queue
+    if _default_queue is None:
+        _default_queue = JobQueue(int(os.environ.get("BOHR_PDF_JOBS", DEFAULT_WORKERS)))
+    return _default_queue
+
+# ==============================================================================
+# PDF-PIPELINE
+# ==============================================================================
+def _wait(job, future, progress):
+    # Auf die Karte warten, dabei weiter auf Abbruch reagieren
+    while True:
+        job.update(progress)
+        try: return future.result(timeout=0.2)
+        except FutureTimeout: continue
+
+
+def estimate_pages(df_geo, profile_pages=1):
+    # Deckblatt + ca. 10 Schichten je Blatt + Profil; nur für die Fortschrittsanzeige
+    return 1 + max(1, math.ceil(len(df_geo) / 10)) + profile_pages
+
+
+def write_pdf_job(job, out, meta, df_geo, df_rohr, df_ring, profile_scale, get_map, io_pool):
+    # Tiefenangaben prüfen (ValidationError vor jeder Arbeit), dann Karte im IO-Pool und
+    # währenddessen Profil zeichnen; danach doc.build mit Fortschritt je Seite.
+    # Mit BOHR_TIMING landen die Stufenzeiten im Log und in job.timings.
+    timer = new_timer(); pages_done = [0]
+    with timer.stage("pruefung"): require_valid(df_geo, df_rohr, df_ring, meta.get("teufe"))
+    map_future = io_pool.submit(get_map) if get_map else None
+    job.update(0.05, "Profil wird gezeichnet")
+    with timer.stage("profil"): profile_drawing = None if profile_scale else build_profile_drawing(df_geo, df_rohr, df_ring, meta)
+    map_png = None
+    if map_future is not None:
+        job.update(0.15, "Karte wird geladen")
+        with timer.stage("karte"): map_png = _wait(job, map_future, 0.15)
+        job.map_missing = not map_png
+    depth = df_geo["Bis_m"].max() if len(df_geo) else 0
+    # Maßstäbliches Profil: ca. 22 cm Zeichenhöhe je Blatt
+    pages = estimate_pages(df_geo, max(1, math.ceil(depth / (0.22 * profile_scale))) if profile_scale else 1)
+    job.update(0.2, "PDF wird gesetzt")
+
+    def on_page(page):
+        pages_done[0] = page
+        job.update(0.2 + 0.75 * min(page / pages, 1.0), f"PDF wird gesetzt: Seite {page}")
+
+    write_multipage_pdf(out, meta, df_geo, df_rohr, df_ring, profile_drawing, BytesIO(map_png) if map_png else None, profile_scale, on_page=on_page, timer=timer)
+    timer.size("pdf", output_size(out)); timer.size("karte", len(map_png) if map_png else None); timer.size("logo", len(meta.get("logo_bytes") or b"") or None)
+    job.timings = report(timer, aktenzeichen=meta.get("aktenzeichen"), schichten=len(df_geo), seiten=pages_done[0], massstab=profile_scale)
@@ -0,0 +1,106 @@
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Paragraph, Table, TableStyle
+
+from .layers import DESC_COLS, prepare_layers
+
+# ==============================================================================
+# SCHICHTENVERZEICHNIS (DIN 4022): GEMEINSAME STILE
+# ==============================================================================
+# Absatz- und Tabellenstile werden einmal beim Import angelegt und von allen
+# Zeilen geteilt. Zellen ohne Inhalt (nur "a)" usw.) sind einfache Strings statt
+# Paragraphs, ebenso kurze Texte ohne Markup, die ohne Umbruch in die Zelle passen;
+# Schrift und Zeilenhöhe kommen dann aus den Tabellenbefehlen.
+# Zeilen a) bis c) behalten die bisherige Höhe (Leerzellen mit 12 pt Zeilenabstand).
+_styles = getSampleStyleSheet()
+STYLE_GEO_NORM = ParagraphStyle('GeoNorm', parent=_styles['Normal'], fontSize=7, leading=8)
+STYLE_GEO_HEADER = ParagraphStyle('GeoHeader', parent=_styles['Normal'], fontName='Helvetica-Bold', fontSize=7, leading=8, alignment=1)
+STYLE_GEO_CENTER = ParagraphStyle('GeoCenter', parent=_styles['Normal'], fontName='Helvetica', fontSize=7, leading=8, alignment=1)
+
+W_INNER = [2.5*cm, 2.5*cm, 2.5*cm, 1.5*cm]
+COL_WIDTHS = [1.5*cm, sum(W_INNER), 3.0*cm, 1.2*cm, 1.0*cm, 1.3*cm]
+_CELL_FONT = [('FONTNAME', (0,0), (-1,-1), 'Helvetica'), ('FONTSIZE', (0,0), (-1,-1), 7), ('LEADING', (0,0), (-1,-1), 8)]
+_BLANK_LEADING = 12
+
+INNER_STYLE = TableStyle([('GRID', (0,0), (-1,-1), 0.5, colors.black), ('SPAN', (0,0), (-1,0)), ('SPAN', (0,1), (-1,1)), ('SPAN', (2,2), (3,2)), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('LEFTPADDING', (0,0), (-1,-1), 6), ('RIGHTPADDING', (0,0), (-1,-1), 2), ('TOPPADDING', (0,0), (-1,-1), 1), ('BOTTOMPADDING', (0,0), (-1,-1), 1)] + _CELL_FONT + [('LEADING', (0,0), (-1,2), _BLANK_LEADING)])
+OUTER_STYLE = TableStyle([('GRID', (0,0), (-1,-1), 0.5, colors.black), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('ALIGN', (0,0), (0,-1), 'CENTER'), ('LEFTPADDING', (0,0), (-1,-1), 0), ('RIGHTPADDING', (0,0), (-1,-1), 0), ('TOPPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 0), ('BACKGROUND', (0,1), (-1,1), colors.white)] + _CELL_FONT)
+
+HEADER_DESC = ["a) Benennung der Bodenart und Beimengungen", "b) Ergänzende Bemerkung", "c) Beschaffenheit<br/>nach Bohrgut", "d) Beschaffenheit<br/>nach Bohrvorgang", "e) Farbe", "f) Übliche<br/>Benennung", "g) Geologische<br/>Benennung", "h) Gruppe", "i) Kalk-<br/>gehalt"]
+HEADER_BIS = "Bis<br/>... m<br/>unter<br/>Ansatz-<br/>punkt"
+HEADER_TAIL = ["Bemerkungen<br/>Sonderprobe<br/>Wasserführung<br/>Bohrwerkzeuge<br/>Kernverlust<br/>Sonstiges", "Art", "Nr", "Tiefe<br/>in m<br/>(Unter-<br/>kante)"]
+_LABELS = {f"{c})" for c in DESC_COLS}
+_MARKUP = set("<>&")
+# Nutzbare Textbreite je Feld a..i (Spaltenbreite abzüglich Innenabstand 6 + 2)
+_DESC_TEXT_WIDTHS = [sum(W_INNER) - 8, sum(W_INNER) - 8, W_INNER[0] - 8, W_INNER[1] - 8, W_INNER[2] + W_INNER[3] - 8] + [w - 8 for w in W_INNER]
+
+
+def _cell(text, style, width=None):
+    # Leere Zellen, reine Feldbezeichner und kurze Klartexte ohne Paragraph
+    if not text: return ""
+    if text in _LABELS: return text
+    if width and style.fontName == "Helvetica" and not _MARKUP.intersection(text) and stringWidth(text, "Helvetica", 7) <= width: return text
+    return Paragraph(text, style)
+
+
+def _desc_rows(desc, style):
+    a, b, c, d, e, f, g, h, i = (_cell(t, style, w) for t, w in zip(desc, _DESC_TEXT_WIDTHS))
+    return [[a, "", "", ""], [b, "", "", ""], [c, d, e, ""], [f, g, h, i]]
+
+
+# ==============================================================================
+# VERSCHACHTELT: EINE INNERE TABELLE PRO SCHICHT (Layout wie bisher)
+# ==============================================================================
+def _nested_desc_table(desc, style):
+    t = Table(_desc_rows(desc, style), colWidths=W_INNER)
+    t.setStyle(INNER_STYLE)
+    return t
+
+
+def _nested_table(layers):
+    header = [Paragraph(str(n), STYLE_GEO_HEADER) for n in range(1, 7)]
+    header2 = [Paragraph(HEADER_BIS, STYLE_GEO_HEADER), _nested_desc_table(HEADER_DESC, STYLE_GEO_HEADER)] + [Paragraph(t, STYLE_GEO_NORM) for t in HEADER_TAIL]
+    data = [header, header2]
+    for r in layers.itertuples(index=False):
+        desc = (r.txt_a, r.txt_b, r.txt_c, r.txt_d, r.txt_e, r.txt_f, r.txt_g, r.txt_h, r.txt_i)
+        data.append([_cell(r.bis_text, STYLE_GEO_CENTER, COL_WIDTHS[0]), _nested_desc_table(desc, STYLE_GEO_NORM)] + [_cell(t, STYLE_GEO_NORM, w) for t, w in zip((r.bemerkung, r.p_art, r.p_nr, r.p_tiefe_text), COL_WIDTHS[2:])])
+    t = Table(data, colWidths=COL_WIDTHS, repeatRows=2)
+    t.setStyle(OUTER_STYLE)
+    return t
+
+# ==============================================================================
+# FLACH: EINE TABELLE, 4 ZEILEN PRO SCHICHT, VERBUNDEN ÜBER SPAN
+# ==============================================================================
+# Spalten: Bis | a..i (4 Spalten) | Bemerkung | Art | Nr | Tiefe
+FLAT_WIDTHS = COL_WIDTHS[:1] + W_INNER + COL_WIDTHS[2:]
+FLAT_STYLE = [('GRID', (0,0), (-1,-1), 0.5, colors.black), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('ALIGN', (0,0), (0,-1), 'CENTER'), ('LEFTPADDING', (0,0), (-1,-1), 0), ('RIGHTPADDING', (0,0), (-1,-1), 0), ('TOPPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 0), ('LEFTPADDING', (1,1), (4,-1), 6), ('RIGHTPADDING', (1,1), (4,-1), 2), ('TOPPADDING', (1,1), (4,-1), 1), ('BOTTOMPADDING', (1,1), (4,-1), 1), ('BACKGROUND', (0,1), (-1,4), colors.white), ('SPAN', (1,0), (4,0))] + _CELL_FONT
+
+
+def _block_cmds(r0):
+    # SPAN- und Zeilenhöhen-Befehle für einen Block aus 4 Zeilen ab Zeile r0
+    r3 = r0 + 3
+    return [('LEADING', (1,r0), (4,r0+2), _BLANK_LEADING), ('SPAN', (0,r0), (0,r3)), ('SPAN', (1,r0), (4,r0)), ('SPAN', (1,r0+1), (4,r0+1)), ('SPAN', (3,r0+2), (4,r0+2))] + [('SPAN', (c,r0), (c,r3)) for c in range(5, 9)]
+
+
+def _flat_block(bis, desc, tail, style, bis_style, tail_style):
+    rows = _desc_rows(desc, style)
+    first = [_cell(bis, bis_style, COL_WIDTHS[0])] + rows[0] + [_cell(t, tail_style, w) for t, w in zip(tail, COL_WIDTHS[2:])]
+    return [first] + [[""] + row + ["", "", "", ""] for row in rows[1:]]
+
+
+def _flat_table(layers):
+    header = [Paragraph(str(n), STYLE_GEO_HEADER) for n in range(1, 3)] + ["", "", ""] + [Paragraph(str(n), STYLE_GEO_HEADER) for n in range(3, 7)]
+    data = [header] + _flat_block(HEADER_BIS, HEADER_DESC, HEADER_TAIL, STYLE_GEO_HEADER, STYLE_GEO_HEADER, STYLE_GEO_NORM)
+    cmds = list(FLAT_STYLE) + _block_cmds(1)
+    for r in layers.itertuples(index=False):
+        cmds += _block_cmds(len(data))
+        desc = (r.txt_a, r.txt_b, r.txt_c, r.txt_d, r.txt_e, r.txt_f, r.txt_g, r.txt_h, r.txt_i)
+        data += _flat_block(r.bis_text, desc, (r.bemerkung, r.p_art, r.p_nr, r.p_tiefe_text), STYLE_GEO_NORM, STYLE_GEO_CENTER, STYLE_GEO_NORM)
+    return Table(data, colWidths=FLAT_WIDTHS, repeatRows=5, style=cmds)
+
+
+def layer_table(df_geo, flat=False, layers=None):
+    # layers: bereits vorbereitete Tabelle aus prepare_layers() (optional)
+    if layers is None: layers = prepare_layers(df_geo)
+    return _flat_table(layers) if flat else _nested_table(layers)
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from .hatching import SOIL_COLORS, SOIL_RULES
+
+# ==============================================================================
+# VORVERARBEITUNG: SCHICHTEN, ROHRE, RINGRAUM
+# ==============================================================================
+# Alles spaltenweise mit pandas statt iterrows(). Ergebnis sind kompakte Tabellen
+# mit einheitlichen Spalten top/bottom (m), die von der Profilzeichnung und der
+# Schichtentabelle im PDF gemeinsam genutzt werden.
+SOIL_TYPES = ["sand"] + [t for t, _, _ in SOIL_RULES]
+DESC_COLS = list("abcdefghi")
+
+
+def _text(df, col):
+    if col not in df: return pd.Series("", index=df.index, dtype=object).astype(str)
+    return df[col].fillna("").astype(str)
+
+
+def _num(df, col):
+    if col not in df: return pd.Series(0.0, index=df.index)
+    return pd.to_numeric(df[col], errors="coerce").astype("float64")
+
+
+def classify_layers(df_geo):
+    # Vektorisierte Fassung von classify_soil(): gleiche Regeln, gleiche Reihenfolge
+    f = _text(df_geo, "f").str.lower()
+    boden_text = f + " " + _text(df_geo, "a").str.lower() + " " + _text(df_geo, "g").str.lower()
+    conds = [np.logical_or.reduce([boden_text.str.contains(w, regex=False).to_numpy() for w in words]) for _, _, words in SOIL_RULES]
+    soil = np.select(conds, [t for t, _, _ in SOIL_RULES], "sand") if len(df_geo) else np.array([], dtype=object)
+    soil = np.where(f.str.contains("sand", regex=False).to_numpy(), "sand", soil)
+    return pd.Categorical(soil, categories=SOIL_TYPES)
+
+
+def prepare_layers(df_geo):
+    bottom = _num(df_geo, "Bis_m").to_numpy()
+    p_tiefe = _num(df_geo, "p_tiefe").fillna(0.0).to_numpy()
+    soil = classify_layers(df_geo)
+    fill = np.asarray(soil.map(SOIL_COLORS), dtype=object)
+    cols = {
+        "top": np.concatenate([[0.0], bottom])[:-1], "bottom": bottom,
+        "soil": soil, "fill": fill,
+        "text_fill": np.where(fill == SOIL_COLORS["mutterboden"], "white", "black"),
+        "label": _text(df_geo, "f").to_numpy(),
+        # Texte für die Schichtentabelle (DIN 4022), fertig formatiert
+        "bis_text": np.char.mod("%.2f", bottom),
+    }
+    for c in DESC_COLS:
+        v = _text(df_geo, c).to_numpy(dtype=object)
+        cols["txt_" + c] = np.where(v != "", f"{c}) " + v, f"{c})")
+    cols["bemerkung"] = _text(df_geo, "Bemerkung").to_numpy()
+    cols["p_art"] = _text(df_geo, "p_art").to_numpy()
+    cols["p_nr"] = _text(df_geo, "p_nr").to_numpy()
+    cols["p_tiefe_text"] = np.where(p_tiefe > 0, np.char.mod("%.2f", p_tiefe), "")
+    return pd.DataFrame(cols)
+
+
+def prepare_intervals(df, flags):
+    # flags: {Spalte im Ergebnis: (Quellspalte, Stichwort)} -> bool "Stichwort in Wert"
+    out = pd.DataFrame({"top": _num(df, "Von").to_numpy(), "bottom": _num(df, "Bis").to_numpy()})
+    for name, (col, word) in flags.items():
+        out[name] = _text(df, col).str.contains(word, regex=False).to_numpy()
+    return out
+
+
+class ProfileData:
+    def __init__(self, df_geo, df_rohr, df_ring):
+        self.layers = prepare_layers(df_geo)
+        self.rohr = prepare_intervals(df_rohr, {"filter": ("Typ", "Filter"), "sumpf": ("Typ", "Sumpf")})
+        self.ring = prepare_intervals(df_ring, {"ton": ("Mat", "Ton")})
+        self.markers = np.unique(np.concatenate([self.ring["bottom"].to_numpy(), self.rohr["bottom"].to_numpy()]))
+        self.max_depth = max(self.layers["bottom"].max() if len(self.layers) else 0, self.rohr["bottom"].max() if len(self.rohr) else 0)
+
+    def hatch_types(self):
+        types = set(self.layers["soil"].unique().dropna())
+        if (~self.ring["ton"]).any(): types.add("filterkies")
+        if self.rohr["filter"].any(): types.add("filterrohr")
+        return types
+
+
+def window(df, depth_from, depth_to, scale_y, start_y):
+    # Sichtbare Intervalle im Tiefenfenster, beschnitten, mit Pixel-Lage y und Höhe h
+    vis = df[(df["top"] < depth_to) & (df["bottom"] > depth_from)]
+    top = vis["top"].clip(lower=depth_from); bottom = vis["bottom"].clip(upper=depth_to)
+    return vis.assign(y=start_y + (top - depth_from) * scale_y, h=(bottom - top) * scale_y)
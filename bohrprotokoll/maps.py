@@ -0,0 +1,33 @@
+import logging
+from io import BytesIO
+
+from .tiles import HAS_STATICMAP, get_tile_cache, tile_url_template
+
+if HAS_STATICMAP:
+    from staticmap import CircleMarker as StaticCircleMarker
+    from .tiles import CachedStaticMap
+
+logger = logging.getLogger(__name__)
+
+# ==============================================================================
+# KARTE
+# ==============================================================================
+def get_static_map_image(lat, lon, zoom=15, url_template=None, tile_cache=None):
+    if not HAS_STATICMAP: return None
+    try:
+        url_template = tile_url_template(url_template)
+        m = CachedStaticMap(width=1000, height=500, url_template=url_template, tile_cache=tile_cache or get_tile_cache())
+        marker = StaticCircleMarker((lon, lat), 'red', 18)
+        m.add_marker(marker)
+        image = m.render(zoom=zoom)
+        img_buffer = BytesIO()
+        image.save(img_buffer, format='PNG')
+        img_buffer.seek(0)
+        return img_buffer
+    except Exception as e:
+        logger.warning("Karte konnte nicht erstellt werden: %s", e)
+        return None
+
+def get_static_map_png(lat, lon, zoom=15):
+    img_buffer = get_static_map_image(lat, lon, zoom)
+    return img_buffer.getvalue() if img_buffer else None
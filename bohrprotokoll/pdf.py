@@ -0,0 +1,174 @@
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image as RLImage
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.utils import ImageReader
+
+from .images import prepared_or_none
+from .layer_table import layer_table
+from .profile import profile_pages
+from .timing import NULL_TIMER
+
+# ==============================================================================
+# PDF BUILDER
+# ==============================================================================
+# Platz für das Logo im Kopf (Firmenfeld abzüglich Rand)
+LOGO_BOX = (3.1*cm, 1.9*cm)
+
+
+def draw_header_on_page(canvas, doc):
+    canvas.saveState()
+    meta = doc.meta_data 
+    page_width, page_height = A4
+    margin_left = 2*cm; margin_right = 2*cm
+    box_w_firma = 3.5 * cm; box_w_akten = 4.0 * cm      
+    header_top = page_height - 1*cm; header_bottom = page_height - 4.5*cm 
+    row_line_y = header_bottom + 1.2*cm
+    x_line_1 = margin_left + box_w_firma; x_line_2 = page_width - margin_right - box_w_akten
+    
+    canvas.setFillColor(colors.whitesmoke)
+    canvas.rect(margin_left, row_line_y, box_w_firma, header_top - row_line_y, fill=1, stroke=0)
+    canvas.setStrokeColor(colors.black); canvas.setLineWidth(1)
+    canvas.rect(margin_left, header_bottom, page_width - margin_left - margin_right, header_top - header_bottom, fill=0, stroke=1)
+    canvas.line(margin_left, row_line_y, page_width - margin_right, row_line_y) 
+    canvas.line(x_line_1, row_line_y, x_line_1, header_top) 
+    canvas.line(x_line_2, header_bottom, x_line_2, header_top) 
+    
+    if meta.get('logo_bytes'):
+        try:
+            # Ein ImageReader je Dokument (write_multipage_pdf), sonst wie bisher je Seite
+            logo_data = getattr(doc, "logo_image", None) or ImageReader(BytesIO(meta['logo_bytes']))
+            avail_w, avail_h = LOGO_BOX
+            iw, ih = logo_data.getSize(); aspect = ih / float(iw)
+            if aspect > avail_h / avail_w: draw_h = avail_h; draw_w = draw_h / aspect
+            else: draw_w = avail_w; draw_h = draw_w * aspect
+            x_img = margin_left + 0.2*cm + (avail_w - draw_w)/2
+            y_img = row_line_y + 0.2*cm + (avail_h - draw_h)/2
+            canvas.drawImage(logo_data, x_img, y_img, width=draw_w, height=draw_h, mask='auto')
+        except: pass
+    else:
+        canvas.setFont("Helvetica-Bold", 14); canvas.setFillColor(colors.green)
+        canvas.drawString(margin_left + 0.2*cm, header_top - 0.6*cm, "Bohr2000")
+        canvas.setFont("Helvetica-Bold", 10); canvas.setFillColor(colors.black)
+        canvas.drawString(margin_left + 0.2*cm, header_top - 1.2*cm, meta['firma'])
+    
+    center_x = x_line_1 + (x_line_2 - x_line_1) / 2
+    canvas.setFillColor(colors.black)
+    canvas.setFont("Helvetica-Bold", 12)
+    canvas.drawCentredString(center_x, header_top - 0.6*cm, "Schichtenverzeichnis / Bohrprofil")
+    canvas.setFont("Helvetica", 9)
+    canvas.drawCentredString(center_x, header_top - 1.0*cm, "nach DIN 4022 / DIN 4023")
+    canvas.drawCentredString(center_x, header_top - 1.4*cm, "für Bohrungen ohne durchgehende Kerngewinnung")
+    
+    text_x_right = x_line_2 + 0.2*cm
+    canvas.setFont("Helvetica", 9)
+    canvas.drawString(text_x_right, header_top - 0.6*cm, "Aktenzeichen:")
+    canvas.setFont("Helvetica-Bold", 10)
+    canvas.drawString(text_x_right, header_top - 1.0*cm, meta['aktenzeichen'])
+    canvas.setFont("Helvetica", 9)
+    canvas.drawString(text_x_right, header_top - 1.5*cm, "Archiv-Nr:")
+    
+    text_y_row = row_line_y - 0.4*cm
+    canvas.setFont("Helvetica", 9)
+    canvas.drawString(margin_left + 0.2*cm, text_y_row, f"Ort: {meta['ort']}")
+    canvas.drawString(margin_left + 0.2*cm, text_y_row - 0.4*cm, f"Bohrung: {meta['projekt']}")
+    canvas.line(x_line_2, header_bottom, x_line_2, row_line_y) 
+    canvas.drawString(text_x_right, text_y_row, "Datum:")
+    canvas.drawString(text_x_right, text_y_row - 0.4*cm, meta['datum'])
+    page_num = doc.page
+    canvas.drawRightString(page_width - margin_right - 0.2*cm, text_y_row, f"Blatt {page_num}")
+    canvas.restoreState()
+
+def create_multipage_pdf_with_header(meta, df_geo, df_rohr, df_ring, profile_drawing, map_image_buffer, profile_scale=None, flat_table=False):
+    buffer = BytesIO()
+    write_multipage_pdf(buffer, meta, df_geo, df_rohr, df_ring, profile_drawing, map_image_buffer, profile_scale, flat_table)
+    return buffer.getvalue()
+
+def write_multipage_pdf(out, meta, df_geo, df_rohr, df_ring, profile_drawing, map_image_buffer, profile_scale=None, flat_table=False, on_page=None, timer=NULL_TIMER, image_dpi=None):
+    # Schreibt direkt in einen Pfad oder einen binären Stream (ohne BytesIO-Kopie);
+    # timer: Stufenzeiten (timing.py) für Bilder, Schichtenverzeichnis und doc.build;
+    # image_dpi: Zielauflösung für Logo und Karte (images.py), 0 = Originale einbetten;
+    # flat_table: Schichtenverzeichnis als eine Tabelle mit SPAN statt verschachtelt;
+    # on_page(seite) wird nach jedem Seitenkopf aufgerufen (Fortschritt, Abbruch per Exception)
+    doc = SimpleDocTemplate(out, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, topMargin=5*cm, bottomMargin=2*cm)
+    doc.meta_data = meta
+    with timer.stage("bilder"):
+        logo = prepared_or_none(meta.get('logo_bytes'), *LOGO_BOX, dpi=image_dpi) if image_dpi != 0 else None
+        doc.logo_image = logo.reader() if logo else None
+        map_bytes = (map_image_buffer.getvalue() if hasattr(map_image_buffer, "getvalue") else map_image_buffer.read()) if map_image_buffer else None
+        map_image = prepared_or_none(map_bytes, A4[0] - 4*cm, A4[1], dpi=image_dpi) if image_dpi != 0 else None
+    timer.size("logo_pdf", len(logo.data) if logo else None); timer.size("karte_pdf", len(map_image.data) if map_image else None)
+    
+    story = []
+    styles = getSampleStyleSheet()
+    style_tab_norm = ParagraphStyle('TabNorm', parent=styles['Normal'], fontSize=8, leading=10)
+    style_tab_bold = ParagraphStyle('TabBold', parent=styles['Normal'], fontName='Helvetica-Bold', fontSize=8, leading=10)
+    
+    page_width, _ = A4; available_width = page_width - 4*cm; col1_width = 5*cm; col2_width = available_width - col1_width
+    
+    # --- SEITE 1 ---
+    data_block1 = [
+        [Paragraph("Bohrung:", style_tab_bold), Paragraph(meta['projekt'], style_tab_norm)],
+        [Paragraph("Ort:", style_tab_bold), Paragraph(meta['ort'], style_tab_norm)],
+        [Paragraph("Kreis:", style_tab_bold), Paragraph(meta['kreis'], style_tab_norm)],
+        [Paragraph("Zweck der Bohrung:", style_tab_bold), Paragraph(meta['zweck'], style_tab_norm)],
+        [Paragraph("Art der Bohrung:", style_tab_bold), Paragraph(meta['art_bohrung'], style_tab_norm)],
+        [Paragraph("Höhe des Ansatzpunktes:", style_tab_bold), Paragraph(f"{meta['ansatz']} m u. GOK", style_tab_norm)]
+    ]
+    t1 = Table(data_block1, colWidths=[col1_width, col2_width])
+    t1.setStyle(TableStyle([('VALIGN', (0,0), (-1,-1), 'TOP'), ('GRID', (0,0), (-1,-1), 0.5, colors.grey), ('BACKGROUND', (0,0), (0,-1), colors.whitesmoke), ('LEFTPADDING', (0,0), (-1,-1), 5), ('BOTTOMPADDING', (0,0), (-1,-1), 3), ('TOPPADDING', (0,0), (-1,-1), 3)]))
+    story.append(t1); story.append(Spacer(1, 0.5*cm))
+    
+    data_block2 = [
+        [Paragraph("Auftraggeber:", style_tab_bold), Paragraph(meta['auftraggeber'], style_tab_norm)],
+        [Paragraph("Objekt:", style_tab_bold), Paragraph(meta['objekt'], style_tab_norm)],
+        [Paragraph("Bohrunternehmer:", style_tab_bold), Paragraph(meta['firma'], style_tab_norm)],
+        [Paragraph("Geräteführer:", style_tab_bold), Paragraph(meta['geraetefuehrer'], style_tab_norm)],
+        [Paragraph("Gebohrt:", style_tab_bold), Paragraph(meta['datum'], style_tab_norm)],
+        [Paragraph("Bohrlochdurchmesser:", style_tab_bold), Paragraph(f"bis {meta['teufe']}m: {meta['durchmesser']}mm", style_tab_norm)],
+        [Paragraph("Bohrverfahren:", style_tab_bold), Paragraph(f"bis {meta['teufe']}m: {meta['verfahren']}", style_tab_norm)],
+        [Paragraph("Gitterwerte:", style_tab_bold), Paragraph(f"Rechts: {meta['rechtswert']} | Hoch: {meta['hochwert']}", style_tab_norm)]
+    ]
+    t2 = Table(data_block2, colWidths=[col1_width, col2_width])
+    t2.setStyle(TableStyle([('VALIGN', (0,0), (-1,-1), 'TOP'), ('GRID', (0,0), (-1,-1), 0.5, colors.grey), ('BACKGROUND', (0,0), (0,-1), colors.whitesmoke), ('LEFTPADDING', (0,0), (-1,-1), 5), ('BOTTOMPADDING', (0,0), (-1,-1), 3), ('TOPPADDING', (0,0), (-1,-1), 3)]))
+    story.append(t2); story.append(Spacer(1, 0.5*cm))
+    
+    if map_bytes:
+        img = RLImage(BytesIO(map_image.data if map_image else map_bytes))
+        img_width = available_width
+        aspect = img.imageHeight / float(img.imageWidth)
+        img.drawWidth = img_width; img.drawHeight = img_width * aspect
+        t_map = Table([[img]], colWidths=[available_width])
+        t_map.setStyle(TableStyle([('GRID', (0,0), (-1,-1), 0.5, colors.black), ('VALIGN', (0,0), (-1,-1), 'MIDDLE'), ('ALIGN', (0,0), (-1,-1), 'CENTER'), ('LEFTPADDING', (0,0), (-1,-1), 0), ('RIGHTPADDING', (0,0), (-1,-1), 0), ('TOPPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 0)]))
+        story.append(t_map)
+    else:
+        story.append(Paragraph("(Keine Karte verfügbar)", style_tab_norm))
+    story.append(PageBreak())
+    
+    # --- SEITE 2 ---
+    with timer.stage("schichtenverzeichnis"): t_geo = layer_table(df_geo, flat=flat_table)
+    story.append(t_geo)
+    story.append(PageBreak())
+    
+    if profile_scale:
+        # Maßstäblich, ein Tiefenfenster pro Blatt (Kopf über onLaterPages)
+        story.extend(profile_pages(df_geo, df_rohr, df_ring, profile_scale, 460, doc.height - 12))
+    elif profile_drawing is not None:
+        try:
+            drawing = profile_drawing
+            avail_width = 460
+            # Tiefe Bohrungen zusätzlich auf die Seitenhöhe begrenzen (sonst LayoutError)
+            factor = min(avail_width / drawing.width, (doc.height - 12) / drawing.height)
+            drawing.width = drawing.width * factor; drawing.height = drawing.height * factor
+            drawing.scale(factor, factor)
+            story.append(drawing)
+        except: pass
+
+    def on_each_page(canvas, doc):
+        draw_header_on_page(canvas, doc)
+        if on_page: on_page(doc.page)
+
+    with timer.stage("doc.build"): doc.build(story, onFirstPage=on_each_page, onLaterPages=on_each_page)
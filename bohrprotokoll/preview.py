@@ -0,0 +1,37 @@
+from .artifacts import ArtifactCache
+from .hatching import svg_defs
+from .profile import SCALE_Y, SvgFragment, profile_elements, profile_size
+
+# ==============================================================================
+# LIVE-VORSCHAU (SVG)
+# ==============================================================================
+# Jedes Element wird einzeln als SVG-Fragment gerendert und unter seinem Tupel aus
+# profile_elements() (Inhalt + Pixel-Lage) gecacht. Beim Bearbeiten einer Zeile
+# ändern sich nur deren Fragment (und beim Ändern einer Tiefe das der Folgeschicht);
+# der Rest kommt aus dem Cache und wird nur neu verkettet.
+DEFAULT_FRAGMENT_BYTES = 16 * 1024 * 1024
+
+_fragment_cache = None
+
+
+def get_fragment_cache():
+    global _fragment_cache
+    if _fragment_cache is None:
+        _fragment_cache = ArtifactCache(DEFAULT_FRAGMENT_BYTES)
+    return _fragment_cache
+
+
+def _render_fragment(draw, r):
+    out = SvgFragment()
+    draw(out, r)
+    return out.result()
+
+
+def preview_svg(data, cache=None, scale_y=SCALE_Y):
+    cache = cache or get_fragment_cache()
+    width, height, depth_to = profile_size(data, 0, None, scale_y)
+    parts = [f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">', svg_defs(data.hatch_types())]
+    for draw, r in profile_elements(data, 0, depth_to, scale_y):
+        parts.append(cache.get_or_build(draw.__name__, r, lambda: _render_fragment(draw, r)))
+    parts.append('</svg>')
+    return "".join(parts)
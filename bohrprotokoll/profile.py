@@ -0,0 +1,225 @@
+import html
+import math
+
+from reportlab.graphics.shapes import Drawing, Group, Rect, Line, PolyLine, Polygon, String
+from reportlab.graphics import renderPDF
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+from reportlab.platypus import Flowable, PageBreak
+
+from .hatching import HATCHES, svg_defs
+from .layers import ProfileData, window
+
+# ==============================================================================
+# GEOMETRIE BOHRPROFIL
+# ==============================================================================
+SCALE_Y = 15
+WIDTH = 700
+MIN_DEPTH = 48
+START_Y = 40; SCALE_X = 40; COL_GEO_X = 100; COL_GEO_W = 100; COL_TECH_X = 350
+
+
+# ==============================================================================
+# RENDERER
+# ==============================================================================
+# Beide Backends arbeiten in SVG-Koordinaten (Pixel, y nach unten). Die Geometrie
+# wird ausschließlich in render_profile() festgelegt.
+class SvgRenderer:
+    def __init__(self, width, height, hatch_types=()):
+        self.parts = [f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">', svg_defs(hatch_types)]
+
+    def rect(self, x, y, w, h, fill=None, stroke=None, stroke_width=None):
+        attrs = f' stroke-width="{stroke_width}"' if stroke_width is not None else ""
+        self.parts.append(f'<rect x="{x}" y="{y}" width="{w}" height="{h}" fill="{fill or "none"}" stroke="{stroke or "none"}"{attrs}/>')
+
+    def line(self, x1, y1, x2, y2, stroke="black", stroke_width=1):
+        self.parts.append(f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="{stroke}" stroke-width="{stroke_width}"/>')
+
+    def polyline(self, points, stroke="black", stroke_width=1):
+        d = "M" + " L".join(f"{x},{y}" for x, y in points)
+        self.parts.append(f'<path d="{d}" fill="none" stroke="{stroke}" stroke-width="{stroke_width}"/>')
+
+    def polygon(self, points, fill=None, stroke=None, opacity=None):
+        attrs = f' fill-opacity="{opacity}"' if opacity is not None else ""
+        self.parts.append(f'<polygon points="{" ".join(f"{x},{y}" for x, y in points)}" fill="{fill or "none"}" stroke="{stroke or "none"}"{attrs}/>')
+
+    def text(self, x, y, s, size=10, anchor="start", bold=False, fill="black"):
+        attrs = (f' text-anchor="{anchor}"' if anchor != "start" else "") + (' font-weight="bold"' if bold else "")
+        self.parts.append(f'<text x="{x}" y="{y}"{attrs} font-family="Arial" font-size="{size}" fill="{fill}">{html.escape(str(s))}</text>')
+
+    def hatch(self, type_, x, y, w, h):
+        self.parts.append(f'<rect x="{x}" y="{y}" width="{w}" height="{h}" fill="{HATCHES[type_].url}" stroke="none"/>')
+
+    def result(self):
+        return "".join(self.parts) + '</svg>'
+
+
+class SvgFragment(SvgRenderer):
+    # Nur die Elemente, ohne <svg>-Rahmen und <defs> (für die Vorschau)
+    def __init__(self):
+        self.parts = []
+
+    def result(self):
+        return "".join(self.parts)
+
+
+def _color(value):
+    if not value: return None
+    if value.startswith("#") and len(value) == 4: value = "#" + "".join(c*2 for c in value[1:])
+    return colors.toColor(value)
+
+
+class DrawingRenderer:
+    # Zeichnet direkt in reportlab.graphics.shapes; die Wurzelgruppe spiegelt die
+    # y-Achse, Texte werden einzeln zurückgespiegelt.
+    def __init__(self, width, height, hatch_types=()):
+        self.drawing = Drawing(width, height)
+        self.root = Group(transform=(1, 0, 0, -1, 0, height))
+        self.drawing.add(self.root)
+
+    def rect(self, x, y, w, h, fill=None, stroke=None, stroke_width=None):
+        self.root.add(Rect(x, y, w, h, fillColor=_color(fill), strokeColor=_color(stroke), strokeWidth=1 if stroke_width is None else stroke_width))
+
+    def line(self, x1, y1, x2, y2, stroke="black", stroke_width=1):
+        self.root.add(Line(x1, y1, x2, y2, strokeColor=_color(stroke), strokeWidth=stroke_width))
+
+    def polyline(self, points, stroke="black", stroke_width=1):
+        self.root.add(PolyLine([c for p in points for c in p], strokeColor=_color(stroke), strokeWidth=stroke_width))
+
+    def polygon(self, points, fill=None, stroke=None, opacity=None):
+        self.root.add(Polygon([c for p in points for c in p], fillColor=_color(fill), strokeColor=_color(stroke), fillOpacity=1 if opacity is None else opacity))
+
+    def text(self, x, y, s, size=10, anchor="start", bold=False, fill="black"):
+        s = String(0, 0, str(s), fontName="Helvetica-Bold" if bold else "Helvetica", fontSize=size, fillColor=_color(fill), textAnchor=anchor)
+        self.root.add(Group(s, transform=(1, 0, 0, -1, x, y)))
+
+    def hatch(self, type_, x, y, w, h):
+        if h > 0: self.root.add(HATCHES[type_].rl_fill(x, y, w, h))
+
+    def result(self):
+        return self.drawing
+
+# ==============================================================================
+# BOHRPROFIL
+# ==============================================================================
+# Das Profil besteht aus Elementen (Maßstab, Schicht, Ringraum, Rohr, Tiefenmarke).
+# profile_elements() liefert je Element die Zeichenfunktion und ein hashbares Tupel
+# mit genau den Werten, die es zeichnet (inkl. Pixel-Lage); render_profile() und die
+# Vorschau (preview.py, Cache je Element) zeichnen daraus.
+def _draw_ruler(out, r):
+    depth_from, depth_to, scale_y = r
+    def y_of(d): return START_Y + (d - depth_from) * scale_y
+    out.text(SCALE_X, START_Y - 15, "m u. GOK", anchor="middle", bold=True)
+    out.line(SCALE_X, START_Y, SCALE_X, y_of(depth_to))
+    for i in range(math.ceil(depth_from), int(depth_to) + 1):
+        y = y_of(i)
+        if i % 2 == 0:
+            out.line(SCALE_X - 5, y, SCALE_X, y)
+            out.text(SCALE_X - 8, y + 4, i, anchor="end")
+        else:
+            out.line(SCALE_X - 3, y, SCALE_X, y, stroke_width=0.5)
+
+
+def _draw_layer(out, r):
+    # Geologie: Farbe + Muster
+    out.rect(COL_GEO_X, r.y, COL_GEO_W, r.h, fill=r.fill, stroke="black")
+    out.hatch(r.soil, COL_GEO_X, r.y, COL_GEO_W, r.h)
+    out.text(COL_GEO_X + COL_GEO_W + 5, r.y + r.h/2, r.label, fill=r.text_fill)
+
+
+def _draw_ring(out, r):
+    # Technik: Ringraum
+    out.rect(COL_TECH_X - 40, r.y, 80, r.h, fill="#795548" if r.ton else "white")
+    if not r.ton:
+        out.hatch("filterkies", COL_TECH_X - 40, r.y, 80, r.h)
+    else:
+        out.polyline([(COL_TECH_X - 40, r.y + r.h), (COL_TECH_X + 40, r.y)], stroke="white")
+
+
+def _draw_rohr(out, r):
+    # Technik: Rohre
+    out.rect(COL_TECH_X - 20, r.y, 40, r.h, fill="white", stroke="black", stroke_width=2)
+    if r.filter:
+        out.hatch("filterrohr", COL_TECH_X - 15, r.y, 30, r.h)
+    if r.sumpf:
+        out.rect(COL_TECH_X - 20, r.y, 40, r.h, fill="#CCC", stroke="black", stroke_width=2)
+
+
+def _draw_marker(out, r):
+    d, y = r
+    x_start = COL_TECH_X + 40; x_end = x_start + 20
+    out.line(x_start, y, x_end, y)
+    out.text(x_end + 3, y + 3, f"{d:.2f}m")
+
+
+def profile_elements(data, depth_from, depth_to, scale_y):
+    yield _draw_ruler, (depth_from, depth_to, scale_y)
+    for draw, df, cols in ((_draw_layer, data.layers, ["y", "h", "fill", "soil", "label", "text_fill"]),
+                           (_draw_ring, data.ring, ["y", "h", "ton"]),
+                           (_draw_rohr, data.rohr, ["y", "h", "filter", "sumpf"])):
+        for r in window(df, depth_from, depth_to, scale_y, START_Y)[cols].itertuples(index=False, name="Element"):
+            yield draw, r
+    for d in data.markers[(data.markers > depth_from) & (data.markers <= depth_to)]:
+        yield _draw_marker, (d, START_Y + (d - depth_from) * scale_y)
+
+
+def profile_size(data, depth_from=0, depth_to=None, scale_y=SCALE_Y):
+    if depth_to is None: depth_to = max(MIN_DEPTH, data.max_depth)
+    return WIDTH, ((depth_to - depth_from) * scale_y) + 80, depth_to
+
+
+def render_profile(renderer_cls, data, depth_from=0, depth_to=None, scale_y=SCALE_Y):
+    # data: ProfileData (layers.py); optional nur ein Tiefenfenster [depth_from, depth_to]
+    width, total_height, depth_to = profile_size(data, depth_from, depth_to, scale_y)
+    out = renderer_cls(width, total_height, data.hatch_types())
+    for draw, r in profile_elements(data, depth_from, depth_to, scale_y):
+        draw(out, r)
+    return out.result()
+
+
+def generate_svg_string(df_geo, df_rohr, df_ring, meta):
+    return render_profile(SvgRenderer, ProfileData(df_geo, df_rohr, df_ring))
+
+
+def build_profile_drawing(df_geo, df_rohr, df_ring, meta):
+    return render_profile(DrawingRenderer, ProfileData(df_geo, df_rohr, df_ring))
+
+# ==============================================================================
+# SEITENWEISES PROFIL
+# ==============================================================================
+# Das Profil wird in maßstäbliche Tiefenfenster geschnitten (1:100 -> 1 m = 1 cm).
+# Jede Seite ist ein eigener Flowable, der seine Zeichnung erst in draw() erzeugt
+# und danach wieder verwirft; der Speicherbedarf hängt so nicht von der Tiefe ab.
+class ProfilePage(Flowable):
+    def __init__(self, data, depth_from, depth_to, scale_y, width):
+        Flowable.__init__(self)
+        self.data = data
+        self.depth_from = depth_from; self.depth_to = depth_to
+        self.scale_y = scale_y
+        self.factor = width / WIDTH
+        self.width = width
+        self.height = (((depth_to - depth_from) * scale_y) + 80) * self.factor
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        drawing = render_profile(DrawingRenderer, self.data, self.depth_from, self.depth_to, self.scale_y)
+        drawing.scale(self.factor, self.factor)
+        renderPDF.draw(drawing, self.canv, 0, 0)
+
+
+def profile_pages(df_geo, df_rohr, df_ring, massstab, width, avail_height):
+    factor = width / WIDTH
+    scale_y = (100.0 / massstab) * cm / factor
+    meters_per_page = max(1, int(((avail_height / factor) - 80) / scale_y))
+    data = ProfileData(df_geo, df_rohr, df_ring)
+    max_depth = max(MIN_DEPTH, data.max_depth)
+    pages = []
+    d = 0
+    while d < max_depth:
+        d_to = min(d + meters_per_page, max_depth)
+        pages.append(ProfilePage(data, d, d_to, scale_y, width))
+        if d_to < max_depth: pages.append(PageBreak())
+        d = d_to
+    return pages
@@ -0,0 +1,158 @@
+import json
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from .coords import sync_coordinates
+
+# ==============================================================================
+# PROJEKTDATEN (bohrprojekt.json)
+# ==============================================================================
+# Format der 💾-Datei: {"meta": {...}, "geo": [...], "rohr": [...], "ring": [...]}
+# Standardwerte der Stammdaten (Session-State-Schlüssel)
+DEFAULT_META = {
+    "projekt": "Notwasserbrunnen ZE079-905",
+    "ort": "Wiesenschlag ggü 4, 14129 Berlin",
+    "kreis": "Berlin",
+    "zweck": "Notbrunnen",
+    "art_bohrung": "Grundwasser",
+    "auftraggeber": "Berliner Wasserbetriebe",
+    "objekt": "Notbrunnen",
+    "bohrfirma": "Ackermann KG",
+    "geraetefuehrer": "C. Kempcke",
+    "datum": "06.10.25 - 08.10.25",
+    "bohrdurchmesser": 330,
+    "bohrverfahren": "Spülbohren",
+    "ansatzpunkt": 0.0,
+    "endteufe": 45.0,
+    "rechtswert": "378879.57",
+    "hochwert": "5810039.19",
+    "aktenzeichen": "V26645",
+    "ws_ruhe": 14.70,
+    "lat": 52.42751,
+    "lon": 13.1905
+}
+
+
+def load_project(path):
+    # bohrprojekt.json oder .bohrz (am ZIP-Kopf erkannt)
+    with open(path, "rb") as f:
+        if is_columnar(f.read(4)): return load_project_columnar(path)[:4]
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return project_from_dict(data)
+
+
+def project_from_dict(data):
+    # Fehlende lat/lon bzw. Rechts-/Hochwert aus dem jeweils anderen ergänzen
+    meta = dict(DEFAULT_META)
+    meta.update(sync_coordinates(data.get("meta", {})))
+    return meta, pd.DataFrame(data.get("geo", [])), pd.DataFrame(data.get("rohr", [])), pd.DataFrame(data.get("ring", []))
+
+
+def pdf_meta(meta, logo_bytes=None):
+    # Session-State-Schlüssel -> Schlüssel, die der PDF-Builder erwartet
+    return {"projekt": meta["projekt"], "ort": meta["ort"], "firma": meta["bohrfirma"], "auftraggeber": meta["auftraggeber"], "datum": meta["datum"], "aktenzeichen": meta["aktenzeichen"], "verfahren": meta["bohrverfahren"], "durchmesser": meta["bohrdurchmesser"], "ansatz": meta["ansatzpunkt"], "teufe": meta["endteufe"], "ws_ruhe": meta["ws_ruhe"], "kreis": meta["kreis"], "zweck": meta["zweck"], "art_bohrung": meta["art_bohrung"], "objekt": meta["objekt"], "geraetefuehrer": meta["geraetefuehrer"], "rechtswert": meta["rechtswert"], "hochwert": meta["hochwert"], "logo_bytes": logo_bytes}
+
+# ==============================================================================
+# KOMPAKTES FORMAT (.bohrz)
+# ==============================================================================
+# ZIP-Archiv mit spaltenweiser Ablage:
+#   schema.json            Formatkennung, Version, Tabellen mit Zeilenzahl und Spalten
+#   meta.json              Stammdaten (wie "meta" in bohrprojekt.json)
+#   logo.bin               Firmenlogo (optional)
+#   <tabelle>/<spalte>     f8/i8: Rohdaten little-endian; json: JSON-Liste der Werte
+# Spalten mit nur float- bzw. nur int-Werten werden binär abgelegt, alle anderen als
+# JSON-Liste. Fehlt ein Schlüssel in einzelnen Datensätzen, stehen die Zeilen unter
+# "absent"; die Umwandlung von und nach bohrprojekt.json ist dadurch verlustfrei.
+COLUMNAR_FORMAT = "bohrprojekt-columnar"
+COLUMNAR_VERSION = 1
+TABLES = ("geo", "rohr", "ring")
+_ZIP_MAGIC = b"PK\x03\x04"
+
+
+def _column_type(values):
+    if all(type(v) is float for v in values): return "f8"
+    if all(type(v) is int and -2**63 <= v < 2**63 for v in values): return "i8"
+    return "json"
+
+
+def _encode_table(records):
+    names = list(dict.fromkeys(k for r in records for k in r))
+    columns = []; blobs = {}
+    for name in names:
+        absent = [i for i, r in enumerate(records) if name not in r]
+        values = [r.get(name) for r in records]
+        type_ = "json" if absent else _column_type(values)
+        if type_ == "json": blob = json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        else: blob = np.asarray(values, dtype="<" + type_).tobytes()
+        col = {"name": name, "type": type_}
+        if absent: col["absent"] = absent
+        columns.append(col); blobs[name] = blob
+    return {"rows": len(records), "columns": columns}, blobs
+
+
+def _decode_column(col, blob):
+    if col["type"] == "json": return json.loads(blob.decode("utf-8"))
+    return np.frombuffer(blob, dtype="<" + col["type"])
+
+
+def save_project_columnar(data, out, logo_bytes=None):
+    # data: Projekt wie in bohrprojekt.json; out: Pfad oder binärer Stream
+    schema = {"format": COLUMNAR_FORMAT, "version": COLUMNAR_VERSION, "tables": {}}
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("meta.json", json.dumps(data.get("meta", {}), ensure_ascii=False))
+        for table in TABLES:
+            if table not in data: continue
+            schema["tables"][table], blobs = _encode_table(data[table])
+            for name, blob in blobs.items(): zf.writestr(f"{table}/{name}", blob)
+        if logo_bytes: zf.writestr("logo.bin", logo_bytes, compress_type=zipfile.ZIP_STORED)
+        zf.writestr("schema.json", json.dumps(schema, ensure_ascii=False))
+
+
+def _read_columnar(src):
+    zf = zipfile.ZipFile(src)
+    schema = json.loads(zf.read("schema.json"))
+    if schema.get("format") != COLUMNAR_FORMAT: raise ValueError("Keine .bohrz-Projektdatei")
+    if schema.get("version", 0) > COLUMNAR_VERSION: raise ValueError(f"Version {schema['version']} wird nicht unterstützt (max. {COLUMNAR_VERSION})")
+    return zf, schema
+
+
+def load_project_columnar(src):
+    # -> (meta, df_geo, df_rohr, df_ring, logo_bytes); Spalten direkt als Arrays
+    zf, schema = _read_columnar(src)
+    with zf:
+        meta = dict(DEFAULT_META); meta.update(sync_coordinates(json.loads(zf.read("meta.json"))))
+        frames = []
+        for table in TABLES:
+            spec = schema["tables"].get(table, {"rows": 0, "columns": []})
+            frames.append(pd.DataFrame({c["name"]: _decode_column(c, zf.read(f"{table}/{c['name']}")) for c in spec["columns"]}, index=range(spec["rows"])))
+        logo = zf.read("logo.bin") if "logo.bin" in zf.namelist() else None
+    return (meta, *frames, logo)
+
+
+def columnar_to_dict(src):
+    # .bohrz -> Inhalt von bohrprojekt.json (ohne Logo)
+    zf, schema = _read_columnar(src)
+    with zf:
+        data = {"meta": json.loads(zf.read("meta.json"))}
+        for table, spec in schema["tables"].items():
+            records = [{} for _ in range(spec["rows"])]
+            for col in spec["columns"]:
+                values = _decode_column(col, zf.read(f"{table}/{col['name']}"))
+                if col["type"] != "json": values = values.tolist()
+                absent = set(col.get("absent", ()))
+                for i, (r, v) in enumerate(zip(records, values)):
+                    if i not in absent: r[col["name"]] = v
+            data[table] = records
+    return data
+
+
+def columnar_logo(src):
+    zf, _ = _read_columnar(src)
+    with zf: return zf.read("logo.bin") if "logo.bin" in zf.namelist() else None
+
+
+def is_columnar(head):
+    return head[:4] == _ZIP_MAGIC
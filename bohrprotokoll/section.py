@@ -0,0 +1,256 @@
+import math
+
+import numpy as np
+import pandas as pd
+from reportlab.graphics import renderPDF
+from reportlab.lib.pagesizes import A3, landscape
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+
+from .coords import sync_coordinates, valid_latlon
+from .hatching import SOIL_COLORS
+from .layers import SOIL_TYPES, classify_layers
+from .profile import DrawingRenderer, SvgRenderer
+
+# ==============================================================================
+# GEOLOGISCHER SCHNITT ÜBER MEHRERE BOHRUNGEN
+# ==============================================================================
+# Die Bohrungen werden auf eine Schnittlinie (Polylinie aus lat/lon) projiziert und
+# nach Stationierung nebeneinander gezeichnet, Höhen in m NN (Ansatzpunkt - Tiefe).
+# Benachbarte Säulen werden über gleiche Bodenarten verbunden (Einheiten = Folgen
+# gleicher Bodenart, Zuordnung über die längste gemeinsame Teilfolge -> keine
+# Überkreuzungen). Detailstufe: Schraffur, Schichtgrenzen und Legende nur ab
+# LOD_SCALE_Y Pixel je Meter; darunter nur Flächenfarben je Einheit.
+SCALE_Y = 6
+WIDTH = 1400
+LOD_SCALE_Y = 5
+MARGIN_LEFT = 70; MARGIN_RIGHT = 30; MARGIN_TOP = 60; MARGIN_BOTTOM = 40
+COL_W = 24; COL_W_SIMPLE = 10; COL_GAP = 6
+LABEL_SPACING = 60
+LEGEND_H = 30
+_M_PER_DEG_LAT = 110574.0
+
+
+class SectionWell:
+    # bottom/soil: Unterkanten und Bodenarten der Schichten von oben nach unten
+    def __init__(self, name, lat, lon, ansatz, bottom, soil):
+        self.name = str(name); self.lat = float(lat); self.lon = float(lon); self.ansatz = float(ansatz or 0)
+        bottom = np.asarray(bottom, float); soil = np.asarray(soil, dtype=object)
+        valid = ~np.isnan(bottom)
+        self.bottom = bottom[valid]; self.soil = soil[valid]
+        self.top = np.concatenate([[0.0], self.bottom])[:-1]
+        # Einheiten: aufeinanderfolgende Schichten gleicher Bodenart
+        starts = np.flatnonzero(np.r_[True, self.soil[1:] != self.soil[:-1]]) if len(self.soil) else np.zeros(0, int)
+        ends = np.r_[starts[1:], len(self.soil)] - 1
+        self.unit_top = self.top[starts]; self.unit_bottom = self.bottom[ends]; self.unit_soil = self.soil[starts]
+
+    @property
+    def depth(self):
+        return float(self.bottom.max()) if len(self.bottom) else 0.0
+
+
+def wells_from_projects(projects):
+    # projects: Inhalte wie bohrprojekt.json (Datei, .bohrz, Archiv); alle Schichten
+    # werden in einem Durchgang klassifiziert statt je Bohrung. Bohrungen ohne gültige
+    # Lage (auch nicht aus Rechts-/Hochwert) werden ausgelassen.
+    geo = [pd.DataFrame(p.get("geo", [])) for p in projects]
+    sizes = np.array([len(g) for g in geo])
+    df = pd.concat(geo, ignore_index=True) if sizes.sum() else pd.DataFrame()
+    bottom = pd.to_numeric(df["Bis_m"], errors="coerce").to_numpy(float) if "Bis_m" in df else np.full(len(df), np.nan)
+    soil = np.asarray(classify_layers(df), dtype=object)
+    wells = []
+    for p, lo, hi in zip(projects, np.r_[0, np.cumsum(sizes)[:-1]], np.cumsum(sizes)):
+        meta = sync_coordinates(p.get("meta", {}))
+        latlon = valid_latlon(meta.get("lat"), meta.get("lon"))
+        if latlon is None: continue
+        wells.append(SectionWell(meta.get("aktenzeichen") or meta.get("projekt") or "?", *latlon, meta.get("ansatzpunkt", 0), bottom[lo:hi], soil[lo:hi]))
+    return wells
+
+# ==============================================================================
+# PROJEKTION AUF DIE SCHNITTLINIE
+# ==============================================================================
+# Lokale ebene Näherung (Meter) um die mittlere Breite; für Schnitte über einige
+# Kilometer genau genug.
+def _local_xy(latlon, lat0):
+    latlon = np.asarray(latlon, float).reshape(-1, 2)
+    return np.column_stack([latlon[:, 1] * _M_PER_DEG_LAT * math.cos(math.radians(lat0)), latlon[:, 0] * _M_PER_DEG_LAT])
+
+
+def check_line(line):
+    # Jeder Punkt genau ein gültiges lat,lon-Paar -> [(lat, lon), ...]
+    pts = []
+    for k, p in enumerate(line, 1):
+        latlon = valid_latlon(*p) if len(p) == 2 else None
+        if latlon is None: raise ValueError(f"Punkt {k} der Schnittlinie ist kein gültiges Paar lat,lon")
+        pts.append(latlon)
+    if len(pts) < 2: raise ValueError("Schnittlinie braucht mindestens zwei Punkte")
+    return pts
+
+
+def parse_line(text):
+    # "lat,lon; lat,lon; ..." -> [(lat, lon), ...]
+    return check_line([p.split(",") for p in text.split(";")])
+
+
+def project_onto_line(points, line):
+    # points, line: [(lat, lon), ...] -> (Stationierung, Abstand zur Linie) in Metern
+    line = np.asarray(check_line(line), float)
+    lat0 = line[:, 0].mean()
+    p = _local_xy(points, lat0); q = _local_xy(line, lat0)
+    a = q[:-1]; d = q[1:] - a
+    seg_len2 = (d ** 2).sum(axis=1)
+    t = ((p[:, None, :] - a[None]) * d[None]).sum(axis=2) / np.where(seg_len2 > 0, seg_len2, 1)
+    t = np.clip(t, 0, 1)
+    dist = np.hypot(*np.moveaxis(p[:, None, :] - (a[None] + t[..., None] * d[None]), 2, 0))
+    seg = dist.argmin(axis=1); rows = np.arange(len(p))
+    seg_len = np.sqrt(seg_len2)
+    chainage = np.r_[0, np.cumsum(seg_len)][seg] + t[rows, seg] * seg_len[seg]
+    return chainage, dist[rows, seg]
+
+
+def default_line(wells):
+    # Hauptachse der Bohrpunkte (Ausgleichsgerade), begrenzt auf die äußersten Projektionen
+    pts = np.array([(w.lat, w.lon) for w in wells], float).reshape(-1, 2)
+    if len(pts) < 2: raise ValueError("Für einen Schnitt werden mindestens zwei Bohrungen benötigt")
+    lat0 = pts[:, 0].mean(); xy = _local_xy(pts, lat0); c = xy.mean(axis=0)
+    axis = np.linalg.svd(xy - c, full_matrices=False)[2][0]
+    s = (xy - c) @ axis
+    ends = c + np.outer([s.min(), s.max()], axis)
+    return [(float(y / _M_PER_DEG_LAT), float(x / (_M_PER_DEG_LAT * math.cos(math.radians(lat0))))) for x, y in ends]
+
+
+def _match_units(a, b):
+    # Längste gemeinsame Teilfolge der Bodenarten -> Paare (i, j), monoton steigend
+    n, m = len(a), len(b)
+    L = np.zeros((n + 1, m + 1), int)
+    for i in range(n - 1, -1, -1):
+        for j in range(m - 1, -1, -1):
+            L[i, j] = L[i + 1, j + 1] + 1 if a[i] == b[j] else max(L[i + 1, j], L[i, j + 1])
+    pairs, i, j = [], 0, 0
+    while i < n and j < m:
+        if a[i] == b[j]: pairs.append((i, j)); i += 1; j += 1
+        elif L[i + 1, j] >= L[i, j + 1]: i += 1
+        else: j += 1
+    return pairs
+
+# ==============================================================================
+# LAYOUT + ZEICHNEN
+# ==============================================================================
+class SectionLayout:
+    def __init__(self, wells, line=None, scale_y=SCALE_Y, width=WIDTH, max_offset=None, detail=None):
+        if line is None: line = default_line(wells)
+        chainage, offset = project_onto_line([(w.lat, w.lon) for w in wells], line)
+        keep = np.ones(len(wells), bool) if max_offset is None else offset <= max_offset
+        order = np.flatnonzero(keep)[np.argsort(chainage[keep], kind="stable")]
+        self.wells = [wells[i] for i in order]; self.chainage = chainage[order]; self.offset = offset[order]
+        self.line = line; self.scale_y = scale_y
+        self.detail = scale_y >= LOD_SCALE_Y if detail is None else detail
+        self.col_w = COL_W if self.detail else COL_W_SIMPLE
+        # Waagerecht maßstäblich, aber mindestens eine Säulenbreite Abstand
+        n = len(self.wells); step = self.col_w + COL_GAP
+        span = float(self.chainage[-1] - self.chainage[0]) if n else 0.0
+        scale_x = (width - MARGIN_LEFT - MARGIN_RIGHT - self.col_w) / span if span > 0 else 0.0
+        i = np.arange(n)
+        x = MARGIN_LEFT + (self.chainage - (self.chainage[0] if n else 0)) * scale_x
+        self.x = np.maximum.accumulate(x - i * step) + i * step if n else x
+        self.nn = any(w.ansatz for w in self.wells)
+        self.elev_top = max((w.ansatz for w in self.wells), default=0.0)
+        self.elev_bottom = min((w.ansatz - w.depth for w in self.wells), default=0.0)
+        self.width = (float(self.x[-1]) + self.col_w + MARGIN_RIGHT) if n else width
+        self.height = MARGIN_TOP + (self.elev_top - self.elev_bottom) * scale_y + MARGIN_BOTTOM + (LEGEND_H if self.detail else 0)
+
+    def y_of(self, elev):
+        return MARGIN_TOP + (self.elev_top - elev) * self.scale_y
+
+    def soils(self):
+        return sorted({s for w in self.wells for s in w.unit_soil}, key=SOIL_TYPES.index)
+
+
+def _draw_axis(out, lay):
+    unit = "m NN" if lay.nn else "m u. GOK"
+    out.text(MARGIN_LEFT - 35, MARGIN_TOP - 25, unit, anchor="middle", bold=True, size=9)
+    x = MARGIN_LEFT - 15
+    out.line(x, lay.y_of(lay.elev_top), x, lay.y_of(lay.elev_bottom))
+    step = next((s for s in (1, 2, 5, 10, 20, 50, 100, 200) if s * lay.scale_y >= 25), 500)
+    for e in range(math.ceil(lay.elev_bottom / step) * step, math.floor(lay.elev_top / step) * step + 1, step):
+        y = lay.y_of(e)
+        out.line(x - 4, y, x, y)
+        out.text(x - 6, y + 3, e if lay.nn else -e, anchor="end", size=8)
+
+
+def _draw_correlation(out, lay):
+    # Verbindungsflächen zwischen gleichen Bodenarten benachbarter Bohrungen
+    for k in range(len(lay.wells) - 1):
+        a, b = lay.wells[k], lay.wells[k + 1]
+        xa = lay.x[k] + lay.col_w; xb = lay.x[k + 1]
+        for i, j in _match_units(list(a.unit_soil), list(b.unit_soil)):
+            pts = [(xa, lay.y_of(a.ansatz - a.unit_top[i])), (xb, lay.y_of(b.ansatz - b.unit_top[j])), (xb, lay.y_of(b.ansatz - b.unit_bottom[j])), (xa, lay.y_of(a.ansatz - a.unit_bottom[i]))]
+            out.polygon(pts, fill=SOIL_COLORS[a.unit_soil[i]], stroke="#888" if lay.detail else None, opacity=0.5)
+
+
+def _draw_column(out, lay, k):
+    w = lay.wells[k]; x = lay.x[k]
+    if lay.detail:
+        for top, bottom, soil in zip(w.top, w.bottom, w.soil):
+            y = lay.y_of(w.ansatz - top); h = (bottom - top) * lay.scale_y
+            out.rect(x, y, lay.col_w, h, fill=SOIL_COLORS[soil], stroke="black", stroke_width=0.5)
+            out.hatch(soil, x, y, lay.col_w, h)
+    else:
+        for top, bottom, soil in zip(w.unit_top, w.unit_bottom, w.unit_soil):
+            out.rect(x, lay.y_of(w.ansatz - top), lay.col_w, (bottom - top) * lay.scale_y, fill=SOIL_COLORS[soil])
+        out.rect(x, lay.y_of(w.ansatz), lay.col_w, w.depth * lay.scale_y, stroke="black", stroke_width=0.5)
+
+
+def _draw_labels(out, lay):
+    # Name und Stationierung; bei enger Folge nur jede so-und-so-vielte Bohrung
+    last = -math.inf
+    for k, w in enumerate(lay.wells):
+        xc = lay.x[k] + lay.col_w / 2
+        out.line(xc, lay.y_of(w.ansatz) - 4, xc, lay.y_of(w.ansatz), stroke_width=0.5)
+        if xc - last < LABEL_SPACING: continue
+        last = xc
+        out.text(xc, lay.y_of(w.ansatz) - 18, w.name, anchor="middle", size=8, bold=True)
+        out.text(xc, lay.y_of(w.ansatz) - 8, f"{lay.chainage[k]:.0f} m", anchor="middle", size=7)
+
+
+def _draw_legend(out, lay):
+    y = lay.height - LEGEND_H + 5; x = MARGIN_LEFT
+    for soil in lay.soils():
+        out.rect(x, y, 14, 10, fill=SOIL_COLORS[soil], stroke="black", stroke_width=0.5)
+        out.hatch(soil, x, y, 14, 10)
+        out.text(x + 18, y + 9, soil.capitalize(), size=8)
+        x += 95
+
+
+def render_section(renderer_cls, lay):
+    out = renderer_cls(lay.width, lay.height, lay.soils() if lay.detail else ())
+    _draw_axis(out, lay)
+    _draw_correlation(out, lay)
+    for k in range(len(lay.wells)): _draw_column(out, lay, k)
+    _draw_labels(out, lay)
+    if lay.detail: _draw_legend(out, lay)
+    return out.result()
+
+
+def section_svg(wells, line=None, scale_y=SCALE_Y, width=WIDTH, max_offset=None, detail=None):
+    return render_section(SvgRenderer, SectionLayout(wells, line, scale_y, width, max_offset, detail))
+
+# ==============================================================================
+# PDF-SEITE
+# ==============================================================================
+# Eine Seite A3 quer; der Schnitt wird eingepasst. Die Detailstufe richtet sich
+# nach dem Maßstab nach dem Einpassen.
+def write_section_pdf(out, wells, line=None, title="Geologischer Schnitt", scale_y=SCALE_Y, max_offset=None):
+    page_w, page_h = landscape(A3)
+    avail_w = page_w - 3*cm; avail_h = page_h - 4*cm
+    lay = SectionLayout(wells, line, scale_y, WIDTH, max_offset)
+    factor = min(avail_w / lay.width, avail_h / lay.height)
+    lay = SectionLayout(wells, line, scale_y, WIDTH, max_offset, detail=scale_y * factor >= LOD_SCALE_Y)
+    factor = min(avail_w / lay.width, avail_h / lay.height)
+    drawing = render_section(DrawingRenderer, lay)
+    drawing.scale(factor, factor)
+    c = canvas.Canvas(out, pagesize=(page_w, page_h))
+    c.setFont("Helvetica-Bold", 14); c.drawString(1.5*cm, page_h - 1.5*cm, title)
+    c.setFont("Helvetica", 9); c.drawString(1.5*cm, page_h - 2.1*cm, f"{len(lay.wells)} Bohrungen, Schnittlänge {float(lay.chainage[-1] - lay.chainage[0]) if len(lay.wells) else 0:.0f} m")
+    renderPDF.draw(drawing, c, 1.5*cm, page_h - 2.5*cm - lay.height * factor)
+    c.showPage(); c.save()
@@ -0,0 +1,186 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+try:
+    # Online-Kacheln nur über staticmap (bringt requests mit); ohne beides keine Karte
+    import requests
+    from staticmap import StaticMap
+    HAS_STATICMAP = True
+except ImportError:
+    HAS_STATICMAP = False
+
+# ==============================================================================
+# KARTENKACHELN: QUELLEN
+# ==============================================================================
+# Unterstützte Vorlagen:
+#   http(s)://a.tile.openstreetmap.org/{z}/{x}/{y}.png   (online, mit Cache)
+#   file:///pfad/zu/kacheln/{z}/{x}/{y}.png               (lokales Verzeichnis)
+#   mbtiles:///pfad/zu/karte.mbtiles                      (MBTiles-Datei)
+# Überschreibbar über die Umgebungsvariable BOHR_TILE_URL.
+DEFAULT_TILE_URL = "http://a.tile.openstreetmap.org/{z}/{x}/{y}.png"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "bohrprotokoll", "tiles")
+DEFAULT_CACHE_BYTES = 200 * 1024 * 1024
+DEFAULT_CACHE_TTL = 30 * 24 * 3600
+
+
+def tile_url_template(url_template=None):
+    url_template = url_template or os.environ.get("BOHR_TILE_URL") or DEFAULT_TILE_URL
+    # MBTiles hat keine Platzhalter im Pfad; z/x/y werden als Fragment angehängt
+    if url_template.startswith("mbtiles://") and "{z}" not in url_template:
+        url_template += "#{z}/{x}/{y}"
+    return url_template
+
+
+def is_local_source(url):
+    return url.startswith("file://") or url.startswith("mbtiles://")
+
+
+def _read_mbtiles(url):
+    parsed = urlparse(url)
+    z, x, y = (int(v) for v in parsed.fragment.split("/"))
+    con = sqlite3.connect(f"file:{url2pathname(parsed.path)}?mode=ro", uri=True)
+    try:
+        # MBTiles speichert die Zeilen im TMS-Schema (y von unten)
+        row = con.execute("SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?", (z, x, (1 << z) - 1 - y)).fetchone()
+    finally:
+        con.close()
+    return (200, bytes(row[0])) if row else (404, b"")
+
+
+def fetch_tile(url, timeout=None, headers=None):
+    if url.startswith("file://"):
+        path = url2pathname(urlparse(url).path)
+        if not os.path.isfile(path): return 404, b""
+        with open(path, "rb") as f: return 200, f.read()
+    if url.startswith("mbtiles://"):
+        return _read_mbtiles(url)
+    res = requests.get(url, timeout=timeout, headers=headers)
+    return res.status_code, res.content
+
+# ==============================================================================
+# KARTENKACHELN: CACHE
+# ==============================================================================
+# Eine Datei pro Kachel. mtime = Zeitpunkt des Downloads (für die TTL),
+# atime = letzter Zugriff (für die LRU-Verdrängung, explizit per os.utime gesetzt).
+class TileCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_BYTES, ttl=DEFAULT_CACHE_TTL):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0; self.misses = 0; self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(st.st_size for _, st in self._entries())
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".tile")
+
+    def get(self, url):
+        path = self._path(url)
+        try:
+            st = os.stat(path)
+            if self.ttl is not None and time.time() - st.st_mtime > self.ttl:
+                raise FileNotFoundError(path)
+            with open(path, "rb") as f: data = f.read()
+            os.utime(path, (time.time(), st.st_mtime))
+        except OSError:
+            with self._lock: self.misses += 1
+            return None
+        with self._lock: self.hits += 1
+        return data
+
+    def get_stale(self, url):
+        # Abgelaufene Kachel als Notlösung, wenn die Quelle nicht erreichbar ist
+        try:
+            with open(self._path(url), "rb") as f: return f.read()
+        except OSError:
+            return None
+
+    def put(self, url, data):
+        path = self._path(url)
+        # Eigene Temp-Datei je Schreibvorgang: mehrere Prozesse (Stapellauf) teilen das Verzeichnis
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f: f.write(data)
+        except BaseException:
+            os.remove(tmp); raise
+        with self._lock:
+            try: old = os.path.getsize(path)
+            except OSError: old = 0
+            os.replace(tmp, path)
+            self._size += len(data) - old
+            if self._size > self.max_bytes: self._evict()
+
+    def _entries(self):
+        # (Pfad, stat) aller Kacheln; was ein anderer Prozess gerade entfernt, fällt heraus
+        for e in os.scandir(self.directory):
+            if not e.name.endswith(".tile"): continue
+            try: yield e.path, e.stat()
+            except OSError: continue
+
+    def _evict(self):
+        for path, st in sorted(self._entries(), key=lambda entry: entry[1].st_atime):
+            if self._size <= self.max_bytes: break
+            try: os.remove(path)
+            except OSError: continue
+            self._size -= st.st_size; self.evictions += 1
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "bytes": self._size}
+
+
+_default_cache = None
+
+
+def get_tile_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = TileCache(os.environ.get("BOHR_TILE_CACHE", DEFAULT_CACHE_DIR))
+    return _default_cache
+
+
+def get_tile(url, cache=None, timeout=None, headers=None):
+    # Lokale Quellen direkt lesen, Online-Kacheln über den Cache
+    if is_local_source(url) or cache is None:
+        return fetch_tile(url, timeout, headers)
+    data = cache.get(url)
+    if data is not None: return 200, data
+    try:
+        status, data = fetch_tile(url, timeout, headers)
+    except requests.RequestException:
+        status, data = None, None
+    if status == 200 and data:
+        # Cache nicht beschreibbar: Kachel trotzdem liefern
+        try: cache.put(url, data)
+        except OSError: pass
+        return status, data
+    stale = cache.get_stale(url)
+    if stale is not None: return 200, stale
+    return status, data
+
+
+if HAS_STATICMAP:
+    class CachedStaticMap(StaticMap):
+        # StaticMap lädt jede Kachel über get(); hier über Cache bzw. lokale Quelle
+        def __init__(self, *args, tile_cache=None, **kwargs):
+            StaticMap.__init__(self, *args, **kwargs)
+            self.tile_cache = tile_cache
+
+        def get(self, url, **kwargs):
+            status, data = get_tile(url, self.tile_cache, **kwargs)
+            # Lücken in Offline-Quellen leer lassen statt die ganze Karte abzubrechen
+            if status == 404 and is_local_source(url): return 200, _blank_tile(self.tile_size)
+            return status, data
+
+    def _blank_tile(size):
+        from io import BytesIO
+        from PIL import Image
+        buf = BytesIO()
+        Image.new("RGBA", (size, size), (0, 0, 0, 0)).save(buf, format="PNG")
+        return buf.getvalue()
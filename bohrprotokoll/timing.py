@@ -0,0 +1,87 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger(__name__)
+
+# ==============================================================================
+# STUFENZEITEN (OPT-IN)
+# ==============================================================================
+# Misst je erzeugtem Bohrprotokoll die Dauer der einzelnen Stufen (Profil, Karte,
+# Schichtenverzeichnis, doc.build) und die Größe der Ausgaben. Eingeschaltet über
+# BOHR_TIMING:
+#   BOHR_TIMING=1                  -> eine Logzeile je PDF (Logger bohrprotokoll.timing, INFO)
+#   BOHR_TIMING=/pfad/zeiten.jsonl -> zusätzlich als JSON-Zeile an die Datei angehängt
+# Ohne BOHR_TIMING liefert new_timer() NULL_TIMER, der nichts misst.
+class StageTimer:
+    def __init__(self):
+        self.stages = {}; self.sizes = {}; self.info = {}
+        self.started = time.time()
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try: yield
+        finally: self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - t0
+
+    def size(self, name, nbytes):
+        if nbytes is not None: self.sizes[name] = int(nbytes)
+
+    def record(self):
+        return {"zeit": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)), **self.info,
+                "stufen_ms": {k: round(v * 1000, 1) for k, v in self.stages.items()}, "groessen": dict(self.sizes)}
+
+
+class _NullTimer:
+    def stage(self, name):
+        return nullcontext()
+
+    def size(self, name, nbytes):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+_write_lock = threading.Lock()
+
+
+def timing_target():
+    return os.environ.get("BOHR_TIMING", "").strip()
+
+
+def _enable_logging():
+    # Eingeschaltet soll die Zeile auch ohne eigene Logging-Konfiguration erscheinen
+    if logger.handlers: return
+    handler = logging.StreamHandler(); handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    logger.addHandler(handler); logger.setLevel(logging.INFO); logger.propagate = False
+
+
+def new_timer():
+    if timing_target() in ("", "0"): return NULL_TIMER
+    _enable_logging()
+    return StageTimer()
+
+
+def output_size(out):
+    # Pfad oder (noch offener) binärer Stream nach dem Schreiben
+    if isinstance(out, (str, os.PathLike)): return os.path.getsize(out)
+    try: return out.tell()
+    except (AttributeError, OSError): return None
+
+
+def report(timer, **info):
+    # -> Datensatz (dict) oder None, wenn nicht gemessen wurde
+    if not isinstance(timer, StageTimer): return None
+    timer.info.update(info)
+    rec = timer.record()
+    line = json.dumps(rec, ensure_ascii=False, default=str)
+    logger.info("Bohrprotokoll %s", line)
+    target = timing_target()
+    if target not in ("0", "1"):
+        try:
+            with _write_lock, open(target, "a", encoding="utf-8") as f: f.write(line + "\n")
+        except OSError as e:
+            logger.warning("Stufenzeiten konnten nicht geschrieben werden: %s", e)
+    return rec
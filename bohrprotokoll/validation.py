@@ -0,0 +1,146 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from .project import TABLES
+
+# ==============================================================================
+# PRÜFUNG DER TIEFENANGABEN (SCHICHTEN, AUSBAU, RINGRAUM)
+# ==============================================================================
+# Alle Intervalle aller drei Tabellen (im Stapel: aller Projekte) liegen in einem
+# Satz Arrays, werden einmal nach (Projekt, Tabelle, Von) sortiert und dann mit
+# Nachbarvergleichen geprüft: O(n log n), ohne Schleife je Zeile. Schichten haben
+# nur Bis_m; ihr Von ist das Bis der Zeile darüber, sie bleiben daher in
+# Zeilenreihenfolge und Bis_m muss streng steigen.
+# Ergebnis ist eine Tabelle (ISSUE_COLUMNS) mit Zeile (ab 0) und Spalte je Befund;
+# FEHLER verhindern das Rendern, HINWEISE werden nur angezeigt.
+TABLE_LABELS = {"geo": "Schichtenverzeichnis", "rohr": "Ausbau", "ring": "Ringraum"}
+FEHLER, HINWEIS = "fehler", "hinweis"
+ISSUE_COLUMNS = ["projekt", "tabelle", "zeile", "spalte", "schwere", "meldung"]
+EPS = 1e-6
+
+
+class ValidationError(ValueError):
+    def __init__(self, issues):
+        self.issues = issues
+        errors = issues[issues["schwere"] == FEHLER]
+        super().__init__(f"{len(errors)} Fehler in den Tiefenangaben: " + "; ".join(describe(errors.head(3))) + (" ..." if len(errors) > 3 else ""))
+
+
+def _num(df, col):
+    if df is None or col not in df: return np.full(0 if df is None else len(df), np.nan)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(float)
+
+
+def _found(mask, keys, spalte, schwere, text, **values):
+    # Befunde für alle Zeilen mit mask; text wird je Zeile mit values formatiert
+    idx = np.flatnonzero(mask)
+    if not len(idx): return None
+    project, table, pos = keys
+    values = {k: v[idx] for k, v in values.items()}
+    meldung = [text.format(**{k: v[i] for k, v in values.items()}) for i in range(len(idx))]
+    return pd.DataFrame({"projekt": project[idx], "tabelle": np.asarray(TABLES, dtype=object)[table[idx]], "zeile": pos[idx],
+                         "spalte": np.broadcast_to(np.asarray(spalte, dtype=object), mask.shape)[idx], "schwere": schwere, "meldung": meldung})
+
+
+def check_intervals(project, table, pos, top, bottom, endteufe):
+    # Gleich lange Arrays je Zeile; table: Index in TABLES; top bei "geo" ohne Bedeutung;
+    # endteufe je Zeile (NaN/0 = unbekannt) -> DataFrame mit ISSUE_COLUMNS
+    project, table, pos = (np.asarray(a, np.int64) for a in (project, table, pos))
+    top, bottom, endteufe = (np.asarray(a, float) for a in (top, bottom, endteufe))
+    geo = table == 0
+    found = [_found(np.isnan(bottom), (project, table, pos), np.where(geo, "Bis_m", "Bis"), FEHLER, "Bis fehlt oder ist keine Zahl"),
+             _found(~geo & np.isnan(top), (project, table, pos), "Von", FEHLER, "Von fehlt oder ist keine Zahl")]
+
+    # Unvollständige Zeilen nehmen an den Nachbarvergleichen nicht teil
+    keep = ~np.isnan(bottom) & (geo | ~np.isnan(top))
+    project, table, pos, top, bottom, endteufe, geo = (a[keep] for a in (project, table, pos, top, bottom, endteufe, geo))
+    order = np.lexsort((pos, np.where(geo, pos, top), table, project))
+    project, table, pos, top, bottom, endteufe, geo = (a[order] for a in (project, table, pos, top, bottom, endteufe, geo))
+    keys = (project, table, pos)
+    first = np.ones(len(bottom), bool); first[1:] = (project[1:] != project[:-1]) | (table[1:] != table[:-1])
+    last = np.ones(len(bottom), bool); last[:-1] = first[1:]
+    # Tiefstes Ende aller vorigen Intervalle der Gruppe (Schichten: ab 0 m)
+    reach = pd.Series(bottom).groupby(np.cumsum(first)).cummax().to_numpy()
+    prev = np.where(first, np.where(geo, 0.0, np.nan), np.r_[np.nan, reach[:-1]])
+    top = np.where(geo, prev, top)
+    known = endteufe > 0
+
+    found += [
+        _found(geo & (bottom <= top + EPS), keys, "Bis_m", FEHLER, "Bis {b:.2f} m muss tiefer liegen als die Schicht darüber ({t:.2f} m)", b=bottom, t=top),
+        _found(~geo & (bottom <= top + EPS), keys, "Bis", FEHLER, "Bis ({b:.2f} m) muss tiefer liegen als Von ({t:.2f} m)", b=bottom, t=top),
+        _found(~geo & ~first & (top < prev - EPS), keys, "Von", FEHLER, "Überlappung: beginnt bei {t:.2f} m, das Intervall darüber reicht bis {p:.2f} m", t=top, p=prev),
+        _found(~geo & ~first & (top > prev + EPS), keys, "Von", FEHLER, "Lücke zwischen {p:.2f} und {t:.2f} m", t=top, p=prev),
+        _found(~geo & first & (top > EPS), keys, "Von", HINWEIS, "beginnt erst bei {t:.2f} m", t=top),
+        _found((table == TABLES.index("ring")) & (top < -EPS), keys, "Von", FEHLER, "Ringraum über Geländeoberkante (Von {t:.2f} m)", t=top),
+        _found(known & (bottom > endteufe + EPS), keys, np.where(geo, "Bis_m", "Bis"), FEHLER, "{b:.2f} m liegt unter der Endteufe ({e:.2f} m)", b=bottom, e=endteufe),
+        _found(geo & last & known & (reach < endteufe - EPS), keys, "Bis_m", HINWEIS, "Schichtenverzeichnis endet bei {b:.2f} m, Endteufe {e:.2f} m", b=reach, e=endteufe),
+    ]
+    found = [f for f in found if f is not None]
+    if not found: return pd.DataFrame(columns=ISSUE_COLUMNS)
+    issues = pd.concat(found, ignore_index=True)
+    order = np.lexsort((issues["zeile"], issues["tabelle"].map(TABLES.index), issues["projekt"]))
+    return issues.iloc[order].reset_index(drop=True)
+
+
+def validate_project(df_geo, df_rohr, df_ring, endteufe=None):
+    # Ein Projekt (Tabellen wie im Editor / in bohrprojekt.json)
+    sizes = [0 if df is None else len(df) for df in (df_geo, df_rohr, df_ring)]
+    n = sum(sizes)
+    try: endteufe = float(endteufe)
+    except (TypeError, ValueError): endteufe = np.nan
+    return check_intervals(np.zeros(n), np.repeat(np.arange(3), sizes), np.concatenate([np.arange(k) for k in sizes]),
+                           np.concatenate([np.full(sizes[0], np.nan), _num(df_rohr, "Von"), _num(df_ring, "Von")]),
+                           np.concatenate([_num(df_geo, "Bis_m"), _num(df_rohr, "Bis"), _num(df_ring, "Bis")]), np.full(n, endteufe))
+
+
+def validate_archive(archive):
+    # Alle Projekte des Archivs in einem Durchgang; "projekt" = Archiv-ID
+    iv = archive.intervals()
+    return check_intervals(iv["project_id"], iv["tabelle"].map(TABLES.index), iv["pos"], iv["von"], iv["bis"], iv["endteufe"])
+
+
+def require_valid(df_geo, df_rohr, df_ring, endteufe=None):
+    # Vor dem Rendern: wirft ValidationError bei Fehlern, gibt sonst die Hinweise zurück
+    issues = validate_project(df_geo, df_rohr, df_ring, endteufe)
+    if has_errors(issues): raise ValidationError(issues)
+    return issues
+
+
+def has_errors(issues):
+    return bool((issues["schwere"] == FEHLER).any())
+
+
+def describe(issues):
+    # -> Texte wie "Ausbau Zeile 2: Lücke zwischen 40.00 und 41.00 m" (Zeilen ab 1)
+    return [f"{TABLE_LABELS[t]} Zeile {z + 1}: {m}" for t, z, m in zip(issues["tabelle"], issues["zeile"], issues["meldung"])]
+
+# ==============================================================================
+# ARCHIV PRÜFEN (Kommandozeile)
+# ==============================================================================
+def main(argv=None):
+    from .archive import DEFAULT_ARCHIVE_PATH, ProjectArchive
+    parser = argparse.ArgumentParser(description="Tiefenangaben aller Projekte im Archiv prüfen")
+    parser.add_argument("--db", default=os.environ.get("BOHR_ARCHIVE", DEFAULT_ARCHIVE_PATH), help="Archivdatei (SQLite)")
+    parser.add_argument("--hinweise", action="store_true", help="Auch Hinweise ausgeben")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    archive = ProjectArchive(args.db)
+    issues = validate_archive(archive)
+    if not args.hinweise: issues = issues[issues["schwere"] == FEHLER]
+    sources = archive.sources(issues["projekt"].unique().tolist())
+    for (pid, group) in issues.groupby("projekt", sort=False):
+        for text, schwere in zip(describe(group), group["schwere"]):
+            print(f"{'FEHLER' if schwere == FEHLER else 'HINWEIS':<8}{sources.get(pid, pid)}: {text}")
+    n_bad = issues.loc[issues["schwere"] == FEHLER, "projekt"].nunique()
+    print(f"{archive.stats()['projects']} Projekte geprüft in {time.perf_counter() - t0:.1f}s, {n_bad} mit Fehlern")
+    return 1 if n_bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import json
+import math
+
+import folium
+import numpy as np
+import pandas as pd
+
+from .artifacts import content_key, get_artifact_cache
+
+# ==============================================================================
+# KARTENEBENE: ALLE BOHRUNGEN DES ARCHIVS
+# ==============================================================================
+# Geladen wird nur der sichtbare Ausschnitt, aufgerundet auf ein Raster von etwa
+# vier Kachelbreiten je Zoomstufe; kleine Verschiebungen treffen so denselben
+# Cache-Eintrag. Gebündelt wird auf dem Server (Rasterzellen von CLUSTER_PX Pixeln),
+# an den Browser gehen nur die Zellen des Ausschnitts, nie das ganze Archiv.
+# Die Ebene wird als FeatureGroup an st_folium übergeben (feature_group_to_add);
+# die Grundkarte bleibt dabei unverändert und wird nicht neu gesendet.
+CLUSTER_PX = 48
+WINDOW_PX = 1024
+SINGLE_ZOOM = 17
+
+
+def _deg_per_px(zoom):
+    return 360.0 / (256 * 2 ** zoom)
+
+
+def load_window(bounds, zoom):
+    # bounds = (lat_min, lon_min, lat_max, lon_max) -> nach außen auf das Raster gerundet
+    step = WINDOW_PX * _deg_per_px(zoom)
+    lat_min, lon_min, lat_max, lon_max = bounds
+    return (max(-90.0, math.floor(lat_min / step) * step), math.floor(lon_min / step) * step,
+            min(90.0, math.ceil(lat_max / step) * step), math.ceil(lon_max / step) * step)
+
+
+def cluster_points(points, zoom):
+    # points: DataFrame mit lat, lon, aktenzeichen, endteufe -> eine Zeile je belegter Zelle
+    if zoom >= SINGLE_ZOOM or len(points) == 0:
+        return pd.DataFrame({"lat": points["lat"], "lon": points["lon"], "count": 1, "aktenzeichen": points["aktenzeichen"], "endteufe": points["endteufe"]}).reset_index(drop=True)
+    cell = CLUSTER_PX * _deg_per_px(zoom)
+    lat = points["lat"].to_numpy(float); lon = points["lon"].to_numpy(float)
+    cells = np.column_stack([np.floor(lat / cell), np.floor(lon / cell)]).astype(np.int64)
+    _, first, inverse, count = np.unique(cells, axis=0, return_index=True, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    endteufe = np.full(len(count), np.nan)
+    np.fmax.at(endteufe, inverse, points["endteufe"].to_numpy(float))
+    return pd.DataFrame({"lat": np.bincount(inverse, lat) / count, "lon": np.bincount(inverse, lon) / count, "count": count,
+                         "aktenzeichen": points["aktenzeichen"].to_numpy(object)[first], "endteufe": endteufe})
+
+
+def well_clusters(archive, bounds, zoom, cache=None):
+    # -> Liste von Zellen (dict); zwischengespeichert je Archivstand, Zoom und Fenster
+    cache = cache or get_artifact_cache()
+    window = load_window(bounds, zoom)
+    key = content_key(archive.path, archive.version(), zoom, window)
+    raw = cache.get_or_build("wells", key, lambda: cluster_points(archive.points(window), zoom).to_json(orient="records"))
+    return json.loads(raw)
+
+
+def well_layer(clusters, name="Archiv"):
+    fg = folium.FeatureGroup(name=name)
+    for c in clusters:
+        if c["count"] > 1:
+            folium.CircleMarker([c["lat"], c["lon"]], radius=6 + 3 * math.log2(c["count"]), color="#1565C0", weight=1, fill=True, fill_color="#42A5F5", fill_opacity=0.7,
+                                tooltip=f"{c['count']} Bohrungen (bis {c['endteufe'] or 0:.0f} m)").add_to(fg)
+        else:
+            folium.CircleMarker([c["lat"], c["lon"]], radius=5, color="#1565C0", weight=1, fill=True, fill_color="#1565C0", fill_opacity=0.9,
+                                tooltip=f"{c['aktenzeichen']} ({c['endteufe'] or 0:.1f} m)").add_to(fg)
+    return fg
@@ -0,0 +1,224 @@
+import math
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+import pytest
+from reportlab.graphics.shapes import Group, Line, Path, PolyLine, Rect, String
+from reportlab.lib import colors
+
+from benchmarks.synthetic import synthetic_well
+from bohrprotokoll.layers import ProfileData
+from bohrprotokoll.profile import DrawingRenderer, SvgRenderer, render_profile
+
+# ==============================================================================
+# SVG-BACKEND UND REPORTLAB-BACKEND ZEICHNEN DASSELBE
+# ==============================================================================
+# Beide Ausgaben werden in dieselbe Elementliste übersetzt (Reihenfolge wie
+# gezeichnet, Koordinaten, Farben, Strichstärken, Texte) und verglichen. Für
+# Schraffuren wird die Erwartung allein aus der SVG-<pattern>-Definition abgeleitet
+# (Kachel über das gefüllte Rechteck gelegt) und mit den Teilpfaden der ReportLab-
+# Füllung innerhalb ihres Clip-Rechtecks verglichen.
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+
+def _n(*vals):
+    return tuple(round(float(v), 3) + 0.0 for v in vals)
+
+
+def _hex(c):
+    if c is None or c == "none": return None
+    # Kurzform #RGB wie im Browser als #RRGGBB
+    if isinstance(c, str) and c.startswith("#") and len(c) == 4: c = "#" + "".join(ch * 2 for ch in c[1:])
+    return (c if isinstance(c, colors.Color) else colors.toColor(c)).hexval()
+
+
+def _tag(el):
+    return el.tag.replace(SVG_NS, "")
+
+
+def _points(d):
+    return [tuple(float(c) for c in seg.split(",")) for seg in d.lstrip("M").split(" L")]
+
+
+def _intersects(shape, clip):
+    x, y, w, h = clip
+    if shape[0] == "rect": x0, y0, x1, y1 = shape[1], shape[2], shape[1] + shape[3], shape[2] + shape[4]
+    elif shape[0] == "circle": x0, y0, x1, y1 = shape[1] - shape[3], shape[2] - shape[3], shape[1] + shape[3], shape[2] + shape[3]
+    else:
+        xs = shape[1][0::2]; ys = shape[1][1::2]
+        x0, y0, x1, y1 = min(xs), min(ys), max(xs), max(ys)
+    return x0 < x + w and x1 > x and y0 < y + h and y1 > y
+
+
+def _hatch_shapes(shapes, clip):
+    return sorted(s for s in shapes if _intersects(s, clip))
+
+# ==============================================================================
+# SVG -> ELEMENTE
+# ==============================================================================
+def _pattern_style(pattern):
+    g = pattern.find(SVG_NS + "g")
+    stroke = _hex(g.get("stroke"))
+    return _hex(g.get("fill")), stroke, float(g.get("stroke-width", 1)) if stroke else None
+
+
+def _pattern_tiles(pattern, clip):
+    # Alle Formen der Kachel, wiederholt über (mindestens) das ganze Rechteck
+    tw, th = float(pattern.get("width")), float(pattern.get("height"))
+    x, y, w, h = clip
+    shapes = []
+    for j in range(math.floor(y / th) - 1, math.floor((y + h) / th) + 2):
+        for i in range(math.floor(x / tw) - 1, math.floor((x + w) / tw) + 2):
+            ox, oy = i * tw, j * th
+            for s in pattern.find(SVG_NS + "g"):
+                a = s.attrib
+                if _tag(s) == "rect": shapes.append(("rect",) + _n(float(a["x"]) + ox, float(a["y"]) + oy, a["width"], a["height"]))
+                elif _tag(s) == "circle": shapes.append(("circle",) + _n(float(a["cx"]) + ox, float(a["cy"]) + oy, a["r"]))
+                elif _tag(s) == "path": shapes.append(("line", _n(*(c + o for p in _points(a["d"]) for c, o in zip(p, (ox, oy))))))
+    return _hatch_shapes(shapes, clip)
+
+
+def svg_elements(svg):
+    root = ET.fromstring(svg)
+    patterns = {p.get("id"): p for p in root.iter(SVG_NS + "pattern")}
+    out = []
+    for el in root:
+        tag, a = _tag(el), el.attrib
+        if tag == "defs": continue
+        if tag == "rect" and a["fill"].startswith("url("):
+            clip = _n(a["x"], a["y"], a["width"], a["height"])
+            if clip[3] <= 0: continue  # leere Fläche: im Drawing gar nicht erst angelegt
+            pattern = patterns[a["fill"][5:-1]]
+            out.append(("hatch", clip, _pattern_style(pattern), _pattern_tiles(pattern, clip)))
+        elif tag == "rect":
+            stroke = _hex(a["stroke"])
+            out.append(("rect", _n(a["x"], a["y"], a["width"], a["height"]), _hex(a["fill"]), stroke, float(a.get("stroke-width", 1)) if stroke else None))
+        elif tag == "line":
+            out.append(("line", _n(a["x1"], a["y1"], a["x2"], a["y2"]), _hex(a["stroke"]), float(a["stroke-width"])))
+        elif tag == "path":
+            out.append(("polyline", _n(*(c for p in _points(a["d"]) for c in p)), _hex(a["stroke"]), float(a["stroke-width"])))
+        elif tag == "text":
+            out.append(("text", _n(a["x"], a["y"]), el.text or "", float(a["font-size"]), a.get("text-anchor", "start"), a.get("font-weight") == "bold", _hex(a["fill"])))
+        else:
+            raise AssertionError(f"Unerwartetes SVG-Element {tag}")
+    return out
+
+# ==============================================================================
+# DRAWING -> ELEMENTE
+# ==============================================================================
+def _subpaths(path):
+    ops, pts = path.operators, path.points
+    k = 0; current = None
+    for op in ops:
+        if op == 0:
+            if current: yield current
+            current = ([0], list(pts[k:k + 2])); k += 2
+        elif op == 1: current[0].append(1); current[1].extend(pts[k:k + 2]); k += 2
+        elif op == 2: current[0].append(2); current[1].extend(pts[k:k + 6]); k += 6
+        else: current[0].append(3)
+    if current: yield current
+
+
+def _path_shapes(path, tile_w, tile_h):
+    # Teilpfade -> ("rect"|"circle"|"line", ...); zusammengefasste Rechtecke über
+    # mehrere Kacheln werden wieder in Kachelstücke zerlegt
+    shapes = []
+    for ops, p in _subpaths(path):
+        if ops == [0, 1, 1, 1, 3]:
+            x, y, w, h = p[0], p[1], p[2] - p[0], p[5] - p[1]
+            nx = round(w / tile_w) if w > tile_w * 1.001 else 1
+            ny = round(h / tile_h) if h > tile_h * 1.001 else 1
+            for i in range(nx):
+                for j in range(ny): shapes.append(("rect",) + _n(x + i * w / nx, y + j * h / ny, w / nx, h / ny))
+        elif ops == [0, 2, 2, 2, 2, 3]:
+            cx, cy = p[2 + 4], p[1]
+            shapes.append(("circle",) + _n(cx, cy, p[0] - cx))
+        elif 3 not in ops:
+            shapes.append(("line", _n(*p)))
+        else:
+            raise AssertionError(f"Unerwarteter Teilpfad {ops}")
+    return shapes
+
+
+def drawing_elements(drawing, tiles):
+    # tiles: Kachelgrößen der Schraffuren in Zeichenreihenfolge (aus dem SVG)
+    tiles = iter(tiles); out = []
+    for node in drawing.contents[0].contents:
+        if isinstance(node, Rect):
+            stroke = _hex(node.strokeColor)
+            out.append(("rect", _n(node.x, node.y, node.width, node.height), _hex(node.fillColor), stroke, float(node.strokeWidth) if stroke else None))
+        elif isinstance(node, Line):
+            out.append(("line", _n(node.x1, node.y1, node.x2, node.y2), _hex(node.strokeColor), float(node.strokeWidth)))
+        elif isinstance(node, PolyLine):
+            out.append(("polyline", _n(*node.points), _hex(node.strokeColor), float(node.strokeWidth)))
+        elif isinstance(node, Group) and isinstance(node.contents[0], String):
+            s = node.contents[0]
+            assert node.transform[:4] == (1, 0, 0, -1)
+            out.append(("text", _n(node.transform[4], node.transform[5]), s.text, float(s.fontSize), s.textAnchor, s.fontName == "Helvetica-Bold", _hex(s.fillColor)))
+        elif isinstance(node, Group) and isinstance(node.contents[0], Path) and node.contents[0].isClipPath:
+            clip_path, fill = node.contents
+            x0, y0, x1, y1 = clip_path.getBounds(); clip = _n(x0, y0, x1 - x0, y1 - y0)
+            stroke = _hex(fill.strokeColor)
+            style = (_hex(fill.fillColor), stroke, float(fill.strokeWidth) if stroke else None)
+            # Kachelgröße zum Zerlegen zusammengefasster Rechtecke
+            tile_w, tile_h = next(tiles)
+            out.append(("hatch", clip, style, _hatch_shapes(_path_shapes(fill, tile_w, tile_h), clip)))
+        else:
+            raise AssertionError(f"Unerwartetes Drawing-Element {type(node).__name__}")
+    return out
+
+
+def _tile_sizes(svg):
+    root = ET.fromstring(svg)
+    patterns = {p.get("id"): p for p in root.iter(SVG_NS + "pattern")}
+    hatches = [patterns[el.get("fill")[5:-1]] for el in root if _tag(el) == "rect" and el.get("fill").startswith("url(") and float(el.get("height")) > 0]
+    return [(float(p.get("width")), float(p.get("height"))) for p in hatches]
+
+# ==============================================================================
+# FÄLLE
+# ==============================================================================
+def _default_project():
+    geo = pd.DataFrame([{"Bis_m": 14.0, "a": "mittelsandig", "f": "Sand"}, {"Bis_m": 29.0, "a": "Tf, Mutterboden", "f": "Mudde"},
+                        {"Bis_m": 31.5, "f": "Auffüllung"}, {"Bis_m": 36.25, "f": "Mutterboden"}, {"Bis_m": 45.0, "f": "Kies"}])
+    rohr = pd.DataFrame([{"Von": 0.0, "Bis": 40.0, "Typ": "Vollrohr"}, {"Von": 40.0, "Bis": 44.0, "Typ": "Filterrohr"}, {"Von": 44.0, "Bis": 45.0, "Typ": "Sumpfrohr"}])
+    ring = pd.DataFrame([{"Von": 0.0, "Bis": 14.0, "Mat": "Filterkies"}, {"Von": 14.0, "Bis": 29.0, "Mat": "Tonsperre"}, {"Von": 29.0, "Bis": 45.0, "Mat": "Filterkies"}])
+    return geo, rohr, ring
+
+
+def _synthetic(depth, n_layers):
+    _, geo, rohr, ring = synthetic_well(depth, n_layers)
+    return geo, rohr, ring
+
+
+CASES = [
+    ("Standardprojekt", _default_project, {}),
+    ("alle Bodenarten", lambda: _synthetic(45, 9), {}),
+    ("tief, viele Schichten", lambda: _synthetic(300, 120), {}),
+    # Tiefenfenster wie beim seitenweisen Profil (beschnittene Elemente, krumme Lage)
+    ("Fenster 12.5-37.3 m", _default_project, {"depth_from": 12.5, "depth_to": 37.3, "scale_y": 37.8}),
+    ("Fenster synthetisch", lambda: _synthetic(100, 40), {"depth_from": 33.3, "depth_to": 61.7, "scale_y": 28.35}),
+]
+
+
+@pytest.mark.parametrize("make, window", [(c[1], c[2]) for c in CASES], ids=[c[0] for c in CASES])
+def test_backends_draw_the_same(make, window):
+    data = ProfileData(*make())
+    svg = render_profile(SvgRenderer, data, **window)
+    drawing = render_profile(DrawingRenderer, data, **window)
+    expected = svg_elements(svg)
+    actual = drawing_elements(drawing, _tile_sizes(svg))
+    assert [e[0] for e in actual] == [e[0] for e in expected]
+    for a, e in zip(actual, expected):
+        assert a == e, e[0]
+    # Alle Elementarten und Schraffuren kommen im Standardprojekt tatsächlich vor
+    if not window and make is _default_project:
+        kinds = {e[0] for e in expected}
+        assert kinds == {"rect", "line", "polyline", "text", "hatch"}
+        assert all(e[3] for e in expected if e[0] == "hatch")
+
+
+def test_drawing_size_matches_svg():
+    data = ProfileData(*_default_project())
+    svg = ET.fromstring(render_profile(SvgRenderer, data))
+    drawing = render_profile(DrawingRenderer, data)
+    assert (float(svg.get("width")), float(svg.get("height"))) == (drawing.width, drawing.height)
@@ -0,0 +1,172 @@
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from bohrprotokoll import tiles
+from bohrprotokoll.tiles import TileCache, fetch_tile, get_tile, tile_url_template
+
+ONLINE = "http://tiles.example/{z}/{x}/{y}.png"
+
+
+def _online(z, x, y):
+    return ONLINE.format(z=z, x=x, y=y)
+
+
+@pytest.fixture
+def tile_dir(tmp_path):
+    # Lokales Kachelverzeichnis {z}/{x}/{y}.png mit einer Kachel
+    path = tmp_path / "kacheln" / "15" / "17584"
+    path.mkdir(parents=True)
+    (path / "10760.png").write_bytes(b"kachel-15-17584-10760")
+    return tmp_path / "kacheln"
+
+
+@pytest.fixture
+def mbtiles(tmp_path):
+    path = tmp_path / "karte.mbtiles"
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB)")
+    # TMS: Zeile von unten gezählt
+    con.execute("INSERT INTO tiles VALUES (?, ?, ?, ?)", (2, 1, (1 << 2) - 1 - 3, b"kachel-2-1-3"))
+    con.commit(); con.close()
+    return path
+
+
+@pytest.fixture
+def online(monkeypatch):
+    # Ersetzt den Download; zählt Abrufe und kann auf "nicht erreichbar" gestellt werden
+    requests = pytest.importorskip("requests")
+    calls = []; state = {"down": False}
+
+    def fake_fetch(url, timeout=None, headers=None):
+        calls.append(url)
+        if state["down"]: raise requests.ConnectionError(url)
+        return 200, url.encode("utf-8")
+    monkeypatch.setattr(tiles, "fetch_tile", fake_fetch)
+    return calls, state
+
+# ==============================================================================
+# QUELLEN
+# ==============================================================================
+def test_file_source(tile_dir):
+    template = tile_url_template(tile_dir.as_uri() + "/{z}/{x}/{y}.png")
+    assert fetch_tile(template.format(z=15, x=17584, y=10760)) == (200, b"kachel-15-17584-10760")
+    assert fetch_tile(template.format(z=15, x=17584, y=10761)) == (404, b"")
+
+
+def test_file_source_bypasses_cache(tile_dir, tmp_path):
+    cache = TileCache(str(tmp_path / "cache"))
+    url = tile_dir.as_uri() + "/15/17584/10760.png"
+    assert get_tile(url, cache) == (200, b"kachel-15-17584-10760")
+    assert cache.stats() == {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+
+def test_mbtiles_source(mbtiles, tmp_path):
+    template = tile_url_template("mbtiles://" + str(mbtiles))
+    assert template.endswith("#{z}/{x}/{y}")
+    assert fetch_tile(template.format(z=2, x=1, y=3)) == (200, b"kachel-2-1-3")
+    assert fetch_tile(template.format(z=2, x=1, y=0)) == (404, b"")
+    cache = TileCache(str(tmp_path / "cache"))
+    assert get_tile(template.format(z=2, x=1, y=3), cache) == (200, b"kachel-2-1-3")
+    assert cache.stats()["misses"] == 0
+
+
+def test_env_template(monkeypatch, tile_dir):
+    monkeypatch.setenv("BOHR_TILE_URL", tile_dir.as_uri() + "/{z}/{x}/{y}.png")
+    assert tile_url_template() == tile_dir.as_uri() + "/{z}/{x}/{y}.png"
+    assert tile_url_template(ONLINE) == ONLINE
+
+# ==============================================================================
+# CACHE: TREFFER/FEHLZUGRIFFE, TTL, LRU
+# ==============================================================================
+def test_hits_and_misses(tmp_path, online):
+    calls, _ = online
+    cache = TileCache(str(tmp_path / "cache"))
+    url = _online(15, 1, 2)
+    assert get_tile(url, cache) == (200, url.encode("utf-8"))
+    assert get_tile(url, cache) == (200, url.encode("utf-8"))
+    assert calls == [url]
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "bytes": len(url)}
+    # Neuer Cache auf demselben Verzeichnis übernimmt Kacheln und Größe
+    again = TileCache(str(tmp_path / "cache"))
+    assert again.get(url) == url.encode("utf-8")
+    assert again.stats()["bytes"] == len(url)
+
+
+def test_ttl_expiry_and_stale_fallback(tmp_path, online):
+    calls, state = online
+    cache = TileCache(str(tmp_path / "cache"), ttl=60)
+    url = _online(15, 1, 2)
+    get_tile(url, cache)
+    path = cache._path(url)
+    os.utime(path, (time.time(), time.time() - 120))
+    assert cache.get(url) is None
+    # Abgelaufen und Quelle nicht erreichbar -> abgelaufene Kachel statt Fehler
+    state["down"] = True
+    assert get_tile(url, cache) == (200, url.encode("utf-8"))
+    # Quelle wieder da -> neu geladen, mtime erneuert
+    state["down"] = False
+    get_tile(url, cache)
+    assert len(calls) == 3
+    assert cache.get(url) == url.encode("utf-8")
+
+
+def test_lru_eviction(tmp_path):
+    cache = TileCache(str(tmp_path / "cache"), max_bytes=250)
+    a, b, c = _online(1, 0, 0), _online(1, 0, 1), _online(1, 1, 0)
+    cache.put(a, b"a" * 100); cache.put(b, b"b" * 100)
+    now = time.time()
+    os.utime(cache._path(a), (now - 20, now)); os.utime(cache._path(b), (now - 10, now))
+    # Zugriff macht a zum zuletzt benutzten Eintrag; verdrängt wird b
+    assert cache.get(a) == b"a" * 100
+    cache.put(c, b"c" * 100)
+    assert cache.get(b) is None
+    assert cache.get(a) == b"a" * 100 and cache.get(c) == b"c" * 100
+    assert cache.stats()["evictions"] == 1 and cache.stats()["bytes"] == 200
+
+
+def test_put_replaces_size(tmp_path):
+    cache = TileCache(str(tmp_path / "cache"))
+    url = _online(1, 0, 0)
+    cache.put(url, b"x" * 50); cache.put(url, b"y" * 30)
+    assert cache.stats()["bytes"] == 30
+
+
+def _put_many(directory, n):
+    # Schreibt dieselben Kacheln wie die anderen Prozesse (Stapellauf über Nachbarbohrungen)
+    cache = TileCache(directory); errors = 0
+    for k in range(n):
+        url = _online(15, k % 20, 0)
+        try: cache.put(url, url.encode("utf-8") * 50)
+        except OSError: errors += 1
+    return errors
+
+
+def test_concurrent_put_from_processes(tmp_path):
+    directory = str(tmp_path / "cache")
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        errors = list(pool.map(_put_many, [directory] * 4, [400] * 4))
+    assert errors == [0, 0, 0, 0]
+    cache = TileCache(directory)
+    for k in range(20):
+        url = _online(15, k, 0)
+        assert cache.get(url) == url.encode("utf-8") * 50
+    assert not [name for name in os.listdir(directory) if name.endswith(".tmp")]
+
+
+def test_put_error_still_returns_tile(tmp_path, online, monkeypatch):
+    cache = TileCache(str(tmp_path / "cache"))
+    def broken_put(url, data): raise OSError("Datenträger voll")
+    monkeypatch.setattr(cache, "put", broken_put)
+    url = _online(15, 1, 2)
+    assert get_tile(url, cache) == (200, url.encode("utf-8"))
+
+
+@pytest.mark.skipif(not tiles.HAS_STATICMAP, reason="staticmap nicht installiert")
+def test_static_map_blank_for_missing_local_tiles(tile_dir):
+    m = tiles.CachedStaticMap(256, 256, url_template=tile_dir.as_uri() + "/{z}/{x}/{y}.png")
+    status, data = m.get(tile_dir.as_uri() + "/3/0/0.png")
+    assert status == 200 and data.startswith(b"\x89PNG")